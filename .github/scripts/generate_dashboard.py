@@ -4,18 +4,46 @@ Test Results Dashboard Generator
 Generates an HTML dashboard from Behave test results
 """
 
+import hashlib
 import json
+import math
 import os
+import re
 import logging
 from datetime import datetime
 from pathlib import Path
 import xml.etree.ElementTree as ET 
 
+from results_history import ResultsHistory
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Parsed JUnit results, keyed by file path and invalidated by mtime and size
+JUNIT_CACHE_FILE = os.path.join('.cache', 'dashboard_junit_cache.json')
+JUNIT_CACHE_VERSION = 2
+
+# Step lines written by behave's JUnit reporter, e.g. "Given I am on the homepage ... passed in 1.234s"
+STEP_LINE = re.compile(
+    r'^\s*(?P<keyword>Given|When|Then|And|But|\*)\s+(?P<text>.*?) \.\.\. '
+    r'(?P<status>passed|failed|skipped|undefined|untested)(?: in (?P<duration>[\d.]+)s)?\s*$',
+    re.MULTILINE
+)
+# Duration regressions: slower than the rolling baseline of the previous runs by more than this
+REGRESSION_THRESHOLD_PCT = float(os.getenv('REGRESSION_THRESHOLD_PCT', 20))
+REGRESSION_BASELINE_RUNS = int(os.getenv('REGRESSION_BASELINE_RUNS', 10))
+
+# Outputs of the test run, configurable like utilities/config.py
+PERF_DIR = os.getenv('PERF_DIR', os.path.join('reports', 'perf'))
+ARTIFACTS_INDEX_DIR = os.getenv('ARTIFACTS_INDEX_DIR', os.path.join('reports', 'artifacts'))
+# Content-addressed screenshot store written by the test run (utilities/screenshot_store.py)
+SCREENSHOT_STORE_DIR = os.getenv('SCREENSHOT_STORE_DIR', os.path.join('screenshots', 'store'))
+
+# Quoted step arguments, blanked so steps group by definition
+QUOTED_ARGUMENT = re.compile(r'"[^"]*"')
+
 class DashboardGenerator:
     def __init__(self):
         self.template_dir = Path(__file__).parent / 'templates'
@@ -36,54 +64,68 @@ class DashboardGenerator:
         }
 
     def load_test_results(self):
-        """Load test results from JUnit XML since JSON parsing is failing"""
+        """
+        Load test results from the JUnit XML reports.
+        Each file is parsed in a single streaming pass, and parsed results are
+        cached by file modification time and size, so only changed files are
+        parsed again.
+        """
         results = self.default_results.copy()
-        
+        results['features'] = []
+        results['steps'] = {}
+        results['scenarios'] = []
+
         junit_dir = 'reports/junit/'
-        junit_files = [os.path.join(junit_dir, f) for f in os.listdir(junit_dir) if f.endswith('.xml')]
-        
+        junit_files = sorted(os.path.join(junit_dir, f) for f in os.listdir(junit_dir) if f.endswith('.xml'))
+        cache = self.load_junit_cache()
+        fresh_cache = {}
+        parsed_files = 0
+
         try:
             for junit_file in junit_files:
-                tree = ET.parse(junit_file)
-                root = tree.getroot()
-            
-                # Parse test suite data
-                scenarios = int(root.get('tests', 0))
-                failures = int(root.get('failures', 0))
-                skipped = int(root.get('skipped', 0))
-                passed = scenarios - failures - skipped
+                stat = os.stat(junit_file)
+                key = os.path.abspath(junit_file)
+                cached = cache.get(key)
+                if (cached and cached.get('version') == JUNIT_CACHE_VERSION
+                        and cached['mtime'] == stat.st_mtime and cached['size'] == stat.st_size):
+                    file_stats = cached['stats']
+                else:
+                    file_stats = self.parse_junit_file(junit_file)
+                    parsed_files += 1
+                fresh_cache[key] = {'version': JUNIT_CACHE_VERSION, 'mtime': stat.st_mtime,
+                                    'size': stat.st_size, 'stats': file_stats}
+                results['scenarios'].extend(file_stats['scenarios'])
 
                 # Aggregate overall results
-                results['total_scenarios'] += scenarios
-                results['failed_scenarios'] += failures
-                results['skipped_scenarios'] += skipped
-                results['passed_scenarios'] += passed
-
-                # Get step counts
-                for testcase in root.findall('.//testcase'):
-                    results['total_steps'] += len(testcase.findall('.//step'))
-                    # Count passed steps
-                    for step in testcase.findall('.//system-out'):
-                        if 'passed' in step.text:
-                            results['passed_steps'] += 1
-
-                # Process feature-specific results
-                feature_name = root.get('name', '').split('.')[-1].strip()
-                feature_stats = {
-                    'name': feature_name,
-                    'description': 'Test automation feature',
-                    'scenarios': scenarios,
-                    'passed_scenarios': passed,
-                    'failed_scenarios': failures,
-                    'skipped_scenarios': skipped,
-                    'total_steps': 0,  # Steps can be calculated here if needed
-                    'passed_steps': 0,
-                    'failed_steps': 0
-                }
-                results['features'].append(feature_stats)
+                for feature in file_stats['features']:
+                    results['total_scenarios'] += feature['scenarios']
+                    results['passed_scenarios'] += feature['passed_scenarios']
+                    results['failed_scenarios'] += feature['failed_scenarios']
+                    results['skipped_scenarios'] += feature['skipped_scenarios']
+                    results['total_steps'] += feature['total_steps']
+                    results['passed_steps'] += feature['passed_steps']
+                    results['failed_steps'] += feature['failed_steps']
+                    results['duration'] += feature['duration']
+                    results['features'].append(feature)
+                for definition, step in file_stats['steps'].items():
+                    merged = results['steps'].setdefault(definition, {'count': 0, 'passed': 0, 'failed': 0,
+                                                                      'skipped': 0, 'duration': 0.0})
+                    for field in merged:
+                        merged[field] += step[field]
+
+            self.save_junit_cache(fresh_cache)
+
+            # Identifies the run in the results history, so regenerating does not record it twice
+            if os.getenv('GITHUB_RUN_ID'):
+                results['run_key'] = f"{os.getenv('GITHUB_RUN_ID')}-{os.getenv('GITHUB_RUN_ATTEMPT', '1')}"
+            else:
+                fingerprint = json.dumps([[key, entry['mtime'], entry['size']]
+                                          for key, entry in sorted(fresh_cache.items())])
+                results['run_key'] = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
 
             # Log final aggregated results
-            logger.info(f"Processed {results['total_scenarios']} scenarios")
+            logger.info(f"Processed {results['total_scenarios']} scenarios "
+                        f"({parsed_files} of {len(junit_files)} files parsed, the rest cached)")
             logger.info(f"Passed: {results['passed_scenarios']}")
             logger.info(f"Failed: {results['failed_scenarios']}")
             logger.info(f"Steps: {results['total_steps']}")
@@ -92,6 +134,106 @@ class DashboardGenerator:
             logger.error(f"Error processing results: {str(e)}", exc_info=True)
         
         return results
+
+    def parse_junit_file(self, junit_file):
+        """
+        Compute per-feature and per-step statistics of one JUnit file in a single
+        streaming pass, discarding each test case once it has been counted
+
+        Returns:
+            dict: 'features' (list of feature stats), 'steps' (step definition -> stats)
+                  and 'scenarios' (list of scenario outcomes with their steps)
+        """
+        features = []
+        steps = {}
+        scenarios = []
+        feature = None
+        parents = []
+
+        for event, elem in ET.iterparse(junit_file, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == 'testsuite':
+                    feature = {
+                        'name': elem.get('name', '').split('.')[-1].strip(),
+                        'description': 'Test automation feature',
+                        'scenarios': 0,
+                        'passed_scenarios': 0,
+                        'failed_scenarios': 0,
+                        'skipped_scenarios': 0,
+                        'total_steps': 0,
+                        'passed_steps': 0,
+                        'failed_steps': 0,
+                        'duration': 0.0
+                    }
+                parents.append(elem)
+                continue
+
+            parents.pop()
+            if elem.tag == 'testcase' and feature is not None:
+                status = elem.get('status')
+                if elem.find('failure') is not None or elem.find('error') is not None:
+                    status = 'failed'
+                elif elem.find('skipped') is not None:
+                    status = 'skipped'
+                status = status if status in ('passed', 'failed', 'skipped') else 'passed'
+                feature['scenarios'] += 1
+                feature[f"{status}_scenarios"] += 1
+                feature['duration'] += float(elem.get('time', 0) or 0)
+                scenario = {
+                    'feature': feature['name'],
+                    'name': elem.get('name', ''),
+                    'status': status,
+                    'duration': float(elem.get('time', 0) or 0),
+                    'steps': []
+                }
+                scenarios.append(scenario)
+
+                system_out = elem.find('system-out')
+                output = system_out.text or '' if system_out is not None else ''
+                for match in STEP_LINE.finditer(output):
+                    step_status = match.group('status')
+                    feature['total_steps'] += 1
+                    if step_status == 'passed':
+                        feature['passed_steps'] += 1
+                    elif step_status in ('failed', 'undefined'):
+                        feature['failed_steps'] += 1
+                    definition = QUOTED_ARGUMENT.sub('"..."', match.group('text'))
+                    step = steps.setdefault(definition, {'count': 0, 'passed': 0, 'failed': 0,
+                                                         'skipped': 0, 'duration': 0.0})
+                    step['count'] += 1
+                    step[step_status if step_status in ('passed', 'skipped') else 'failed'] += 1
+                    step['duration'] += float(match.group('duration') or 0)
+                    scenario['steps'].append({
+                        'text': match.group('text'),
+                        'status': step_status,
+                        'duration': float(match.group('duration') or 0)
+                    })
+
+                # Drop the counted test case so memory stays flat on large reports
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+            elif elem.tag == 'testsuite' and feature is not None:
+                feature['duration'] = round(feature['duration'], 3)
+                features.append(feature)
+                feature = None
+                elem.clear()
+
+        return {'features': features, 'steps': steps, 'scenarios': scenarios}
+
+    def load_junit_cache(self):
+        """Read the parsed-results cache, returning an empty one if it is missing or corrupt"""
+        try:
+            with open(JUNIT_CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_junit_cache(self, cache):
+        """Write the parsed-results cache"""
+        os.makedirs(os.path.dirname(JUNIT_CACHE_FILE), exist_ok=True)
+        with open(JUNIT_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
     
     def load_junit_results(self):
         """Load results from JUnit XML"""
@@ -120,6 +262,463 @@ class DashboardGenerator:
                 logger.error(f"Error reading JUnit results: {str(e)}")
         return None
 
+    def render_step_section(self, steps, limit=15):
+        """Render pass/fail counts per step definition, failing definitions first"""
+        if not steps:
+            return ''
+
+        ranked = sorted(steps.items(), key=lambda item: (-item[1]['failed'], -item[1]['count']))[:limit]
+        rows = ''.join(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">{definition}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{step['count']}</td>
+                        <td class="px-6 py-2 text-sm text-green-600">{step['passed']}</td>
+                        <td class="px-6 py-2 text-sm text-red-600">{step['failed']}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{step['duration'] / step['count']:.2f}s</td>
+                    </tr>""" for definition, step in ranked)
+
+        header = 'px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase'
+        return f"""
+        <div class="bg-white rounded-lg shadow p-6 mb-8">
+            <h3 class="text-lg font-semibold mb-4">Step Results</h3>
+            <table class="min-w-full divide-y divide-gray-200">
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="{header}">Step</th>
+                        <th class="{header}">Runs</th>
+                        <th class="{header}">Passed</th>
+                        <th class="{header}">Failed</th>
+                        <th class="{header}">Avg</th>
+                    </tr>
+                </thead>
+                <tbody class="divide-y divide-gray-200">{rows}
+                </tbody>
+            </table>
+        </div>"""
+
+    def load_history(self, results):
+        """Record this run in the results history and query trends and regressions"""
+        if not results.get('scenarios'):
+            return None
+        try:
+            history = ResultsHistory()
+            try:
+                history.ingest(results['run_key'], results['scenarios'])
+                return {
+                    'pass_rate': history.pass_rate_trend(),
+                    'durations': history.duration_trend(),
+                    'regressions': history.regressions(REGRESSION_THRESHOLD_PCT, REGRESSION_BASELINE_RUNS)
+                }
+            finally:
+                history.close()
+        except Exception as e:
+            logger.error(f"Error updating results history: {str(e)}")
+            return None
+
+    def render_history_section(self, history):
+        """Render pass-rate and duration trends and duration regressions"""
+        if not history:
+            return ''
+
+        pass_rate_chart = {
+            'type': 'line',
+            'data': {
+                'labels': [row['day'] for row in history['pass_rate']],
+                'datasets': [{
+                    'label': 'Pass rate (%)',
+                    'data': [row['pass_rate'] for row in history['pass_rate']],
+                    'borderColor': '#10B981',
+                    'fill': False
+                }]
+            },
+            'options': {'responsive': True, 'scales': {'y': {'min': 0, 'max': 100}}}
+        }
+        days = sorted({day for points in history['durations'].values() for day, _ in points})
+        colors = ['#3B82F6', '#EF4444', '#F59E0B', '#8B5CF6', '#10B981']
+        duration_chart = {
+            'type': 'line',
+            'data': {
+                'labels': days,
+                'datasets': [{
+                    'label': name,
+                    'data': [dict(points).get(day) for day in days],
+                    'borderColor': colors[i % len(colors)],
+                    'spanGaps': True,
+                    'fill': False
+                } for i, (name, points) in enumerate(history['durations'].items())]
+            },
+            'options': {'responsive': True, 'plugins': {'legend': {'position': 'bottom'}}}
+        }
+
+        regression_rows = ''.join(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">{row['feature']} / {row['scenario']}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{row['baseline']}s</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{row['duration']}s</td>
+                        <td class="px-6 py-2 text-sm text-red-600">+{row['increase_pct']}%</td>
+                    </tr>""" for row in history['regressions'])
+        if not regression_rows:
+            regression_rows = """
+                    <tr><td class="px-6 py-2 text-sm text-gray-500" colspan="4">No regressions</td></tr>"""
+
+        header = 'px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase'
+        return f"""
+        <div class="grid grid-cols-1 md:grid-cols-2 gap-8 mb-8">
+            <div class="bg-white rounded-lg shadow p-6">
+                <h3 class="text-lg font-semibold mb-4">Pass Rate Trend</h3>
+                <canvas id="passRateTrendChart" height="300"></canvas>
+            </div>
+            <div class="bg-white rounded-lg shadow p-6">
+                <h3 class="text-lg font-semibold mb-4">Slowest Scenarios Over Time (s)</h3>
+                <canvas id="durationTrendChart" height="300"></canvas>
+            </div>
+        </div>
+        <div class="bg-white rounded-lg shadow p-6 mb-8">
+            <h3 class="text-lg font-semibold mb-4">Duration Regressions
+                (&gt;{REGRESSION_THRESHOLD_PCT:g}% over the last {REGRESSION_BASELINE_RUNS} runs)</h3>
+            <table class="min-w-full divide-y divide-gray-200">
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="{header}">Scenario</th>
+                        <th class="{header}">Baseline</th>
+                        <th class="{header}">This Run</th>
+                        <th class="{header}">Change</th>
+                    </tr>
+                </thead>
+                <tbody class="divide-y divide-gray-200">{regression_rows}
+                </tbody>
+            </table>
+        </div>
+        <script>
+            window.addEventListener('load', function () {{
+                new Chart(document.getElementById('passRateTrendChart'), {json.dumps(pass_rate_chart)});
+                new Chart(document.getElementById('durationTrendChart'), {json.dumps(duration_chart)});
+            }});
+        </script>"""
+
+    def load_schedule_summary(self):
+        """Load the parallel runner's schedule summary, if the run was parallel"""
+        summary_path = 'reports/parallel_run.json'
+        if not os.path.exists(summary_path):
+            return None
+        try:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading schedule summary: {str(e)}")
+            return None
+
+    def render_schedule_section(self, summary):
+        """Render predicted vs actual makespan and per-worker load for a parallel run"""
+        if not summary:
+            return ''
+
+        worker_rows = []
+        for worker in summary['workers']:
+            worker_rows.append(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">Worker {worker['worker']}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{len(worker['scenarios'])}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{worker['estimated_seconds']}s</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{worker['elapsed_seconds']}s</td>
+                    </tr>""")
+
+        return f"""
+        <div class="bg-white rounded-lg shadow p-6 mb-8">
+            <h3 class="text-lg font-semibold mb-4">Parallel Schedule ({summary['mode']})</h3>
+            <div class="grid grid-cols-1 md:grid-cols-2 gap-4 mb-4">
+                <div>
+                    <h4 class="text-gray-500 text-sm font-medium">Predicted Makespan</h4>
+                    <p class="text-2xl font-bold mt-1">{summary['predicted_makespan_seconds']}s</p>
+                </div>
+                <div>
+                    <h4 class="text-gray-500 text-sm font-medium">Actual Makespan</h4>
+                    <p class="text-2xl font-bold mt-1">{summary['actual_makespan_seconds']}s</p>
+                </div>
+            </div>
+            <table class="min-w-full divide-y divide-gray-200">
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Worker</th>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Scenarios</th>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Predicted</th>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Actual</th>
+                    </tr>
+                </thead>
+                <tbody class="divide-y divide-gray-200">{''.join(worker_rows)}
+                </tbody>
+            </table>
+        </div>"""
+
+    def load_flaky_summary(self):
+        """Load the parallel runner's flaky vs hard failure split, if failures were re-run"""
+        summary_path = 'reports/flaky.json'
+        if not os.path.exists(summary_path):
+            return None
+        try:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading flaky summary: {str(e)}")
+            return None
+
+    def render_flaky_section(self, summary):
+        """Render failures that passed on a rerun separately from ones that failed every attempt"""
+        if not summary or not (summary['flaky'] or summary['hard_failures']):
+            return ''
+
+        def rows(entries, kind):
+            rendered = []
+            for entry in entries:
+                outcome = (f"Passed on rerun {entry['passed_on_rerun']}" if kind == 'flaky'
+                           else f"Failed {summary['reruns'] + 1} of {summary['reruns'] + 1} attempts")
+                quarantined = ('<span class="ml-2 px-2 text-xs rounded bg-gray-200 text-gray-700">quarantined</span>'
+                               if entry['quarantined'] else '')
+                rendered.append(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">{entry['scenario']}{quarantined}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{entry['id']}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{outcome}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{entry['flip_rate'] * 100:.0f}%</td>
+                    </tr>""")
+            return ''.join(rendered)
+
+        header = """
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Scenario</th>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Location</th>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Outcome</th>
+                        <th class="px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase">Flip Rate</th>
+                    </tr>
+                </thead>"""
+
+        return f"""
+        <div class="bg-white rounded-lg shadow p-6 mb-8">
+            <h3 class="text-lg font-semibold mb-4">Flaky vs Hard Failures</h3>
+            <div class="grid grid-cols-1 md:grid-cols-3 gap-4 mb-4">
+                <div>
+                    <h4 class="text-gray-500 text-sm font-medium">Hard Failures</h4>
+                    <p class="text-2xl font-bold text-red-600 mt-1">{len(summary['hard_failures'])}</p>
+                </div>
+                <div>
+                    <h4 class="text-gray-500 text-sm font-medium">Flaky (passed on rerun)</h4>
+                    <p class="text-2xl font-bold text-yellow-600 mt-1">{len(summary['flaky'])}</p>
+                </div>
+                <div>
+                    <h4 class="text-gray-500 text-sm font-medium">Rerun Time</h4>
+                    <p class="text-2xl font-bold mt-1">{summary['rerun_seconds']}s</p>
+                </div>
+            </div>
+            <h4 class="text-sm font-semibold text-red-600 mb-2">Hard Failures</h4>
+            <table class="min-w-full divide-y divide-gray-200 mb-6">{header}
+                <tbody class="divide-y divide-gray-200">{rows(summary['hard_failures'], 'hard')}
+                </tbody>
+            </table>
+            <h4 class="text-sm font-semibold text-yellow-600 mb-2">Flaky</h4>
+            <table class="min-w-full divide-y divide-gray-200">{header}
+                <tbody class="divide-y divide-gray-200">{rows(summary['flaky'], 'flaky')}
+                </tbody>
+            </table>
+        </div>"""
+
+    def load_perf_timings(self):
+        """Load per-phase scenario timings written by every worker"""
+        perf_dir = Path(PERF_DIR)
+        scenarios = []
+        for perf_file in sorted(perf_dir.glob('perf-*.json')) if perf_dir.exists() else []:
+            try:
+                with open(perf_file, 'r', encoding='utf-8') as f:
+                    scenarios.extend(json.load(f)['scenarios'])
+            except Exception as e:
+                logger.error(f"Error reading performance timings {perf_file}: {str(e)}")
+        return scenarios
+
+    @staticmethod
+    def percentile(values, fraction):
+        """Nearest-rank percentile of a list of numbers"""
+        ordered = sorted(values)
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    def render_perf_section(self, scenarios):
+        """Render the slowest steps, time per phase and p50/p95 per step definition"""
+        if not scenarios:
+            return ''
+
+        steps = [dict(step, scenario=scenario['scenario']) for scenario in scenarios for step in scenario['steps']]
+
+        # Phase totals over steps and scenario setup/teardown
+        phases = {}
+        for scenario in scenarios:
+            for source in [scenario] + scenario['steps']:
+                for name, seconds in source['phases'].items():
+                    phases[name] = phases.get(name, 0.0) + seconds
+        phase_cells = ''.join(f"""
+                <div>
+                    <h4 class="text-gray-500 text-sm font-medium">{name.replace('_', ' ').title()}</h4>
+                    <p class="text-2xl font-bold mt-1">{seconds:.2f}s</p>
+                </div>""" for name, seconds in sorted(phases.items(), key=lambda item: -item[1]))
+
+        slowest_rows = ''.join(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">{step['keyword']} {step['text']}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{step['scenario']}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{step['duration']:.2f}s</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{step['phases'].get('wait', 0):.2f}s</td>
+                    </tr>""" for step in sorted(steps, key=lambda step: -step['duration'])[:10])
+
+        durations = {}
+        for step in steps:
+            durations.setdefault(step['definition'], []).append(step['duration'])
+        definition_rows = ''.join(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">{definition}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{len(values)}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{self.percentile(values, 0.5):.2f}s</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{self.percentile(values, 0.95):.2f}s</td>
+                    </tr>""" for definition, values in sorted(durations.items(), key=lambda item: -self.percentile(item[1], 0.95)))
+
+        header = 'px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase'
+        return f"""
+        <div class="bg-white rounded-lg shadow p-6 mb-8">
+            <h3 class="text-lg font-semibold mb-4">Where the Time Goes</h3>
+            <div class="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">{phase_cells}
+            </div>
+            <h4 class="font-semibold mb-2">Slowest Steps</h4>
+            <table class="min-w-full divide-y divide-gray-200 mb-6">
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="{header}">Step</th>
+                        <th class="{header}">Scenario</th>
+                        <th class="{header}">Duration</th>
+                        <th class="{header}">Waits</th>
+                    </tr>
+                </thead>
+                <tbody class="divide-y divide-gray-200">{slowest_rows}
+                </tbody>
+            </table>
+            <h4 class="font-semibold mb-2">Step Definitions</h4>
+            <table class="min-w-full divide-y divide-gray-200">
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="{header}">Definition</th>
+                        <th class="{header}">Runs</th>
+                        <th class="{header}">p50</th>
+                        <th class="{header}">p95</th>
+                    </tr>
+                </thead>
+                <tbody class="divide-y divide-gray-200">{definition_rows}
+                </tbody>
+            </table>
+        </div>"""
+
+    def load_screenshot_index(self, store_dir=None):
+        """Merge the screenshot store's index shards"""
+        store_dir = store_dir or SCREENSHOT_STORE_DIR
+        index = {'blobs': {}, 'refs': []}
+        for shard in sorted(Path(store_dir).glob('index/*.json')):
+            try:
+                with open(shard, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                index['blobs'].update(data.get('blobs', {}))
+                index['refs'].extend(data.get('refs', []))
+            except Exception as e:
+                logger.error(f"Error reading screenshot index {shard}: {str(e)}")
+        index['store_dir'] = store_dir
+        return index
+
+    def render_screenshot_section(self, index, limit=50):
+        """Render the most recent screenshots per scenario and step, linked to the stored files"""
+        if not index['refs']:
+            return ''
+
+        rows = []
+        for ref in sorted(index['refs'], key=lambda ref: ref['taken_at'], reverse=True)[:limit]:
+            blob = index['blobs'].get(ref['sha256'])
+            if not blob:
+                continue
+            # The dashboard is written to reports/, so link relative to it
+            link = os.path.relpath(os.path.join(index['store_dir'], blob['path']), 'reports')
+            rows.append(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">{ref['scenario'] or ''}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{ref['step'] or ''}</td>
+                        <td class="px-6 py-2 text-sm text-blue-600"><a href="{link}">{ref['name']}</a></td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{ref['taken_at']}</td>
+                    </tr>""")
+
+        header = 'px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase'
+        return f"""
+        <div class="bg-white rounded-lg shadow p-6 mb-8">
+            <h3 class="text-lg font-semibold mb-4">Screenshots</h3>
+            <p class="text-sm text-gray-500 mb-4">{len(index['refs'])} screenshots stored as {len(index['blobs'])} unique files</p>
+            <table class="min-w-full divide-y divide-gray-200">
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="{header}">Scenario</th>
+                        <th class="{header}">Step</th>
+                        <th class="{header}">Screenshot</th>
+                        <th class="{header}">Taken</th>
+                    </tr>
+                </thead>
+                <tbody class="divide-y divide-gray-200">{''.join(rows)}
+                </tbody>
+            </table>
+        </div>"""
+
+    def load_artifact_index(self, index_dir=None):
+        """Merge the per-process artifact namespace indexes"""
+        namespaces = []
+        for path in sorted(Path(index_dir or ARTIFACTS_INDEX_DIR).glob('*.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    namespaces.extend(json.load(f))
+            except Exception as e:
+                logger.error(f"Error reading artifact index {path}: {str(e)}")
+        return namespaces
+
+    def render_artifact_section(self, namespaces, limit=50):
+        """Render the artifacts of each scenario, failed scenarios first"""
+        namespaces = [namespace for namespace in namespaces if namespace.get('files')]
+        if not namespaces:
+            return ''
+
+        ordered = sorted(namespaces, key=lambda namespace: (namespace['status'] != 'failed', namespace['started_at']))
+        rows = []
+        for namespace in ordered[:limit]:
+            # The dashboard is written to reports/, so link relative to it
+            links = ', '.join(
+                f'<a href="{os.path.relpath(entry["path"], "reports")}">{os.path.basename(entry["path"])}</a>'
+                for entry in namespace['files'])
+            status_class = 'text-red-600' if namespace['status'] == 'failed' else 'text-gray-500'
+            rows.append(f"""
+                    <tr>
+                        <td class="px-6 py-2 text-sm text-gray-900">{namespace['scenario']}</td>
+                        <td class="px-6 py-2 text-sm {status_class}">{namespace['status']}</td>
+                        <td class="px-6 py-2 text-sm text-gray-500">{namespace['worker']}</td>
+                        <td class="px-6 py-2 text-sm text-blue-600">{links}</td>
+                    </tr>""")
+
+        total_bytes = sum(entry['bytes'] for namespace in namespaces for entry in namespace['files'])
+        header = 'px-6 py-2 text-left text-xs font-medium text-gray-500 uppercase'
+        return f"""
+        <div class="bg-white rounded-lg shadow p-6 mb-8">
+            <h3 class="text-lg font-semibold mb-4">Scenario Artifacts</h3>
+            <p class="text-sm text-gray-500 mb-4">{len(namespaces)} scenarios kept artifacts ({total_bytes / 1024:.0f} KB)</p>
+            <table class="min-w-full divide-y divide-gray-200">
+                <thead class="bg-gray-50">
+                    <tr>
+                        <th class="{header}">Scenario</th>
+                        <th class="{header}">Status</th>
+                        <th class="{header}">Worker</th>
+                        <th class="{header}">Files</th>
+                    </tr>
+                </thead>
+                <tbody class="divide-y divide-gray-200">{''.join(rows)}
+                </tbody>
+            </table>
+        </div>"""
+
     def prepare_chart_configs(self, results):
         """Prepare chart configurations"""
         scenario_chart = {
@@ -216,6 +815,13 @@ class DashboardGenerator:
 
         # Prepare chart configurations
         scenario_chart, feature_chart = self.prepare_chart_configs(results)
+        schedule_section = self.render_schedule_section(self.load_schedule_summary())
+        flaky_section = self.render_flaky_section(self.load_flaky_summary())
+        perf_section = self.render_perf_section(self.load_perf_timings())
+        step_section = self.render_step_section(results.get('steps'))
+        history_section = self.render_history_section(self.load_history(results))
+        screenshot_section = self.render_screenshot_section(self.load_screenshot_index())
+        artifact_section = self.render_artifact_section(self.load_artifact_index())
 
         # Generate simple HTML if no template exists
         if not self.template_path.exists():
@@ -229,6 +835,13 @@ class DashboardGenerator:
                     <p>Passed: {results['passed_scenarios']}</p>
                     <p>Failed: {results['failed_scenarios']}</p>
                     <p>Skipped: {results['skipped_scenarios']}</p>
+                    {schedule_section}
+                    {flaky_section}
+                    {history_section}
+                    {step_section}
+                    {perf_section}
+                    {screenshot_section}
+                    {artifact_section}
                 </body>
             </html>
             """
@@ -245,6 +858,13 @@ class DashboardGenerator:
                     passed_steps=results['passed_steps'],
                     failed_steps=results['failed_steps'],
                     feature_rows='\n'.join(feature_rows),
+                    schedule_section=schedule_section,
+                    flaky_section=flaky_section,
+                    history_section=history_section,
+                    step_section=step_section,
+                    perf_section=perf_section,
+                    screenshot_section=screenshot_section,
+                    artifact_section=artifact_section,
                     scenario_chart_config=json.dumps(scenario_chart),
                     feature_chart_config=json.dumps(feature_chart)
                 )
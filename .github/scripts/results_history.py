@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Test Results History
+Append-only SQLite store of scenario and step outcomes across runs, with
+daily rollups for trend queries and a rolling baseline for duration
+regressions.
+
+Usage:
+    python .github/scripts/results_history.py trend       # pass rate per day
+    python .github/scripts/results_history.py regressions
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv('RESULTS_HISTORY_DB', os.path.join('.cache', 'results_history.db'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    run_at TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenario_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    run_at TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS step_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    feature TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    total_duration REAL NOT NULL,
+    PRIMARY KEY (day, feature, scenario)
+);
+CREATE INDEX IF NOT EXISTS idx_scenario_results_scenario ON scenario_results (feature, scenario, run_id);
+CREATE INDEX IF NOT EXISTS idx_scenario_results_run_at ON scenario_results (run_at);
+CREATE INDEX IF NOT EXISTS idx_step_results_step ON step_results (step, run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_run_at ON runs (run_at);
+"""
+
+
+class ResultsHistory:
+    """SQLite-backed history of test runs"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def ingest(self, run_key, scenarios, run_at=None):
+        """
+        Record one run. Runs are identified by run_key, so ingesting the same
+        run again (e.g. when the dashboard is regenerated) is a no-op.
+
+        Args:
+            run_key: unique run identifier
+            scenarios: list of dicts with 'feature', 'name', 'status', 'duration'
+                       and 'steps' (dicts with 'text', 'status', 'duration')
+            run_at: run timestamp (default: now)
+
+        Returns:
+            bool: True if the run was new
+        """
+        run_at = run_at or datetime.now().isoformat(timespec='seconds')
+        day = run_at[:10]
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT OR IGNORE INTO runs (run_key, run_at, total, passed, failed, skipped, duration) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (run_key, run_at, len(scenarios),
+                 sum(1 for s in scenarios if s['status'] == 'passed'),
+                 sum(1 for s in scenarios if s['status'] == 'failed'),
+                 sum(1 for s in scenarios if s['status'] == 'skipped'),
+                 round(sum(s['duration'] for s in scenarios), 3))
+            )
+            if cursor.rowcount == 0:
+                return False
+            run_id = cursor.lastrowid
+
+            self.connection.executemany(
+                'INSERT INTO scenario_results (run_id, run_at, feature, scenario, status, duration) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(run_id, run_at, s['feature'], s['name'], s['status'], s['duration']) for s in scenarios]
+            )
+            self.connection.executemany(
+                'INSERT INTO step_results (run_id, feature, scenario, step, status, duration) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(run_id, s['feature'], s['name'], step['text'], step['status'], step['duration'])
+                 for s in scenarios for step in s.get('steps', [])]
+            )
+            self.connection.executemany(
+                'INSERT INTO daily_rollups (day, feature, scenario, runs, passed, failed, total_duration) '
+                'VALUES (?, ?, ?, 1, ?, ?, ?) '
+                'ON CONFLICT (day, feature, scenario) DO UPDATE SET '
+                'runs = runs + 1, passed = passed + excluded.passed, failed = failed + excluded.failed, '
+                'total_duration = total_duration + excluded.total_duration',
+                [(day, s['feature'], s['name'], int(s['status'] == 'passed'), int(s['status'] == 'failed'),
+                  s['duration']) for s in scenarios]
+            )
+        logger.info(f"Recorded run {run_key} with {len(scenarios)} scenarios in results history")
+        return True
+
+    def pass_rate_trend(self, days=30):
+        """
+        Daily pass rate over the last `days` days, from the rollups
+
+        Returns:
+            list: dicts with 'day', 'runs', 'passed', 'failed' and 'pass_rate' (percent)
+        """
+        since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        rows = self.connection.execute(
+            'SELECT day, SUM(runs) AS runs, SUM(passed) AS passed, SUM(failed) AS failed '
+            'FROM daily_rollups WHERE day >= ? GROUP BY day ORDER BY day',
+            (since,)
+        ).fetchall()
+        return [{**dict(row), 'pass_rate': round(100 * row['passed'] / row['runs'], 1) if row['runs'] else 0}
+                for row in rows]
+
+    def duration_trend(self, days=30, limit=5):
+        """
+        Daily average duration of the slowest scenarios over the last `days` days
+
+        Returns:
+            dict: 'feature / scenario' -> list of (day, average seconds)
+        """
+        since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        slowest = self.connection.execute(
+            'SELECT feature, scenario FROM daily_rollups WHERE day >= ? GROUP BY feature, scenario '
+            'ORDER BY SUM(total_duration) / SUM(runs) DESC LIMIT ?',
+            (since, limit)
+        ).fetchall()
+        trends = {}
+        for row in slowest:
+            points = self.connection.execute(
+                'SELECT day, total_duration / runs AS average FROM daily_rollups '
+                'WHERE feature = ? AND scenario = ? AND day >= ? ORDER BY day',
+                (row['feature'], row['scenario'], since)
+            ).fetchall()
+            trends[f"{row['feature']} / {row['scenario']}"] = [(p['day'], round(p['average'], 2)) for p in points]
+        return trends
+
+    def regressions(self, threshold_pct=20, baseline_runs=10):
+        """
+        Scenarios of the latest run that took more than threshold_pct longer
+        than their average over the previous baseline_runs runs
+
+        Returns:
+            list: dicts with 'feature', 'scenario', 'duration', 'baseline' and 'increase_pct'
+        """
+        latest = self.connection.execute('SELECT MAX(id) FROM runs').fetchone()[0]
+        if latest is None:
+            return []
+        regressions = []
+        for row in self.connection.execute(
+                'SELECT feature, scenario, duration FROM scenario_results WHERE run_id = ? AND status = ?',
+                (latest, 'passed')).fetchall():
+            baseline = self.connection.execute(
+                'SELECT AVG(duration), COUNT(*) FROM (SELECT duration FROM scenario_results '
+                'WHERE feature = ? AND scenario = ? AND run_id < ? AND status = ? '
+                'ORDER BY run_id DESC LIMIT ?)',
+                (row['feature'], row['scenario'], latest, 'passed', baseline_runs)
+            ).fetchone()
+            average, samples = baseline
+            if not samples or not average:
+                continue
+            increase = 100 * (row['duration'] - average) / average
+            if increase > threshold_pct:
+                regressions.append({
+                    'feature': row['feature'],
+                    'scenario': row['scenario'],
+                    'duration': round(row['duration'], 2),
+                    'baseline': round(average, 2),
+                    'increase_pct': round(increase, 1)
+                })
+        return sorted(regressions, key=lambda r: -r['increase_pct'])
+
+
+def main():
+    """Print trends or regressions from the history store"""
+    if len(sys.argv) != 2 or sys.argv[1] not in ('trend', 'regressions'):
+        print("Usage: python .github/scripts/results_history.py [trend|regressions]")
+        sys.exit(1)
+
+    history = ResultsHistory()
+    try:
+        if sys.argv[1] == 'trend':
+            for row in history.pass_rate_trend():
+                print(f"{row['day']}  {row['pass_rate']:5.1f}%  ({row['passed']}/{row['runs']})")
+        else:
+            for row in history.regressions():
+                print(f"{row['feature']} / {row['scenario']}: {row['duration']}s vs {row['baseline']}s "
+                      f"(+{row['increase_pct']}%)")
+    finally:
+        history.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,26 +4,22 @@ Handles test setup and teardown at different levels
 """
 from utilities.driver_factory import DriverFactory
 from utilities.config import Config
+from utilities.scenario_timings import ScenarioTimings
+from utilities.wait_report import WaitReport
+from utilities.locator_health import LocatorHealth
+from utilities.fixture_server import FixtureServer
+from utilities.profile_metrics import ProfileMetrics
+from utilities.perf_timing import PerfTiming
+from utilities.command_tracer import CommandTracer
+from utilities.screenshot_service import ScreenshotService
+from utilities.session_cache import SessionCache
+from utilities.artifacts import Artifacts
+from utilities.failure_artifacts import FailureArtifacts
+from utilities.structured_logging import StructuredLogging
 import logging
-import os
 from datetime import datetime
 logger = logging.getLogger(__name__)
 
-# Ensure the logs directory exists
-logs_dir = "logs"
-if not os.path.exists(logs_dir):
-    os.makedirs(logs_dir)
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("logs/test_run.log", mode="w"),
-        logging.StreamHandler()
-    ]
-)
-
 
 def before_all(context):  # type: ignore
     """
@@ -31,9 +27,28 @@ def before_all(context):  # type: ignore
     Args:
         context: Behave context object, carries data between steps
     """
+    # Fresh artifact roots for this process; logging starts once its log root exists
+    Artifacts.prepare()
+    StructuredLogging.start(Artifacts.log_file())
+    # behave sets the root level to its logging_level at the start of every scenario
+    context.config.logging_level = logging.getLogger().level
+    # The dashboard reads every perf-*.json; in parallel runs the runner clears them before starting workers
+    if not Config.WORKER_ID:
+        Artifacts.discard(Config.PERF_DIR)
+
     logger.info(f"Starting tests in {Config.TEST_ENV} environment")
+    # Parallel workers use the server the runner started, passed in BASE_URL
+    if Config.USE_FIXTURE_SERVER and not Config.WORKER_ID:
+        Config.BASE_URL = FixtureServer.start() + "index.html"
     logger.info(f"Base URL: {Config.BASE_URL}")
 
+    # Parallel workers leave timing collection to the runner
+    context.scenario_timings = None if Config.WORKER_ID else ScenarioTimings()
+
+    if Config.DRIVER_POOL:
+        logger.info(f"Using driver pool (size={Config.DRIVER_POOL_SIZE}, max uses={Config.DRIVER_POOL_MAX_USES})")
+        DriverFactory.get_pool().warm()
+
 def before_scenario(context, scenario):  # type: ignore
     """
     Setup before each scenario
@@ -41,17 +56,25 @@ def before_scenario(context, scenario):  # type: ignore
         context: Behave context object, carries data between steps
         scenario: Current scenario being executed
     """
+    PerfTiming.start_scenario(scenario)
+    Artifacts.start_scenario(scenario)
+    StructuredLogging.start_scenario(scenario)
+    FailureArtifacts.start_scenario()
+    ScreenshotService.set_context(scenario.name)
     try:
-        context.driver = DriverFactory.get_driver()
-        
-        # Maximize the window size for better visibility
-        if not Config.HEADLESS:
-            context.driver.maximize_window()
-            window_size = context.driver.get_window_size()
-            logger.info(f"Scenario window size: {window_size['width']}x{window_size['height']}")
-            if window_size['width'] < 1920:
-                context.driver.set_window_size(1920, 1080)
-                logger.info("Window size adjusted to 1920x1080")
+        with PerfTiming.phase('setup'):
+            # Features tagged @lean run with the lightweight browser profile
+            context.browser_profile = DriverFactory.profile_for_tags(scenario.effective_tags)
+            context.driver = DriverFactory.acquire_driver(context.browser_profile)
+            
+            # Maximize the window size for better visibility
+            if not Config.HEADLESS:
+                context.driver.maximize_window()
+                window_size = context.driver.get_window_size()
+                logger.info(f"Scenario window size: {window_size['width']}x{window_size['height']}")
+                if window_size['width'] < 1920:
+                    context.driver.set_window_size(1920, 1080)
+                    logger.info("Window size adjusted to 1920x1080")
     
     except Exception as e:
         logger.error(f"Failed to start browser: {str(e)}")
@@ -64,18 +87,85 @@ def after_scenario(context, scenario):  # type: ignore
         context: Behave context object, carries data between steps
         scenario: Current scenario that was executed
     """
+    if context.scenario_timings is not None:
+        context.scenario_timings.record(scenario.filename, scenario.name, scenario.duration, len(scenario.steps))
+
     try:
-        if scenario.status == "failed" and hasattr(context, "driver"):
-            # Save screenshot for failed scenarios
+        # With failure artifacts on, each failed step's bundle already holds a screenshot
+        if scenario.status == "failed" and hasattr(context, "driver") and not Config.FAILURE_ARTIFACTS:
+            # Save screenshot for failed scenarios in the scenario's namespace
             timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            screenshot_name = f"{scenario.name.replace(' ', '_')}_{timestamp}.png"
-            screenshots_dir = "WAT/screenshots"
-            os.makedirs(screenshots_dir, exist_ok=True)
-            screenshot_path = os.path.join(screenshots_dir, screenshot_name)
-            context.driver.save_screenshot(screenshot_path)
-            logger.info(f"Screenshot for failed scenario saved at: {screenshot_path}")
+            screenshot_path = Artifacts.path('screenshots', f"scenario_failed_{timestamp}.png")
+            ScreenshotService.capture(context.driver, screenshot_path)
+            logger.info(f"Screenshot for failed scenario queued for: {screenshot_path}")
+        
+        if hasattr(context, 'driver') and Config.NETWORK_CACHE_MODE in ('record', 'replay'):
+            from utilities.network_replay import NetworkReplay
+            interceptor = NetworkReplay.for_driver(context.driver)
+            if interceptor is not None:
+                counters = interceptor.take_counters()
+                NetworkReplay.record_scenario(scenario.name, counters)
+                logger.info(f"Network cache ({Config.NETWORK_CACHE_MODE}) for '{scenario.name}': "
+                            f"{counters['hits']} hits, {counters['misses']} misses, {counters['recorded']} recorded")
         
         if hasattr(context, 'driver'):
-            context.driver.quit()
+            ProfileMetrics.sample(context.driver, context.browser_profile)
+            with PerfTiming.phase('teardown'):
+                DriverFactory.release_driver(context.driver, failed=scenario.status == "failed",
+                                             profile=context.browser_profile)
     except Exception as e:
         logger.error(f"Error closing browser: {str(e)}")
+    finally:
+        if getattr(context, 'download_watcher', None) is not None:
+            context.download_watcher.cleanup()
+        Artifacts.end_scenario(scenario)
+        PerfTiming.end_scenario(scenario)
+        StructuredLogging.end_scenario()
+
+def before_step(context, step):  # type: ignore
+    """
+    Setup before each step
+    Args:
+        context: Behave context object, carries data between steps
+        step: Step about to be executed
+    """
+    PerfTiming.start_step(step)
+    StructuredLogging.start_step(step)
+    ScreenshotService.set_context(context.scenario.name, f"{step.keyword} {step.name}")
+
+def after_step(context, step):  # type: ignore
+    """
+    Cleanup after each step
+    Args:
+        context: Behave context object, carries data between steps
+        step: Step that was executed
+    """
+    if step.status == "failed" and Config.FAILURE_ARTIFACTS and getattr(context, "driver", None) is not None:
+        FailureArtifacts.capture(context.driver, context.scenario, step)
+    PerfTiming.end_step(step)
+
+def after_all(context):  # type: ignore
+    """
+    Cleanup after all tests
+    Args:
+        context: Behave context object, carries data between steps
+    """
+    DriverFactory.shutdown_pool()
+    ScreenshotService.shutdown()
+    Artifacts.save()
+    FixtureServer.stop()
+    WaitReport.save()
+    LocatorHealth.save()
+    ProfileMetrics.save()
+    PerfTiming.save()
+    CommandTracer.save()
+    SessionCache.log_summary()
+    if Config.NETWORK_CACHE_MODE in ('record', 'replay'):
+        from utilities.network_replay import NetworkReplay
+        NetworkReplay.save_report()
+
+    if context.scenario_timings is not None:
+        context.scenario_timings.save()
+
+    # Last, so everything logged above reaches the log file
+    StructuredLogging.stop()
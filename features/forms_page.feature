@@ -1,3 +1,4 @@
+@lean
 Feature: Forms Page Functionality
 
   Scenario: Successfully navigating to forms page
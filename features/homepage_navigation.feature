@@ -1,5 +1,7 @@
 # Feature files use Gherkin syntax to describe the behavior we want to test
 # They should be written in a way that non-technical stakeholders can understand
+# @lean runs it with the lightweight browser profile (no images, fonts or background services)
+@lean
 # The following three lines describe the business value of this feature
 Feature: Homepage Navigation
     As a user
@@ -1,13 +1,14 @@
 # features/steps/formspage_steps.py
 from behave import given, when, then
 from pages.forms_page import FormsPage
+from utilities.config import Config
+from utilities.download_watcher import DownloadWatcher
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 import os
 import logging
 
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 '''''
 @given('I am on the homepage')
@@ -29,21 +30,16 @@ def step_impl(context):
     """
     Navigate to the Forms page by clicking the "View Page" button for the "Forms" card.
     """
-    # XPath targeting the "View Page" button for the Forms card
-    forms_page_button_locator = (
-        By.XPATH,
-        "/html/body/div[2]/div[2]/div[3]/div/div[2]/a"
-    )
-
     home_page = FormsPage(context.driver)
 
     try:
-        # Scroll to the element to ensure visibility
-        forms_button = home_page.wait_for_element_visible(forms_page_button_locator)
-        ActionChains(context.driver).move_to_element(forms_button).perform()
+        # Race the absolute XPath against its fallback; the healthier locator is tried first
+        _, forms_button = home_page.find_first(
+            home_page.locator_candidates('forms_page_button'), condition='clickable'
+        )
 
-        # Wait until it's clickable and then click
-        forms_button = home_page.wait_for_element_clickable(forms_page_button_locator)
+        # Move to the element to ensure visibility, then click
+        ActionChains(context.driver).move_to_element(forms_button).perform()
         home_page.safe_click(forms_button)
 
         logger.info("Successfully navigated to the Forms page.")
@@ -83,21 +79,37 @@ def step_impl(context):
     cv_path = os.path.join(project_root, "CV_ZIP", "index.html")
     zip_path = os.path.join(project_root, "CV_ZIP", "github-pages.zip")
     
-    # Fill out the form fields
-    forms_page.fill_years_of_experience("5")
-    forms_page.select_checkboxes(["Python", "JavaScript"])
-    forms_page.select_radio_button("Selenium")
-    forms_page.select_primary_skill("Selenium")
-    forms_page.choose_languages(["JavaScript", "Python"])
-    forms_page.fill_notes("This is a sample note for testing.")
-    forms_page.upload_file(cv_path, is_cv=True) 
-    forms_page.upload_file(zip_path, is_cv=False)  
-    forms_page.toggle_german_switch(True)
-    forms_page.set_german_fluency(3)
+    if Config.FORM_FILL_MODE == 'legacy':
+        # Fill out the form fields one by one
+        forms_page.fill_years_of_experience("5")
+        forms_page.select_checkboxes(["Python", "JavaScript"])
+        forms_page.select_radio_button("Selenium")
+        forms_page.select_primary_skill("Selenium")
+        forms_page.choose_languages(["JavaScript", "Python"])
+        forms_page.fill_notes("This is a sample note for testing.")
+        forms_page.upload_file(cv_path, is_cv=True) 
+        forms_page.upload_file(zip_path, is_cv=False)  
+        forms_page.toggle_german_switch(True)
+        forms_page.set_german_fluency(3)
+    else:
+        # Fill out all form fields in one pass
+        assert forms_page.fill_form_spec({
+            'years_of_experience': "5",
+            'checkbox_python': True,
+            'checkbox_javascript': True,
+            'radio_selenium': True,
+            'primary_skill_dropdown': "Selenium",
+            'choose_language_multiselect': ["JavaScript", "Python"],
+            'notes_textarea': "This is a sample note for testing.",
+            'upload_cv': cv_path,
+            'upload_certificates': zip_path,
+            'german_switch': True,
+            'german_fluency_slider': 3
+        }), "Failed to fill out the basic form controls"
     
     # Take a screenshot after filling out the form
     logger.debug("Calling take_screenshot in the test step.")
-    forms_page.take_screenshot("filled_form")
+    forms_page.take_screenshot("filled_form", debug=True)
     logger.info("Screenshot of filled form captured.")
 
 @when('I fill out the non-English text field')
@@ -125,7 +137,7 @@ def step_impl(context):
     """
     forms_page = FormsPage(context.driver)
     assert forms_page.verify_non_english_elements(), "Non-English elements did not reflect the changes."
-    forms_page.take_screenshot("non_english_elements_verification")
+    forms_page.take_screenshot("non_english_elements_verification", debug=True)
     logger.info("Verified the non-English elements reflected the changes.")
 
 @when('I click on the Download File link')
@@ -134,38 +146,38 @@ def step_impl(context):
     Click the Download File link on the Forms page.
     """
     forms_page = FormsPage(context.driver)
+    # Send this scenario's downloads to its own directory, watched before the click
+    context.download_watcher = DownloadWatcher.for_scenario(context.driver, context.scenario.name)
     forms_page.click_download_file()
     logger.info("Clicked on the Download File link.")
 
 @then('the file should be downloaded successfully')
 def step_impl(context):
     """
-    Verify the file was downloaded successfully in the dynamic downloads folder.
+    Verify the file was downloaded completely into the scenario's download folder.
+    When the site is served from the local fixtures, the content must match the fixture copy.
     """
-    import os
-    import time
-
-    # Get the dynamic downloads folder
-    project_root = os.getcwd()
-    downloads_folder = os.path.join(project_root, "downloads")
     expected_file = "sample_text.txt"
-    file_path = os.path.join(downloads_folder, expected_file)
-
-    # Wait for the file to be downloaded
-    timeout = 10
-    for _ in range(timeout):
-        if os.path.exists(file_path):
-            logger.info(f"File downloaded successfully: {file_path}")
-            break
-        time.sleep(1)
-    else:
-        logger.error(f"File not found in downloads folder after {timeout} seconds.")
+    watcher = context.download_watcher
+
+    try:
+        download = watcher.wait_for(expected_file, timeout=10)
+    except TimeoutError as e:
+        logger.error(str(e))
         raise AssertionError("Download failed or file not found.")
-    
-    # Clean up the downloaded file after verification (optional)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-        logger.info("Downloaded file removed after verification.")
+
+    assert download['size'] > 0, f"Downloaded file is empty: {download['path']}"
+    fixture_copy = os.path.join(Config.FIXTURE_ROOT, expected_file)
+    if Config.USE_FIXTURE_SERVER and os.path.exists(fixture_copy):
+        assert download['size'] == os.path.getsize(fixture_copy), (
+            f"Downloaded {download['size']} bytes, expected {os.path.getsize(fixture_copy)}")
+        assert download['sha256'] == DownloadWatcher.sha256(fixture_copy), "Downloaded file content differs"
+    logger.info(f"File downloaded successfully: {download['path']} (sha256 {download['sha256'][:12]})")
+
+    # Clean up the scenario's download folder after verification
+    watcher.cleanup()
+    context.download_watcher = None
+    logger.info("Downloaded file removed after verification.")
     
 
 @then('I submit the form')
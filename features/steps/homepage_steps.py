@@ -5,6 +5,7 @@ Implements the steps defined in homepage_navigation.feature.
 from behave import given, when, then
 from pages.home_page import HomePage
 from utilities.config import Config
+from utilities.perf_timing import PerfTiming
 import logging
 
 # Set up logging
@@ -31,7 +32,8 @@ def step_impl(context):
     """
     # Use get_base_url() method instead of directly accessing BASE_URL
     url = Config.get_base_url()
-    context.driver.get(url)
+    with PerfTiming.phase('navigation'):
+        context.driver.get(url)
     logger.info(f"Navigated to URL: {url}")
 
 @then('I should see the homepage successfully loaded')
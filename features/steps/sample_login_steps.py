@@ -10,13 +10,15 @@ contains the actual test implementation using the Page Object Model.
 from behave import given, when, then
 from pages.sample_page import SamplePage
 from selenium.webdriver.common.by import By
+from utilities.artifacts import Artifacts
 from utilities.config import Config
+from utilities.perf_timing import PerfTiming
+from utilities.screenshot_service import ScreenshotService
+from utilities.session_cache import SessionCache
 from typing import Any
 from contextlib import contextmanager
 from datetime import datetime
-import os
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -32,12 +34,10 @@ def screenshot_on_failure(context: Any, name: str):
     try:
         yield
     except Exception as e:
-        # Create screenshots directory if it doesn't exist
-        os.makedirs('screenshots', exist_ok=True)
-        # Take screenshot with meaningful name
+        # Take screenshot with meaningful name in the scenario's namespace
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_path = f"screenshots/error_{name}_{timestamp}.png"
-        context.driver.save_screenshot(screenshot_path)
+        screenshot_path = Artifacts.path('screenshots', f"error_{name}_{timestamp}.png")
+        ScreenshotService.capture(context.driver, screenshot_path)
         logger.error(f"Screenshot saved to {screenshot_path}")
         raise
 
@@ -52,7 +52,8 @@ def step_impl(context):
     assert context.driver is not None, "Browser not initialized"
      # Get the URL from config and navigate to it
     url = Config.get_base_url()
-    context.driver.get(url)
+    with PerfTiming.phase('navigation'):
+        context.driver.get(url)
     logger.info(f"Navigated to homepage: {url}")
 
 @when('I click on the Sample Pages link')
@@ -101,7 +102,7 @@ def step_impl(context, username, password):
         logger.info(f"Successfully entered credentials - Username: {username}")
     except Exception as e:
         logger.error(f"Error entering login credentials: {str(e)}")
-        context.driver.save_screenshot("screenshots/login_credentials_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'login_credentials_error.png'))
         raise
 
 @when('I click the login button')
@@ -112,14 +113,16 @@ def step_impl(context):
     try:
         sample_page = SamplePage(context.driver)
         
-        # Add small delay for form to be ready
-        time.sleep(0.5)
+        # Wait for the form to be ready
+        sample_page.wait_for_dom_quiet(budget=0.5)
         
         # Try to click the button
+        login_url = context.driver.current_url
         assert sample_page.click_login_button(), "Failed to click login button"
         
-        # Wait for form submission
-        time.sleep(0.5)
+        # Wait for form submission to load the next page (in-page waits would die with the old document)
+        if 'login.html' in login_url:
+            sample_page.wait_for_navigation(login_url, budget=0.5)
         
         # Verify page change
         current_url = context.driver.current_url
@@ -128,7 +131,7 @@ def step_impl(context):
     except Exception as e:
         logger.error(f"Error in login button step: {str(e)}")
         # Take screenshot for debugging
-        context.driver.save_screenshot("screenshots/error_clicking_login.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'error_clicking_login.png'))
         raise
 
 @when('I should see the login result')
@@ -141,8 +144,7 @@ def step_impl(context):
     """
     try:
         sample_page = SamplePage(context.driver)
-        # Allow slight delay for page transition
-        time.sleep(1)
+        # The login step waited for the page transition; this polls for the order page's elements
         # Verify we're on the pizza page
         assert sample_page.verify_login_result(), "Failed to verify pizza order page"
         logger.info("Successfully verified login by finding pizza order elements")
@@ -162,7 +164,7 @@ def step_impl(context, heading):
         logger.info(f"Successfully verified heading: {heading}")
     except Exception as e:
         logger.error(f"Error verifying heading: {str(e)}")
-        context.driver.save_screenshot("screenshots/heading_verification_failed.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'heading_verification_failed.png'))
         raise
 
 @then('I should see the pizza order form')
@@ -181,7 +183,7 @@ def step_impl(context):
         logger.info(f"Current URL while checking for pizza form: {current_url}")
         
         # Take screenshot for debugging
-        context.driver.save_screenshot("screenshots/pizza_form_check.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'pizza_form_check.png'), debug=True)
         
         # Verify form is displayed
         assert sample_page.verify_pizza_form_displayed(), "Pizza order form not found"
@@ -189,7 +191,7 @@ def step_impl(context):
         
     except Exception as e:
         logger.error(f"Error verifying pizza order form: {str(e)}")
-        context.driver.save_screenshot("screenshots/pizza_form_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'pizza_form_error.png'))
         raise
 @then('I should see the error message')
 def step_impl(context):
@@ -201,8 +203,8 @@ def step_impl(context):
     """
     try:
         sample_page = SamplePage(context.driver)
-        # Add small delay for error message to appear
-        time.sleep(0.5)
+        # Wait for the error message to be rendered
+        sample_page.wait_for_dom_quiet(budget=0.5)
         
         # Verify error message
         assert sample_page.verify_error_message(), "Failed to verify error message"
@@ -211,7 +213,7 @@ def step_impl(context):
     except Exception as e:
         logger.error(f"Error verifying error message: {str(e)}")
         # Take screenshot for debugging
-        context.driver.save_screenshot("screenshots/error_message_verification_failed.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'error_message_verification_failed.png'))
         raise
 @then('I should see the register link')
 def step_impl(context):
@@ -266,14 +268,21 @@ def step_impl(context):
 
 @given('I am logged in successfully')
 def step_impl(context):
-    """Ensure user is logged in"""
+    """Ensure user is logged in, restoring this worker's cached session when there is one"""
+    sample_page = SamplePage(context.driver)
+    if Config.SESSION_CACHE and SessionCache.restore(context.driver, 'admin', sample_page.is_logged_in):
+        return
+
     context.execute_steps('''
         Given I am on the login page
         When I enter username "admin" and password "admin"
         And I click the login button
         
     ''')
-    time.sleep(2)  # Add small wait here
+    # The login step waited for the navigation; let the pizza page's own requests finish
+    sample_page.wait_for_network_idle(budget=2)
+    if Config.SESSION_CACHE and sample_page.is_logged_in():
+        SessionCache.snapshot(context.driver, 'admin')
 
 @when('I select "{size}" as pizza size')
 def step_impl(context, size):
@@ -281,19 +290,19 @@ def step_impl(context, size):
     try:
         sample_page = SamplePage(context.driver)
         
-        # Add initial wait after login
-        time.sleep(3)  # Wait for page to fully load
+        # Wait for page to fully load
+        sample_page.wait_for_network_idle(budget=3)
         
         # Try to select size
         assert sample_page.select_pizza_size(size), f"Failed to select {size} pizza size"
         logger.info(f"Successfully selected {size} pizza size")
         
-        # Add wait after selection to verify
-        time.sleep(1)
+        # Wait for the selection to be applied
+        sample_page.wait_for_dom_quiet(budget=1)
         
     except Exception as e:
         logger.error(f"Error selecting pizza size: {str(e)}")
-        context.driver.save_screenshot("screenshots/size_selection_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'size_selection_error.png'))
         raise
 
 @when('I select "{flavor}" as pizza flavor')
@@ -314,7 +323,7 @@ def step_impl(context, sauce):
         logger.info(f"Successfully selected sauce: {sauce}")
     except Exception as e:
         logger.error(f"Error in sauce selection step: {str(e)}")
-        context.driver.save_screenshot("screenshots/sauce_selection_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'sauce_selection_error.png'))
         raise
 
 @when('I select the following toppings')
@@ -329,7 +338,7 @@ def step_impl(context):
         logger.info(f"Successfully selected toppings: {toppings}")
     except Exception as e:
         logger.error(f"Error in topping selection step: {str(e)}")
-        context.driver.save_screenshot("screenshots/topping_selection_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'topping_selection_error.png'))
         raise
 
 @when('I enter "{quantity}" as quantity')
@@ -343,7 +352,7 @@ def step_impl(context, quantity):
         logger.info(f"Successfully entered quantity: {quantity}")
     except Exception as e:
         logger.error(f"Error in quantity entry step: {str(e)}")
-        context.driver.save_screenshot("screenshots/quantity_entry_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'quantity_entry_error.png'))
         raise
 
 @when('I click Add to Cart')
@@ -357,7 +366,7 @@ def step_impl(context):
         logger.info("Successfully clicked Add to Cart")
     except Exception as e:
         logger.error(f"Error clicking Add to Cart: {str(e)}")
-        context.driver.save_screenshot("screenshots/add_to_cart_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'add_to_cart_error.png'))
         raise
 @then('I should see the order confirmation')
 def step_impl(context):
@@ -369,8 +378,8 @@ def step_impl(context):
     """
     try:
         sample_page = SamplePage(context.driver)
-        # Add small delay for message to appear
-        time.sleep(1.5)
+        # Wait for the message to finish animating in
+        sample_page.wait_for_animations_finished(budget=1.5)
         
         # Verify confirmation message
         assert sample_page.verify_order_confirmation(), "Failed to verify order confirmation message"
@@ -379,7 +388,7 @@ def step_impl(context):
     except Exception as e:
         logger.error(f"Error verifying order confirmation: {str(e)}")
         # Take screenshot for debugging
-        context.driver.save_screenshot("screenshots/order_confirmation_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'order_confirmation_error.png'))
         raise
 
 @then('I should see the quantity validation message')
@@ -393,5 +402,5 @@ def step_impl(context):
         logger.info("Successfully verified quantity validation message")
     except Exception as e:
         logger.error(f"Error verifying quantity validation: {str(e)}")
-        context.driver.save_screenshot("screenshots/quantity_validation_error.png")
+        ScreenshotService.capture(context.driver, Artifacts.path('screenshots', 'quantity_validation_error.png'))
         raise
\ No newline at end of file
@@ -5,18 +5,271 @@ used across all page objects. Implements common web interactions.
 """
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from utilities.artifacts import Artifacts
 from utilities.config import Config
+from utilities.failure_artifacts import FailureArtifacts
+from utilities.wait_report import WaitReport
+from utilities.locator_health import LocatorHealth
+from utilities.perf_timing import PerfTiming
+from utilities.screenshot_service import ScreenshotService
 import logging
 import time
 logger = logging.getLogger(__name__)
 
+# A wait given a budget but no timeout gives up after this many times the budget
+BUDGET_TIMEOUT_FACTOR = 4
+
+# In-page condition scripts for the event-driven waits. Each one is run with
+# execute_async_script and calls back as soon as its condition holds, or with
+# false once its deadline (arguments[1], in ms) passes. requestAnimationFrame
+# is paused in hidden tabs, so they fall back to a 16ms timer there.
+_NEXT_FRAME_JS = """
+var nextFrame = function(fn) {
+    if (document.hidden) { setTimeout(fn, 16); } else { requestAnimationFrame(fn); }
+};
+"""
+
+SCROLL_SETTLED_JS = _NEXT_FRAME_JS + """
+var el = arguments[0], deadline = Date.now() + arguments[1], done = arguments[arguments.length - 1];
+var last = null, stableFrames = 0;
+function position() {
+    var rect = el ? el.getBoundingClientRect() : {top: 0, left: 0};
+    return [window.scrollX, window.scrollY, rect.top, rect.left].join(',');
+}
+function tick() {
+    var current = position();
+    stableFrames = current === last ? stableFrames + 1 : 0;
+    last = current;
+    if (stableFrames >= 2) { return done(true); }
+    if (Date.now() > deadline) { return done(false); }
+    nextFrame(tick);
+}
+nextFrame(tick);
+"""
+
+DOM_QUIET_JS = _NEXT_FRAME_JS + """
+var quietMs = arguments[0], deadline = Date.now() + arguments[1], done = arguments[arguments.length - 1];
+var lastMutation = Date.now();
+var observer = new MutationObserver(function() { lastMutation = Date.now(); });
+observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+function tick() {
+    var now = Date.now();
+    if (document.readyState === 'complete' && now - lastMutation >= quietMs) {
+        observer.disconnect();
+        return done(true);
+    }
+    if (now > deadline) { observer.disconnect(); return done(false); }
+    nextFrame(tick);
+}
+nextFrame(tick);
+"""
+
+NETWORK_IDLE_JS = _NEXT_FRAME_JS + """
+var idleMs = arguments[0], deadline = Date.now() + arguments[1], done = arguments[arguments.length - 1];
+if (!window.__watNetwork) {
+    // Count in-flight XHR and fetch requests started from now on
+    var tracker = window.__watNetwork = {pending: 0};
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        tracker.pending++;
+        this.addEventListener('loadend', function() { tracker.pending--; });
+        return originalSend.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            tracker.pending++;
+            return originalFetch.apply(this, arguments).finally(function() { tracker.pending--; });
+        };
+    }
+}
+var resources = -1, lastActivity = Date.now();
+function tick() {
+    var now = Date.now();
+    var count = performance.getEntriesByType('resource').length;
+    if (count !== resources || window.__watNetwork.pending > 0 || document.readyState !== 'complete') {
+        resources = count;
+        lastActivity = now;
+    }
+    if (now - lastActivity >= idleMs) { return done(true); }
+    if (now > deadline) { return done(false); }
+    nextFrame(tick);
+}
+nextFrame(tick);
+"""
+
+# Resolves a Selenium (by, value) locator to a list of elements inside the page
+_FIND_ELEMENTS_JS = """
+function findElements(by, value) {
+    switch (by) {
+        case 'id': return Array.from(document.querySelectorAll('#' + CSS.escape(value)));
+        case 'name': return Array.from(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'css selector': return Array.from(document.querySelectorAll(value));
+        case 'class name': return Array.from(document.getElementsByClassName(value));
+        case 'tag name': return Array.from(document.getElementsByTagName(value));
+        case 'link text':
+        case 'partial link text':
+            return Array.from(document.getElementsByTagName('a')).filter(function(a) {
+                var text = a.innerText.trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+        case 'xpath':
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+function isDisplayed(el) {
+    var style = window.getComputedStyle(el);
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+        && style.visibility !== 'hidden' && style.display !== 'none';
+}
+"""
+
+PROBE_ELEMENTS_JS = _FIND_ELEMENTS_JS + """
+var locators = arguments[0], fields = arguments[1], allMatches = arguments[2];
+function readField(el, field) {
+    switch (field) {
+        case 'displayed': return isDisplayed(el);
+        case 'enabled': return !el.disabled;
+        case 'selected': return !!(el.checked || el.selected);
+        case 'text': return el.innerText;
+        case 'tag': return el.tagName.toLowerCase();
+    }
+    // Same precedence as WebElement.get_attribute: property first, then attribute
+    var value = el[field];
+    if (value === undefined || value === null || typeof value === 'object' || typeof value === 'function') {
+        value = el.getAttribute(field);
+    }
+    return value;
+}
+function describe(el) {
+    var state = {};
+    fields.forEach(function(field) { state[field] = readField(el, field); });
+    return state;
+}
+var result = {};
+Object.keys(locators).forEach(function(name) {
+    var elements = findElements(locators[name][0], locators[name][1]);
+    result[name] = allMatches ? elements.map(describe) : (elements.length ? describe(elements[0]) : null);
+});
+return result;
+"""
+
+FILL_FORM_JS = _FIND_ELEMENTS_JS + """
+var fields = arguments[0], results = {}, uploads = {}, winners = {};
+function fire(el) {
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+function matches(option, wanted) {
+    wanted = String(wanted);
+    return option.value.toLowerCase() === wanted.toLowerCase() || option.text.trim() === wanted;
+}
+Object.keys(fields).forEach(function(name) {
+    // Candidate locators [name, by, value] in order; the first that matches wins
+    var candidates = fields[name][0], wanted = fields[name][1], el = null, winner = null;
+    for (var i = 0; i < candidates.length && !el; i++) {
+        try { el = findElements(candidates[i][1], candidates[i][2])[0] || null; } catch (e) { el = null; }
+        winner = candidates[i][0];
+    }
+    // Labels (e.g. custom switches) stand in for the control they are bound to
+    if (el && el.tagName === 'LABEL') { el = el.control; }
+    if (!el) { results[name] = {status: 'missing'}; return; }
+    winners[name] = winner;
+
+    var tag = el.tagName.toLowerCase(), type = (el.type || tag).toLowerCase();
+    try {
+        if (type === 'file') {
+            uploads[name] = el;
+            results[name] = {status: 'pending', type: type};
+            return;
+        }
+        if (type === 'checkbox' || type === 'radio') {
+            // A real click toggles state and fires the page's own handlers
+            if (el.checked !== !!wanted) { el.click(); }
+            results[name] = {status: 'set', type: type, value: el.checked};
+            return;
+        }
+        if (tag === 'select') {
+            var wantedList = Array.isArray(wanted) ? wanted : [wanted];
+            var found = 0;
+            Array.from(el.options).forEach(function(option) {
+                var selected = wantedList.some(function(w) { return matches(option, w); });
+                if (selected) { found++; }
+                if (el.multiple) { option.selected = selected; } else if (selected) { option.selected = true; }
+            });
+            fire(el);
+            var current = Array.from(el.selectedOptions).map(function(o) { return o.text.trim(); });
+            results[name] = found === wantedList.length
+                ? {status: 'set', type: type, value: el.multiple ? current : current[0]}
+                : {status: 'error', type: type, error: 'option not found', value: current};
+            return;
+        }
+        // Text-like inputs, textareas and ranges: use the native setter so
+        // frameworks that track the value see the change
+        var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+        setter.call(el, String(wanted));
+        fire(el);
+        results[name] = {status: 'set', type: type, value: el.value};
+    } catch (e) {
+        results[name] = {status: 'error', type: type, error: String(e)};
+    }
+});
+return {results: results, uploads: uploads, winners: winners};
+"""
+
+FIND_FIRST_JS = _FIND_ELEMENTS_JS + """
+var candidates = arguments[0], condition = arguments[1];
+for (var i = 0; i < candidates.length; i++) {
+    var elements;
+    try { elements = findElements(candidates[i][1], candidates[i][2]); } catch (e) { continue; }
+    for (var j = 0; j < elements.length; j++) {
+        var el = elements[j];
+        if (condition === 'present'
+                || (isDisplayed(el) && (condition !== 'clickable' || !el.disabled))) {
+            return [candidates[i][0], el];
+        }
+    }
+}
+return null;
+"""
+
+ANIMATIONS_FINISHED_JS = _NEXT_FRAME_JS + """
+var el = arguments[0], deadline = Date.now() + arguments[1], done = arguments[arguments.length - 1];
+function running() {
+    var animations = el ? el.getAnimations({subtree: true}) : document.getAnimations();
+    var active = animations.filter(function(a) {
+        return (a.playState === 'running' || a.playState === 'pending')
+            && a.effect && a.effect.getComputedTiming().iterations !== Infinity;
+    }).length;
+    // jQuery animations (used by Bootstrap 4 modals) are not Web Animations
+    if (window.jQuery && window.jQuery.fn && window.jQuery.fn.jquery) {
+        active += window.jQuery(':animated').length;
+    }
+    return active;
+}
+function tick() {
+    if (running() === 0) { return done(true); }
+    if (Date.now() > deadline) { return done(false); }
+    nextFrame(tick);
+}
+nextFrame(tick);
+"""
+
 
 class BasePage:
     """
     Base class for all page objects.
     Contains common methods and wait strategies.
     """
+
+    # Winning locator name per (page class, candidate set), tried first next time
+    _locator_winners = {}
+    @PerfTiming.timed('wait')
     def wait_for_element_clickable(self, locator, timeout=None):
         """
         Wait for element to be clickable
@@ -25,13 +278,18 @@ class BasePage:
             locator: tuple of (By.XXX, "locator string")
             timeout: optional timeout in seconds
         """
+        start_time = time.time()
         try:
             timeout = timeout or self.default_timeout
             element = WebDriverWait(self.driver, timeout).until(
                 EC.element_to_be_clickable(locator)
             )
+            self._record_locator_health(locator, True, start_time)
+            self.record_action('wait_clickable', locator)
             return element
         except Exception as e:
+            self._record_locator_health(locator, False, start_time)
+            self.record_action('wait_clickable', locator, type(e).__name__)
             logger.error(f"Element not clickable: {locator}")
             self.take_screenshot(f"element_not_clickable_{locator[1]}")
             raise
@@ -46,16 +304,31 @@ class BasePage:
         try:
             # Try regular click
             element.click()
+            self.record_action('click')
         except Exception:
             try:
                 # Try JavaScript click
                 self.driver.execute_script("arguments[0].click();", element)
+                self.record_action('click', outcome='needed JavaScript click')
             except Exception as e:
+                self.record_action('click', outcome=type(e).__name__)
                 logger.error(f"Failed to click element: {str(e)}")
                 raise
     def __init__(self, driver):
         self.driver = driver
         self.default_timeout = Config.DEFAULT_TIMEOUT
+
+    def record_action(self, action, target=None, outcome='ok'):
+        """
+        Note an action in the recent-action buffer attached to failed-step artifacts.
+        Costs no browser round trip, so it is safe to call on every interaction.
+
+        Args:
+            action: what was done, e.g. 'click' or 'wait_visible'
+            target: locator or other subject of the action
+            outcome: 'ok', or a short description of what went wrong
+        """
+        FailureArtifacts.record(type(self).__name__, action, target, outcome)
     
     def scroll_to_element(self, element):
         """
@@ -66,13 +339,16 @@ class BasePage:
         """
         try:
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            # Add a small delay to allow smooth scrolling
-            time.sleep(0.5)  # Small delay for the scroll to complete
+            # Wait for smooth scrolling to come to rest
+            self.wait_for_scroll_settled(element, budget=0.5)
+            self.record_action('scroll')
             logger.debug("Scrolled to element successfully")
         except Exception as e:
+            self.record_action('scroll', outcome=type(e).__name__)
             logger.error(f"Failed to scroll to element: {str(e)}")
     
 
+    @PerfTiming.timed('wait')
     def wait_for_element_visible(self, locator, timeout=None):
         """
         Wait for element to be visible on page
@@ -87,44 +363,343 @@ class BasePage:
         Raises:
             TimeoutException: If element is not visible within timeout
         """
+        start_time = time.time()
         try:
             timeout = timeout or self.default_timeout
             element = WebDriverWait(self.driver, timeout).until(
                 EC.visibility_of_element_located(locator)
             )
+            self._record_locator_health(locator, True, start_time)
+            self.record_action('wait_visible', locator)
             logger.debug(f"Element found: {locator}")
             return element
         except TimeoutException:
+            self._record_locator_health(locator, False, start_time)
+            self.record_action('wait_visible', locator, 'timeout')
             logger.error(f"Element not visible: {locator}")
             # Take screenshot for debugging
             self.take_screenshot(f"element_not_found_{locator[1]}")
             raise
     
-    def take_screenshot(self, name):
+    def wait_for_scroll_settled(self, element=None, timeout=None, budget=None):
+        """
+        Wait until the page (and element, if given) stops moving
+
+        Args:
+            element: optional WebElement whose position must be stable
+            timeout: optional timeout in seconds
+            budget: seconds of the fixed sleep this wait replaces, for the savings report
+
+        Returns:
+            bool: True if scrolling settled before the timeout
+        """
+        return self._wait_for_condition('scroll_settled', SCROLL_SETTLED_JS, element, timeout, budget)
+
+    def wait_for_dom_quiet(self, quiet_ms=150, timeout=None, budget=None):
+        """
+        Wait until the document has loaded and no DOM mutations happened for quiet_ms
+
+        Args:
+            quiet_ms: length of the mutation-free window in milliseconds
+            timeout: optional timeout in seconds
+            budget: seconds of the fixed sleep this wait replaces, for the savings report
+
+        Returns:
+            bool: True if the DOM went quiet before the timeout
+        """
+        return self._wait_for_condition('dom_quiet', DOM_QUIET_JS, quiet_ms, timeout, budget)
+
+    def wait_for_network_idle(self, idle_ms=300, timeout=None, budget=None):
+        """
+        Wait until the document has loaded and no resources, XHR or fetch
+        requests started or were pending for idle_ms
+
+        Args:
+            idle_ms: length of the idle window in milliseconds
+            timeout: optional timeout in seconds
+            budget: seconds of the fixed sleep this wait replaces, for the savings report
+
+        Returns:
+            bool: True if the network went idle before the timeout
+        """
+        return self._wait_for_condition('network_idle', NETWORK_IDLE_JS, idle_ms, timeout, budget)
+
+    def wait_for_animations_finished(self, element=None, timeout=None, budget=None):
+        """
+        Wait until CSS transitions/animations and jQuery animations have finished
+
+        Args:
+            element: optional WebElement to limit the check to its subtree
+            timeout: optional timeout in seconds
+            budget: seconds of the fixed sleep this wait replaces, for the savings report
+
+        Returns:
+            bool: True if all animations finished before the timeout
+        """
+        return self._wait_for_condition('animations_finished', ANIMATIONS_FINISHED_JS, element, timeout, budget)
+
+    @PerfTiming.timed('wait')
+    def wait_for_navigation(self, previous_url, timeout=None, budget=None):
+        """
+        Wait until the browser has left previous_url and the new document has loaded.
+        Use this after a click that navigates: it polls from the driver side, so
+        unlike the in-page waits it is not cut short when the old document unloads.
+
+        Args:
+            previous_url: URL before the navigating action
+            timeout: optional timeout in seconds
+            budget: seconds of the fixed sleep this wait replaces, for the savings report
+
+        Returns:
+            bool: True if the new page loaded before the timeout
         """
-        Take a screenshot for debugging purposes and save it in the 'screenshots' folder in the root of the project.
-        The filename includes a timestamp to ensure uniqueness.
+        timeout = self._condition_timeout(timeout, budget)
+        start_time = time.time()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(
+                lambda driver: driver.current_url != previous_url
+                and driver.execute_script("return document.readyState") == 'complete'
+            )
+            satisfied = True
+        except TimeoutException:
+            satisfied = False
+        elapsed = time.time() - start_time
+
+        if budget is not None:
+            WaitReport.record('navigation', budget, elapsed)
+        if satisfied:
+            logger.debug(f"Navigated away from {previous_url} in {elapsed:.3f}s")
+        else:
+            logger.warning(f"Still on {previous_url} after {timeout}s")
+        return satisfied
+
+    def locator_candidates(self, key):
+        """
+        Get a locator and its fallback variants (key_alt, key_alt1, ...) from LOCATORS
+
+        Args:
+            key: name of the primary locator
+
+        Returns:
+            dict: name -> locator, primary first
+        """
+        return {name: locator for name, locator in self.LOCATORS.items()
+                if name == key or name.startswith(f"{key}_alt")}
+
+    @PerfTiming.timed('wait')
+    def find_first(self, locators, timeout=None, condition='visible'):
+        """
+        Race several candidate locators under one shared deadline.
+        All candidates are checked together on every poll, in a single round trip,
+        and the first element that matches wins. Candidates are ordered by their
+        recorded success rate, and the winning locator is remembered per page
+        class and tried first on later lookups.
+
+        Args:
+            locators: dict of name -> (By.XXX, "locator string")
+            timeout: optional timeout in seconds for the whole race
+            condition: 'present', 'visible' or 'clickable'
+
+        Returns:
+            tuple: (winning locator name, WebElement)
+
+        Raises:
+            TimeoutException: If no candidate matched within the timeout
+        """
+        timeout = timeout or self.default_timeout
+        page = type(self).__name__
+        cache_key, names = self._ordered_candidates(locators)
+        candidates = [[name, locators[name][0], locators[name][1]] for name in names]
+
+        start_time = time.time()
+        try:
+            name, element = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda driver: driver.execute_script(FIND_FIRST_JS, candidates, condition)
+            )
+        except TimeoutException:
+            for name in names:
+                LocatorHealth.record(page, name, False, time.time() - start_time)
+            self.record_action('find_first', names, 'timeout')
+            logger.error(f"None of the locators {names} matched within {timeout}s")
+            self.take_screenshot(f"element_not_found_{names[0]}")
+            raise TimeoutException(f"No element {condition} for any of {names} after {timeout} seconds")
+
+        # Candidates ahead of the winner were checked and did not match
+        elapsed = time.time() - start_time
+        for missed in names[:names.index(name)]:
+            LocatorHealth.record(page, missed, False, elapsed)
+        LocatorHealth.record(page, name, True, elapsed)
+
+        BasePage._locator_winners[cache_key] = name
+        self.record_action('find_first', names, f"matched {name}")
+        logger.debug(f"Locator '{name}' won in {time.time() - start_time:.3f}s")
+        return name, element
+
+    def _ordered_candidates(self, locators):
+        """
+        Order candidate locators for a race: the last winner first, then by success rate
+
+        Args:
+            locators: dict of name -> (By.XXX, "locator string")
+
+        Returns:
+            tuple: (key of the winner cache, list of names in order)
+        """
+        page = type(self).__name__
+        cache_key = (page, tuple(sorted(locators)))
+        names = LocatorHealth.order(page, list(locators))
+        winner = self._locator_winners.get(cache_key)
+        if winner in locators:
+            names.remove(winner)
+            names.insert(0, winner)
+        return cache_key, names
+
+    def probe_elements(self, locators, fields=('displayed', 'enabled', 'selected'), all_matches=False):
+        """
+        Read the state of several elements in a single WebDriver round trip
+
+        Args:
+            locators: dict of name -> (By.XXX, "locator string"), or a list of locators
+                      (the locator string is then used as the name)
+            fields: attribute/property names to read. 'displayed', 'enabled', 'selected',
+                    'text' and 'tag' mirror the WebElement methods of the same name
+            all_matches: if True, return a list of states for every matching element
+
+        Returns:
+            dict: name -> {field: value}, or None when no element matched
+        """
+        if not isinstance(locators, dict):
+            locators = {locator[1]: locator for locator in locators}
+        result = self.driver.execute_script(
+            PROBE_ELEMENTS_JS,
+            {name: list(locator) for name, locator in locators.items()},
+            list(fields),
+            all_matches
+        )
+        logger.debug(f"Probed elements: {result}")
+        return result
+
+    def fill_form(self, spec, locators=None):
+        """
+        Apply a whole form spec in one pass.
+        All fields are resolved and set by a single script that fires the
+        input/change events a user would; only file inputs go through send_keys.
+        Each field is looked up through its fallback locators (name_alt, ...) in
+        the same order find_first() uses, and the winner is remembered.
+
+        Args:
+            spec: dict of field name -> value. Checkboxes, radios and switches take
+                  a bool, selects take option text/value (a list for multi-selects),
+                  file inputs take a path (or a list of paths), everything else a string
+            locators: dict of field name -> locator (defaults to self.LOCATORS)
+
+        Returns:
+            dict: field name -> {'status': 'set'|'uploaded'|'missing'|'error', ...}
+        """
+        locators = locators or self.LOCATORS
+        unknown = [name for name in spec if name not in locators]
+        if unknown:
+            raise KeyError(f"No locator for form fields: {unknown}")
+
+        start_time = time.time()
+        fields, cache_keys = {}, {}
+        for name, value in spec.items():
+            candidates = {key: locator for key, locator in locators.items()
+                          if key == name or key.startswith(f"{name}_alt")}
+            cache_keys[name], names = self._ordered_candidates(candidates)
+            fields[name] = [[[key, candidates[key][0], candidates[key][1]] for key in names], value]
+        outcome = self.driver.execute_script(FILL_FORM_JS, fields)
+        summary = outcome['results']
+        for name, winner in outcome['winners'].items():
+            BasePage._locator_winners[cache_keys[name]] = winner
+
+        # File inputs can only be set through WebDriver
+        for name, element in outcome['uploads'].items():
+            paths = spec[name] if isinstance(spec[name], (list, tuple)) else [spec[name]]
+            try:
+                element.send_keys('\n'.join(paths))
+                summary[name].update({'status': 'uploaded', 'value': paths})
+            except Exception as e:
+                summary[name].update({'status': 'error', 'error': str(e)})
+
+        failed = {name: result for name, result in summary.items() if result['status'] not in ('set', 'uploaded')}
+        self.record_action('fill_form', list(spec), f"{len(failed)} fields not filled" if failed else 'ok')
+        logger.info(f"Filled {len(summary) - len(failed)}/{len(summary)} form fields "
+                    f"in {time.time() - start_time:.2f}s")
+        if failed:
+            logger.error(f"Form fields not filled: {failed}")
+        return summary
+
+    def _record_locator_health(self, locator, hit, start_time):
+        """Record a lookup in the locator health store if the locator is named in LOCATORS"""
+        for name, known_locator in getattr(self, 'LOCATORS', {}).items():
+            if tuple(known_locator) == tuple(locator):
+                LocatorHealth.record(type(self).__name__, name, hit, time.time() - start_time)
+                return
+
+    def _condition_timeout(self, timeout, budget):
+        """Explicit timeout, else a small multiple of the replaced sleep, never more than the default timeout"""
+        if timeout:
+            return timeout
+        if budget:
+            return min(self.default_timeout, budget * BUDGET_TIMEOUT_FACTOR)
+        return self.default_timeout
+
+    @PerfTiming.timed('wait')
+    def _wait_for_condition(self, name, script, argument, timeout, budget):
+        """Run an in-page condition script and record how long it took"""
+        timeout = self._condition_timeout(timeout, budget)
+        start_time = time.time()
+        deadline = start_time + timeout
+        while True:
+            try:
+                remaining_ms = max(int((deadline - time.time()) * 1000), 0)
+                satisfied = bool(self.driver.execute_async_script(script, argument, remaining_ms))
+                break
+            except WebDriverException as e:
+                # A navigation tore down the document the script ran in: run it again on the new one
+                if 'unloaded' in str(e) and time.time() < deadline:
+                    logger.debug(f"Condition wait '{name}' interrupted by navigation, retrying")
+                    continue
+                logger.warning(f"Condition wait '{name}' failed: {str(e)}")
+                satisfied = False
+                break
+        elapsed = time.time() - start_time
+
+        if budget is not None:
+            WaitReport.record(name, budget, elapsed)
+        if satisfied:
+            logger.debug(f"Condition '{name}' met in {elapsed:.3f}s")
+        else:
+            logger.warning(f"Condition '{name}' not met within {timeout}s")
+        return satisfied
+
+    def take_screenshot(self, name, debug=False):
+        """
+        Take a screenshot for debugging purposes and save it in the running scenario's screenshot namespace.
+        The filename includes a timestamp to ensure uniqueness. The file is written in the background.
+
+        Args:
+            name: base name of the screenshot file
+            debug: True for success-path screenshots, only taken when DEBUG_SCREENSHOTS is set
         """
-        import os
         from datetime import datetime
         try:
             logger.info(f"Attempting to take a screenshot with name: {name}")
             
-            # Ensure the screenshots directory exists
-            screenshots_dir = os.path.abspath(os.path.join(os.getcwd(), "screenshots"))
-            os.makedirs(screenshots_dir, exist_ok=True)
-            
             # Add a timestamp to the filename
             timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            screenshot_path = os.path.join(screenshots_dir, f"{name}_{timestamp}.png")
+            screenshot_path = Artifacts.path('screenshots', f"{name}_{timestamp}.png")
             
-            # Save the screenshot
-            self.driver.save_screenshot(screenshot_path)
-            logger.info(f"Screenshot saved successfully at: {screenshot_path}")
+            # Capture now, encode and write in the background
+            screenshot_path = ScreenshotService.capture(self.driver, screenshot_path, debug=debug)
+            if screenshot_path:
+                logger.info(f"Screenshot queued for: {screenshot_path}")
         except Exception as e:
             logger.error(f"Failed to take screenshot: {str(e)}")
 
 
+    @PerfTiming.timed('wait')
     def wait_for_element_present(self, locator, timeout=None):
         """
         Wait for element to be present in the DOM.
@@ -136,12 +711,18 @@ class BasePage:
         Returns:
             WebElement: The found element
         """
+        start_time = time.time()
         try:
             timeout = timeout or self.default_timeout
-            return WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located(locator)
             )
+            self._record_locator_health(locator, True, start_time)
+            self.record_action('wait_present', locator)
+            return element
         except TimeoutException:
+            self._record_locator_health(locator, False, start_time)
+            self.record_action('wait_present', locator, 'timeout')
             raise TimeoutException(
                 f"Element {locator} not present after {timeout} seconds"
             )
\ No newline at end of file
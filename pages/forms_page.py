@@ -1,6 +1,8 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
 from .base_page import BasePage
+from utilities.config import Config
+from utilities.perf_timing import PerfTiming
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,8 +25,12 @@ class FormsPage(BasePage):
         'upload_cv': (By.ID, 'upload_cv'),
         'upload_certificates': (By.ID, 'upload_files'),
         'german_switch': (By.XPATH, '/html/body/div/div[1]/div[2]/form/div[3]/div[2]/div/label'),
+        'german_switch_alt': (By.XPATH, "//label[contains(normalize-space(.), 'German')]"),
         'german_fluency_slider': (By.ID, 'fluency'),
-        'submit_button': (By.XPATH, "//button[@type='submit']")
+        'submit_button': (By.XPATH, "//button[@type='submit']"),
+        # "View Page" button of the Forms card on the homepage
+        'forms_page_button': (By.XPATH, "/html/body/div[2]/div[2]/div[3]/div/div[2]/a"),
+        'forms_page_button_alt': (By.CSS_SELECTOR, "a[href='forms.html']")
     }
 
     def navigate_to_forms_page(self):
@@ -32,9 +38,12 @@ class FormsPage(BasePage):
         Navigate to the Forms page by directly opening the URL.
         """
         try:
-            self.driver.get("https://play1.automationcamp.ir/forms.html")
+            with PerfTiming.phase('navigation'):
+                self.driver.get(Config.get_url("forms.html"))
+            self.record_action('navigate', "forms.html")
             logger.info("Navigated directly to the Forms page.")
         except Exception as e:
+            self.record_action('navigate', "forms.html", type(e).__name__)
             logger.error(f"Failed to navigate to the Forms page: {e}")
             self.take_screenshot("navigation_error")
             raise
@@ -65,6 +74,20 @@ class FormsPage(BasePage):
             logger.error(f"Failed to click the Download File link: {e}")
             self.take_screenshot("download_file_click_error")
             raise
+    def fill_form_spec(self, spec):
+        """
+        Fill the form from a declarative spec in one pass.
+        Keys are LOCATORS names, e.g. {'years_of_experience': '5', 'checkbox_python': True,
+        'primary_skill_dropdown': 'Selenium', 'upload_cv': '/path/to/cv.html'}.
+
+        Returns:
+            bool: True if every field was set
+        """
+        summary = self.fill_form(spec)
+        for name, result in summary.items():
+            logger.info(f"Form field {name}: {result['status']} {result.get('value', result.get('error', ''))}")
+        return all(result['status'] in ('set', 'uploaded') for result in summary.values())
+
     def fill_years_of_experience(self, years):
         """
         Fill out the 'Years of Automation Experience' field.
@@ -139,7 +162,7 @@ class FormsPage(BasePage):
         """
         Toggle the 'Speaks German?' switch.
         """
-        switch = self.wait_for_element_clickable(self.LOCATORS['german_switch'])
+        _, switch = self.find_first(self.locator_candidates('german_switch'), condition='clickable')
         current_state = switch.is_selected()
         if state and not current_state:
             switch.click()
@@ -180,20 +203,28 @@ class FormsPage(BasePage):
         """
         Verify that the non-English elements reflect the changes made.
         """
-        # Verify the text field
         text_field_locator = (By.ID, "नाव")
-        text_field = self.wait_for_element_visible(text_field_locator)
-        entered_text = text_field.get_attribute("value")
+        checkboxes = ["मराठी", "ગુજરાતી", "ਪੰਜਾਬੀ"]
+        self.wait_for_element_visible(text_field_locator)
+
+        # Read the text field and all checkboxes in one round trip
+        locators = {'text_field': text_field_locator}
+        locators.update({checkbox_id: (By.ID, checkbox_id) for checkbox_id in checkboxes})
+        state = self.probe_elements(locators, ['value', 'displayed', 'selected'])
+
+        # Verify the text field
+        entered_text = state['text_field']['value']
         if entered_text != "आपला नांव लिहा":
             logger.error(f"Non-English text field value mismatch: {entered_text}")
             return False
 
         # Verify the checkboxes
-        checkboxes = ["मराठी", "ગુજરાતી", "ਪੰਜਾਬੀ"]
         for checkbox_id in checkboxes:
-            checkbox_locator = (By.ID, checkbox_id)
-            checkbox = self.wait_for_element_visible(checkbox_locator)
-            if not checkbox.is_selected():
+            checkbox = state[checkbox_id]
+            if checkbox is None or not checkbox['displayed']:
+                logger.error(f"Checkbox {checkbox_id} is not visible.")
+                return False
+            if not checkbox['selected']:
                 logger.error(f"Checkbox {checkbox_id} is not selected.")
                 return False
 
@@ -4,6 +4,7 @@ Page object for the homepage containing element locators and
 methods specific to homepage functionality.
 """
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException
 from .base_page import BasePage
 import logging
@@ -23,30 +24,45 @@ class HomePage(BasePage):
         'site_content': (By.CLASS_NAME, "site-content")
     }
     
+    def _first_visible(self, timeout=None):
+        """
+        Poll all locators together, one round trip per attempt, until one of them is displayed
+
+        Args:
+            timeout: optional timeout in seconds
+
+        Returns:
+            tuple: (locator name, {'displayed', 'text'}) of the first displayed element in LOCATORS order
+        """
+        def first_visible(driver):
+            states = self.probe_elements(self.LOCATORS, fields=('displayed', 'text'))
+            return next(((name, states[name]) for name in self.LOCATORS
+                         if states.get(name) and states[name]['displayed']), False)
+
+        try:
+            name, state = WebDriverWait(self.driver, timeout or self.default_timeout).until(first_visible)
+        except TimeoutException:
+            self.record_action('probe_visible', list(self.LOCATORS), 'timeout')
+            raise
+        self.record_action('probe_visible', self.LOCATORS[name])
+        return name, state
+
     def verify_page_loaded(self):
         """
         Verify that the homepage has loaded successfully.
-        Tries multiple locators for better reliability.
+        Checks all locators in one round trip per attempt for better reliability.
         
         Returns:
             bool: True if the page is loaded successfully
         """
         try:
-            # Try each locator until one works
-            for name, locator in self.LOCATORS.items():
-                try:
-                    element = self.wait_for_element_visible(locator)
-                    if element.is_displayed():
-                        logger.info(f"Homepage verified using {name} locator")
-                        return True
-                except TimeoutException:
-                    logger.debug(f"Could not find element using {name} locator")
-                    continue
+            name, _ = self._first_visible()
+            logger.info(f"Homepage verified using {name} locator")
+            return True
             
-            # If we get here, none of the locators worked
+        except TimeoutException:
             logger.error("Could not verify homepage using any locators")
             return False
-            
         except Exception as e:
             logger.error(f"Error verifying homepage: {str(e)}")
             return False
@@ -59,19 +75,15 @@ class HomePage(BasePage):
             str: The text content of the page title
         """
         try:
-            for name, locator in self.LOCATORS.items():
-                try:
-                    element = self.wait_for_element_visible(locator)
-                    if element.is_displayed():
-                        title_text = element.text
-                        logger.info(f"Found page title: {title_text}")
-                        return title_text
-                except TimeoutException:
-                    continue
+            # The text is read in the same round trip as the visibility check
+            _, state = self._first_visible()
+            title_text = state['text']
+            logger.info(f"Found page title: {title_text}")
+            return title_text
             
+        except TimeoutException:
             logger.error("Could not find page title")
             return None
-            
         except Exception as e:
             logger.error(f"Error getting page title: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -12,6 +12,7 @@ The Page Object Model (POM) design pattern is used here to:
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from .base_page import BasePage
 import logging
 import time
@@ -93,12 +94,13 @@ class SamplePage(BasePage):
                 logger.info("Validation message verified")
                 
                 # Find and click close button
-                close_button = self.wait_for_element_clickable(self.LOCATORS['modal_close_button'])
+                _, close_button = self.find_first(self.locator_candidates('modal_close_button'),
+                                                  condition='clickable')
                 close_button.click()
                 logger.info("Closed validation modal")
                 
-                # Add small delay for modal to close
-                time.sleep(0.5)
+                # Wait for the modal fade-out to finish
+                self.wait_for_animations_finished(budget=0.5)
                 
                 return True
             else:
@@ -117,28 +119,19 @@ class SamplePage(BasePage):
         bool: True if form is found and visible, False otherwise
         """
         try:
-            # Logging initial page state
+            # URL, title, page source and console log are only pulled from the
+            # browser if a step fails (see utilities/failure_artifacts.py)
             logger.info("=== Starting Pizza Form Verification ===")
-            logger.info(f"Current URL: {self.driver.current_url}")
-            logger.info(f"Page Title: {self.driver.title}")
 
-             # Log any JavaScript errors or console messages
-            #logs = self.driver.get_log('browser')
-            #for log in logs:
-                #logger.info(f"Browser Log: {log}")
              # Try to clear any existing form state
             self.driver.execute_script("localStorage.clear();")
             self.driver.execute_script("sessionStorage.clear();")
             
             # Take screenshot of initial state
-            self.take_screenshot("before_form_verification")
+            self.take_screenshot("before_form_verification", debug=True)
             
-            # Log page source preview
-            logger.info("Page Source Preview (first 500 chars):")
-            logger.info(f"{self.driver.page_source[:500]}...")
-            
-            # Add initial wait after page load
-            time.sleep(2)
+            # Wait for the page to stop changing after load
+            self.wait_for_dom_quiet(budget=2)
             
             # Check for main heading with timing
             logger.info("Attempting to find pizza heading...")
@@ -153,22 +146,23 @@ class SamplePage(BasePage):
             # Check for form with timing
             logger.info("Attempting to find pizza order form...")
             start_time = time.time()
-            form = self.wait_for_element_visible(self.LOCATORS['pizza_order_form'])
+            form_locator, form = self.find_first(self.locator_candidates('pizza_order_form'))
             if not form:
                 logger.error("Pizza order form not found")
                 return False
             logger.info(f"Pizza order form found in {time.time() - start_time:.2f} seconds")
             
             # Take screenshot after verification
-            self.take_screenshot("after_form_verification")
+            self.take_screenshot("after_form_verification", debug=True)
             
             # Log form attributes if found
-            if form:
-                logger.info("Form Details:")
-                logger.info(f"Form ID: {form.get_attribute('id')}")
-                logger.info(f"Form Classes: {form.get_attribute('class')}")
-                logger.info(f"Form is Displayed: {form.is_displayed()}")
-                logger.info(f"Form is Enabled: {form.is_enabled()}")
+            if form and logger.isEnabledFor(logging.DEBUG):
+                details = self.probe_elements(
+                    {'form': self.LOCATORS[form_locator]},
+                    ['id', 'class', 'displayed', 'enabled']
+                )['form']
+                logger.debug(f"Form Details: id={details['id']}, classes={details['class']}, "
+                             f"displayed={details['displayed']}, enabled={details['enabled']}")
 
             logger.info("Successfully verified pizza order form is displayed")
             logger.info("=== Pizza Form Verification Complete ===")
@@ -208,7 +202,7 @@ class SamplePage(BasePage):
             close_button.click()
             
             # Wait for modal to disappear
-            time.sleep(1)
+            self.wait_for_animations_finished(budget=1)
             
             logger.info("Successfully handled quantity warning modal")
             return True
@@ -226,22 +220,24 @@ class SamplePage(BasePage):
             
            
             
-            # Log all radio buttons present for debugging
-            radios = self.driver.find_elements(By.CSS_SELECTOR, "input[name='size']")
-            logger.info(f"Found {len(radios)} size radio buttons")
-            for radio in radios:
-                logger.info(f"Radio button - ID: {radio.get_attribute('id')}, "
-                        f"Value: {radio.get_attribute('value')}, "
-                        f"Checked: {radio.get_attribute('checked')}")
-            
             # Try to find and click the medium radio
-            radio = self.wait_for_element_present(self.LOCATORS['size_medium'])
-            
-            # Log element state before clicking
+            radio_locator, radio = self.find_first(self.locator_candidates('size_medium'), condition='present')
+            
+            # Log all radio buttons and the medium radio state in one round trip
+            state = self.probe_elements({
+                'radios': (By.CSS_SELECTOR, "input[name='size']"),
+                'medium': self.LOCATORS[radio_locator]
+            }, ['id', 'value', 'checked', 'displayed', 'enabled', 'selected'], all_matches=True)
+            logger.info(f"Found {len(state['radios'])} size radio buttons")
+            for radio_state in state['radios']:
+                logger.info(f"Radio button - ID: {radio_state['id']}, "
+                        f"Value: {radio_state['value']}, "
+                        f"Checked: {radio_state['checked']}")
+            medium = state['medium'][0]
             logger.info(f"Found medium radio button. "
-                    f"Displayed: {radio.is_displayed()}, "
-                    f"Enabled: {radio.is_enabled()}, "
-                    f"Selected: {radio.is_selected()}")
+                    f"Displayed: {medium['displayed']}, "
+                    f"Enabled: {medium['enabled']}, "
+                    f"Selected: {medium['selected']}")
             
             # Scroll into view
             self.scroll_to_element(radio)
@@ -327,15 +323,11 @@ class SamplePage(BasePage):
         Enter pizza quantity
         """
         try:
-            # Try multiple locator strategies if needed
-            try:
-                # Try ID first
-                quantity_field = self.wait_for_element_visible((By.ID, "quantity"))
-            except Exception:
-                # Try backup locators if ID fails
-                quantity_field = self.wait_for_element_visible(
-                    (By.CSS_SELECTOR, "input[aria-describedby='How many pizza you want?']")
-                )
+            # Race the ID against the backup locator
+            _, quantity_field = self.find_first({
+                'quantity': (By.ID, "quantity"),
+                'quantity_alt': (By.CSS_SELECTOR, "input[aria-describedby='How many pizza you want?']")
+            })
 
             quantity_field.clear()
             quantity_field.send_keys(quantity)
@@ -435,7 +427,7 @@ class SamplePage(BasePage):
             bool: True if error message is found and contains expected text
         """
         try:
-            error_element = self.wait_for_element_visible(self.LOCATORS['error_message'])
+            _, error_element = self.find_first(self.locator_candidates('error_message'))
             error_text = error_element.text
             expected_text = "Incorrect username or password. Try again!"
             
@@ -459,30 +451,19 @@ class SamplePage(BasePage):
                 logger.info("Already logged in, skipping login button click")
                 return True
 
-            # Try primary login button first
+            # Race the primary login button against its alternatives
             try:
-                button = self.wait_for_element_clickable((By.ID, "login"))
-                if button:
-                    self.scroll_to_element(button)
-                    button.click()
-                    logger.info("Successfully clicked login button using ID")
-                    return True
+                locator_name, button = self.find_first(self.locator_candidates('login_button'),
+                                                       condition='clickable')
+                self.scroll_to_element(button)
+                button.click()
+                logger.info(f"Successfully clicked login button using {locator_name}")
+                return True
             except Exception:
-                logger.debug("Could not click button using ID")
+                logger.debug("Could not click button using any login button locator")
 
-            # If we're still on login page, try alternatives
+            # If we're still on login page, fall back to JavaScript
             if 'login.html' in self.driver.current_url:
-                for locator_name in ['login_button_alt1']:  # Removed alt2 and alt3
-                    try:
-                        button = self.wait_for_element_clickable(self.LOCATORS[locator_name])
-                        if button and button.is_displayed():
-                            self.scroll_to_element(button)
-                            button.click()
-                            logger.info(f"Successfully clicked login button using {locator_name}")
-                            return True
-                    except Exception:
-                        continue
-
                 # Last resort - JavaScript click
                 try:
                     button = self.driver.find_element(By.ID, "login")
@@ -519,6 +500,27 @@ class SamplePage(BasePage):
         except Exception as e:
             logger.error(f"Error verifying login result: {str(e)}")
             return False
+    def is_logged_in(self, timeout=None):
+        """
+        Check that the pizza order page is showing, without failure screenshots.
+        Polls the heading and form together in one round trip per attempt.
+
+        Args:
+            timeout: optional timeout in seconds
+
+        Returns:
+            bool: True if the order page appeared within the timeout
+        """
+        locators = {name: self.LOCATORS[name] for name in ('pizza_heading', 'pizza_order_form')}
+        try:
+            WebDriverWait(self.driver, timeout or self.default_timeout).until(
+                lambda driver: all(state and state['displayed']
+                                   for state in self.probe_elements(locators, fields=('displayed',)).values())
+            )
+            return True
+        except TimeoutException:
+            return False
+
     def click_sample_page_link(self):
         """
         Clicks the Sample Pages link to navigate to the sample pages section.
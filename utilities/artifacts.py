@@ -0,0 +1,242 @@
+"""
+Artifact namespaces.
+Every process (a serial run or one parallel worker) owns the download,
+screenshot and log roots in Config (DOWNLOADS_DIR, SCREENSHOTS_DIR,
+LOGS_DIR). Inside those, every scenario gets its own namespace directory;
+while a scenario runs Config.SCENARIO_DOWNLOADS_DIR, SCENARIO_SCREENSHOTS_DIR
+and SCENARIO_LOGS_DIR point at it. Two browsers never write to the same path.
+
+Clean-up is a rename: a directory to drop is moved into a .trash folder next
+to it (one syscall, however many files it holds) and deleted by a background
+thread. At the end of the run an index of every namespace, its scenario,
+status and files is written to reports/artifacts/ for the dashboard.
+
+Usage:
+    python -m utilities.artifacts purge    # empty the .trash folders left by earlier runs
+"""
+# Standard library imports
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+import uuid
+from datetime import datetime
+
+# Local imports
+from utilities.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Artifact kinds and the Config attributes holding their process and scenario roots
+KINDS = {
+    'downloads': ('DOWNLOADS_DIR', 'SCENARIO_DOWNLOADS_DIR'),
+    'screenshots': ('SCREENSHOTS_DIR', 'SCENARIO_SCREENSHOTS_DIR'),
+    'logs': ('LOGS_DIR', 'SCENARIO_LOGS_DIR')
+}
+
+TRASH_DIR = '.trash'
+
+
+class Artifacts:
+    """Process-wide artifact namespaces"""
+
+    _namespaces = []
+    _current = None
+    _trash_dirs = set()
+    _purger = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def slug(text, limit=100):
+        """File-system safe version of a name"""
+        return re.sub(r'[^A-Za-z0-9_.-]+', '_', text).strip('_')[:limit] or 'unnamed'
+
+    @classmethod
+    def prepare(cls):
+        """
+        Start a run: drop the scenario namespaces an earlier run of this
+        process left in the roots, in bulk, and make sure the roots exist
+        """
+        # A serial run owns the whole index; parallel workers only write their own file
+        if not Config.WORKER_ID:
+            cls.discard(Config.ARTIFACTS_INDEX_DIR)
+        for root_attribute, scenario_attribute in KINDS.values():
+            root = getattr(Config, root_attribute)
+            os.makedirs(root, exist_ok=True)
+            for entry in os.scandir(root):
+                if entry.is_dir() and entry.name.startswith('ns-'):
+                    cls.discard(entry.path)
+            setattr(Config, scenario_attribute, root)
+
+    @classmethod
+    def start_scenario(cls, scenario):
+        """
+        Point the scenario roots in Config at a new namespace for a scenario
+
+        Args:
+            scenario: behave Scenario about to run
+        """
+        feature = os.path.splitext(os.path.basename(scenario.filename))[0]
+        name = f"ns-{cls.slug(feature, 40)}-{cls.slug(scenario.name)}"
+        with cls._lock:
+            # Scenario outlines and reruns can repeat a name within one process
+            taken = {namespace['name'] for namespace in cls._namespaces}
+            unique, counter = name, 1
+            while unique in taken:
+                counter += 1
+                unique = f"{name}-{counter}"
+            cls._current = {
+                'name': unique,
+                'feature': scenario.filename,
+                'scenario': scenario.name,
+                'worker': Config.WORKER_ID or 'main',
+                'started_at': datetime.now().isoformat(timespec='seconds'),
+                'status': 'running'
+            }
+            cls._namespaces.append(cls._current)
+
+        for root_attribute, scenario_attribute in KINDS.values():
+            setattr(Config, scenario_attribute, os.path.join(getattr(Config, root_attribute), unique))
+
+    @classmethod
+    def end_scenario(cls, scenario):
+        """
+        Record the scenario's outcome, drop its downloads and point the
+        scenario roots back at the process roots
+
+        Args:
+            scenario: behave Scenario that finished
+        """
+        if cls._current is None:
+            return
+        cls._current['status'] = scenario.status.name if hasattr(scenario.status, 'name') else str(scenario.status)
+        # Downloads are checked by the steps that make them and are never worth keeping
+        cls.discard(Config.SCENARIO_DOWNLOADS_DIR)
+        for root_attribute, scenario_attribute in KINDS.values():
+            setattr(Config, scenario_attribute, getattr(Config, root_attribute))
+        cls._current = None
+
+    @staticmethod
+    def path(kind, name=''):
+        """
+        Path of an artifact in the current scenario's namespace (or the
+        process root outside a scenario); the directory is created on demand
+
+        Args:
+            kind: 'downloads', 'screenshots' or 'logs'
+            name: file name inside the namespace
+        """
+        directory = getattr(Config, KINDS[kind][1])
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name) if name else directory
+
+    @staticmethod
+    def log_file():
+        """This process's JSON-lines run log, named per worker so processes sharing a root never truncate each other's"""
+        os.makedirs(Config.LOGS_DIR, exist_ok=True)
+        return os.path.join(Config.LOGS_DIR, f"test_run-{Config.WORKER_ID or 'main'}.jsonl")
+
+    @classmethod
+    def discard(cls, path):
+        """
+        Remove a directory cheaply: rename it into a .trash folder on the same
+        file system and delete it in the background
+
+        Args:
+            path: directory to remove; missing directories are ignored
+        """
+        if not os.path.isdir(path):
+            return
+        trash = os.path.join(os.path.dirname(os.path.abspath(path)), TRASH_DIR)
+        os.makedirs(trash, exist_ok=True)
+        target = os.path.join(trash, f"{os.path.basename(path)}-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(path, target)
+        except OSError as e:
+            logger.debug(f"Could not move {path} to trash, deleting in place: {str(e)}")
+            shutil.rmtree(path, ignore_errors=True)
+            return
+        cls._purge_in_background(trash)
+
+    @classmethod
+    def save(cls, index_dir=None):
+        """Write this process's namespace index and wait for pending deletions"""
+        index_dir = index_dir or Config.ARTIFACTS_INDEX_DIR
+        entries = []
+        with cls._lock:
+            namespaces = list(cls._namespaces)
+        for namespace in namespaces:
+            files = []
+            for kind, (root_attribute, _) in KINDS.items():
+                directory = os.path.join(getattr(Config, root_attribute), namespace['name'])
+                if not os.path.isdir(directory):
+                    continue
+                for root, _, names in os.walk(directory):
+                    for file_name in names:
+                        file_path = os.path.join(root, file_name)
+                        files.append({'kind': kind, 'path': os.path.relpath(file_path),
+                                      'bytes': os.path.getsize(file_path)})
+            entries.append({**namespace, 'files': files})
+
+        if entries:
+            os.makedirs(index_dir, exist_ok=True)
+            path = os.path.join(index_dir, f"{Config.WORKER_ID or 'main'}.json")
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(temp_path, path)
+            logger.info(f"Indexed artifacts of {len(entries)} scenarios in {path}")
+
+        cls.wait_for_purge()
+
+    @classmethod
+    def wait_for_purge(cls):
+        """Block until the background deletions started by discard() have finished"""
+        purger = cls._purger
+        if purger is not None:
+            purger.join()
+
+    @classmethod
+    def _purge_in_background(cls, trash):
+        """Empty a trash folder on the purge thread, starting it if it is not running"""
+        with cls._lock:
+            cls._trash_dirs.add(trash)
+            if cls._purger is None:
+                cls._purger = threading.Thread(target=cls._purge_all, name='artifact-purge', daemon=True)
+                cls._purger.start()
+
+    @classmethod
+    def _purge_all(cls):
+        """Delete trashed directories until none are left, including ones trashed meanwhile"""
+        while True:
+            with cls._lock:
+                pending = [os.path.join(trash, entry) for trash in cls._trash_dirs
+                           if os.path.isdir(trash) for entry in os.listdir(trash)]
+                if not pending:
+                    cls._purger = None
+                    return
+            for path in pending:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+# Command line interface for emptying trash folders
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) != 2 or sys.argv[1] != 'purge':
+        print("Usage: python -m utilities.artifacts purge")
+        sys.exit(1)
+
+    for root_attribute, _ in KINDS.values():
+        Artifacts._trash_dirs.add(os.path.join(getattr(Config, root_attribute), TRASH_DIR))
+    # discard() of the index and timing directories trashes them next to themselves, in reports/.trash by default
+    for report_dir in (Config.ARTIFACTS_INDEX_DIR, Config.PERF_DIR):
+        Artifacts._trash_dirs.add(os.path.join(os.path.dirname(report_dir), TRASH_DIR))
+    Artifacts._trash_dirs.add(os.path.join('reports', 'workers', TRASH_DIR))
+    Artifacts._purge_all()
+    print(f"Emptied {', '.join(sorted(Artifacts._trash_dirs))}")
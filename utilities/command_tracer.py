@@ -0,0 +1,169 @@
+"""
+WebDriver command tracer.
+Wraps a driver's execute() so every command sent to chromedriver is
+counted and timed, per command and per calling page-object method, and
+attributed to the project call stack that issued it. Enabled with
+TRACE_COMMANDS=True.
+
+Writes, per run:
+    logs/command_trace.json     counts and latency histograms
+    logs/command_trace.folded   collapsed stacks weighted by microseconds,
+                                for flamegraph.pl or speedscope
+"""
+# Standard library imports
+import json
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+
+# Local imports
+from utilities.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Project root; frames outside it (selenium, behave, stdlib) are left out of stacks
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PAGES_DIR = os.path.join(_PROJECT_ROOT, 'pages') + os.sep
+_THIS_FILE = os.path.abspath(__file__)
+# Installed packages, which live inside the project root when its virtualenv (.venv, venv) does
+_LIBRARY_DIRS = tuple({os.path.join(os.path.abspath(sysconfig.get_paths()[key]), '')
+                       for key in ('purelib', 'platlib')})
+_LIBRARY_MARKERS = (f"{os.sep}site-packages{os.sep}", f"{os.sep}dist-packages{os.sep}")
+
+
+class CommandTracer:
+    """Process-wide WebDriver command statistics"""
+
+    # Upper bounds of the latency histogram buckets, in milliseconds
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    _commands = {}
+    _methods = {}
+    _stacks = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, driver):
+        """
+        Trace every command sent by a driver
+
+        Args:
+            driver: WebDriver instance; its execute() is wrapped in place
+        """
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            start_time = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                cls.record(driver_command, time.perf_counter() - start_time, sys._getframe(1))
+
+        driver.execute = traced_execute
+        logger.info("WebDriver command tracing enabled")
+        return driver
+
+    @classmethod
+    def record(cls, command, seconds, frame):
+        """
+        Record one command round trip
+
+        Args:
+            command: WebDriver command name, e.g. 'findElement'
+            seconds: round-trip latency
+            frame: frame that issued the command; project frames above it form the stack
+        """
+        stack = cls._project_stack(frame)
+        # Attribute to the page-object method the step called, not the helpers below it
+        method = next((name for name, filename in stack if filename.startswith(_PAGES_DIR)), None)
+        folded = ';'.join([name for name, _ in stack] + [command])
+
+        with cls._lock:
+            cls._add(cls._commands.setdefault(command, cls._new_stats()), seconds)
+            if method:
+                stats = cls._methods.setdefault(method, cls._new_stats())
+                cls._add(stats, seconds)
+                stats.setdefault('commands', {})
+                stats['commands'][command] = stats['commands'].get(command, 0) + 1
+            cls._stacks[folded] = cls._stacks.get(folded, 0.0) + seconds * 1_000_000
+
+    @classmethod
+    def summary(cls):
+        """
+        Summarise the traced commands
+
+        Returns:
+            dict: 'commands' and 'methods', each name -> count, total/avg/max ms and histogram
+        """
+        def rounded(stats):
+            return {
+                **stats,
+                'total_ms': round(stats['total_ms'], 1),
+                'avg_ms': round(stats['total_ms'] / stats['count'], 2),
+                'max_ms': round(stats['max_ms'], 1)
+            }
+
+        with cls._lock:
+            return {
+                'total_commands': sum(stats['count'] for stats in cls._commands.values()),
+                'commands': {name: rounded(stats) for name, stats in
+                             sorted(cls._commands.items(), key=lambda item: -item[1]['count'])},
+                'methods': {name: rounded(stats) for name, stats in
+                            sorted(cls._methods.items(), key=lambda item: -item[1]['count'])}
+            }
+
+    @classmethod
+    def save(cls):
+        """Write the JSON summary and the collapsed stacks file, and log the chattiest methods"""
+        if not cls._commands:
+            return
+        os.makedirs(Config.LOGS_DIR, exist_ok=True)
+        summary = cls.summary()
+        with open(os.path.join(Config.LOGS_DIR, 'command_trace.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        with open(os.path.join(Config.LOGS_DIR, 'command_trace.folded'), 'w', encoding='utf-8') as f:
+            for stack, micros in sorted(cls._stacks.items()):
+                f.write(f"{stack} {max(1, round(micros))}\n")
+
+        logger.info(f"Traced {summary['total_commands']} WebDriver commands (logs/command_trace.json)")
+        for name, stats in list(summary['methods'].items())[:5]:
+            logger.info(f"  {name}: {stats['count']} commands, {stats['total_ms']:.0f} ms")
+
+    @classmethod
+    def _new_stats(cls):
+        """Empty statistics entry"""
+        return {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'histogram': {f"<={bound}ms": 0 for bound in cls.BUCKETS_MS} | {'>5000ms': 0}}
+
+    @classmethod
+    def _add(cls, stats, seconds):
+        """Add one latency sample to a statistics entry"""
+        millis = seconds * 1000
+        stats['count'] += 1
+        stats['total_ms'] += millis
+        stats['max_ms'] = max(stats['max_ms'], millis)
+        bucket = next((f"<={bound}ms" for bound in cls.BUCKETS_MS if millis <= bound), '>5000ms')
+        stats['histogram'][bucket] += 1
+
+    @staticmethod
+    def _project_stack(frame):
+        """Project frames from outermost to innermost as (qualified name, filename)"""
+        stack = []
+        while frame is not None:
+            # behave compiles step files and environment.py with paths relative to the working directory
+            filename = os.path.abspath(frame.f_code.co_filename)
+            if (filename.startswith(_PROJECT_ROOT) and filename != _THIS_FILE
+                    and not filename.startswith(_LIBRARY_DIRS)
+                    and not any(marker in filename for marker in _LIBRARY_MARKERS)):
+                name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+                # Module-level functions (every step is a step_impl) are qualified by module
+                if '.' not in name:
+                    name = f"{os.path.splitext(os.path.basename(filename))[0]}.{name}"
+                stack.append((name, filename))
+            frame = frame.f_back
+        stack.reverse()
+        return stack
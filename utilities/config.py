@@ -4,6 +4,7 @@ Configuration management for the test framework
 from selenium.webdriver.chrome.options import Options
 import os
 from dotenv import load_dotenv
+from urllib.parse import urljoin
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,11 +30,107 @@ class Config:
         cls.DEFAULT_TIMEOUT = int(os.getenv('DEFAULT_TIMEOUT', 10))
         cls.EXPLICIT_TIMEOUT = int(os.getenv('EXPLICIT_TIMEOUT', 20))
         
+        # Local fixture server standing in for the practice site
+        cls.USE_FIXTURE_SERVER = os.getenv('USE_FIXTURE_SERVER', 'False').lower() == 'true'
+        cls.FIXTURE_ROOT = os.getenv('FIXTURE_ROOT', os.path.join('fixtures', 'site'))
+        cls.FIXTURE_PORT = int(os.getenv('FIXTURE_PORT', 0))
+        
+        # Artifact directories (overridden per worker by the parallel runner)
+        cls.WORKER_ID = os.getenv('WORKER_ID', '')
+        cls.DOWNLOADS_DIR = os.path.abspath(os.getenv('DOWNLOADS_DIR', 'downloads'))
+        cls.SCREENSHOTS_DIR = os.path.abspath(os.getenv('SCREENSHOTS_DIR', 'screenshots'))
+        cls.LOGS_DIR = os.path.abspath(os.getenv('LOGS_DIR', 'logs'))
+        cls.PERF_DIR = os.path.abspath(os.getenv('PERF_DIR', os.path.join('reports', 'perf')))
+        cls.ARTIFACTS_INDEX_DIR = os.path.abspath(os.getenv('ARTIFACTS_INDEX_DIR', os.path.join('reports', 'artifacts')))
+        # Per-scenario namespaces inside the roots above, switched by utilities.artifacts
+        cls.SCENARIO_DOWNLOADS_DIR = cls.DOWNLOADS_DIR
+        cls.SCENARIO_SCREENSHOTS_DIR = cls.SCREENSHOTS_DIR
+        cls.SCENARIO_LOGS_DIR = cls.LOGS_DIR
+        
+        # Logging: records are written as JSON lines by a background listener
+        cls.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+        cls.LOG_CONSOLE = os.getenv('LOG_CONSOLE', 'True').lower() == 'true'
+        
+        # Failed steps: page source, screenshot and console log bundled with recent page-object actions
+        cls.FAILURE_ARTIFACTS = os.getenv('FAILURE_ARTIFACTS', 'True').lower() == 'true'
+        cls.ACTION_BUFFER_SIZE = int(os.getenv('ACTION_BUFFER_SIZE', 50))
+        
+        # Screenshot capture: success-path screenshots are opt-in; writes happen in the background
+        cls.DEBUG_SCREENSHOTS = os.getenv('DEBUG_SCREENSHOTS', 'False').lower() == 'true'
+        cls.SCREENSHOT_FORMAT = os.getenv('SCREENSHOT_FORMAT', 'png').lower()
+        cls.SCREENSHOT_MAX_WIDTH = int(os.getenv('SCREENSHOT_MAX_WIDTH', 0))
+        cls.SCREENSHOT_WORKERS = int(os.getenv('SCREENSHOT_WORKERS', 2))
+        cls.SCREENSHOT_QUEUE_SIZE = int(os.getenv('SCREENSHOT_QUEUE_SIZE', 16))
+        
+        # De-duplicating screenshot store, shared by all workers
+        cls.SCREENSHOT_STORE = os.getenv('SCREENSHOT_STORE', 'False').lower() == 'true'
+        cls.SCREENSHOT_STORE_DIR = os.path.abspath(os.getenv('SCREENSHOT_STORE_DIR', os.path.join('screenshots', 'store')))
+        cls.SCREENSHOT_DHASH_DISTANCE = int(os.getenv('SCREENSHOT_DHASH_DISTANCE', 4))
+        cls.SCREENSHOT_RETENTION_DAYS = int(os.getenv('SCREENSHOT_RETENTION_DAYS', 14))
+        
+        # Historical scenario durations used to balance parallel shards
+        cls.TIMINGS_FILE = os.getenv('TIMINGS_FILE', os.path.join('.cache', 'scenario_timings.json'))
+        
+        # Failed-scenario reruns and flaky-scenario quarantine
+        cls.RERUN_FAILED = int(os.getenv('RERUN_FAILED', 0))
+        cls.FLAKY_FILE = os.getenv('FLAKY_FILE', os.path.join('.cache', 'flaky_scenarios.json'))
+        cls.FLAKY_QUARANTINE_RATE = float(os.getenv('FLAKY_QUARANTINE_RATE', 0.2))
+        cls.FLAKY_MIN_RUNS = int(os.getenv('FLAKY_MIN_RUNS', 5))
+        
+        # Restore a cached login session instead of repeating the login flow
+        cls.SESSION_CACHE = os.getenv('SESSION_CACHE', 'True').lower() == 'true'
+        
+        # Cached dependency index used to select scenarios affected by a change
+        cls.IMPACT_INDEX_FILE = os.getenv('IMPACT_INDEX_FILE', os.path.join('.cache', 'impact_index.json'))
+        
+        # ChromeDriver resolution
+        cls.CHROMEDRIVER_PATH = os.getenv('CHROMEDRIVER_PATH', '')
+        cls.CHROMEDRIVER_OFFLINE = os.getenv('CHROMEDRIVER_OFFLINE', 'False').lower() == 'true'
+        cls.CHROMEDRIVER_MANIFEST = os.getenv(
+            'CHROMEDRIVER_MANIFEST',
+            os.path.join(os.path.expanduser('~'), '.cache', 'wat', 'chromedriver_manifest.json')
+        )
+        
+        # Locator hit/miss statistics used to order fallback locators
+        cls.LOCATOR_HEALTH_FILE = os.getenv('LOCATOR_HEALTH_FILE', os.path.join('.cache', 'locator_health.json'))
+        
+        # Form filling: 'bulk' applies a whole form spec in one script, 'legacy' uses per-field methods
+        cls.FORM_FILL_MODE = os.getenv('FORM_FILL_MODE', 'bulk').lower()
+        
+        # Driver session pool (reuse warm browsers across scenarios)
+        cls.DRIVER_POOL = os.getenv('DRIVER_POOL', 'False').lower() == 'true'
+        cls.DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', 1))
+        cls.DRIVER_POOL_MAX_USES = int(os.getenv('DRIVER_POOL_MAX_USES', 25))
+        
+        # Count and time every WebDriver command per page-object method
+        cls.TRACE_COMMANDS = os.getenv('TRACE_COMMANDS', 'False').lower() == 'true'
+        
+        # Record-and-replay HTTP cache for page loads: 'off', 'record' or 'replay'
+        cls.NETWORK_CACHE_MODE = os.getenv('NETWORK_CACHE_MODE', 'off').lower()
+        cls.NETWORK_CACHE_DIR = os.getenv('NETWORK_CACHE_DIR', os.path.join('.cache', 'network'))
+        
+        # Browser profile: 'default', or 'lean' to skip images, fonts and background services.
+        # Features tagged @lean or @default_profile override it.
+        cls.BROWSER_PROFILE = os.getenv('BROWSER_PROFILE', 'default').lower()
+        cls.BLOCKED_URL_PATTERNS = [
+            pattern.strip() for pattern in os.getenv(
+                'BLOCKED_URL_PATTERNS',
+                '*.png,*.jpg,*.jpeg,*.gif,*.webp,*.svg,*.woff,*.woff2,*.ttf,'
+                '*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*'
+            ).split(',') if pattern.strip()
+        ]
+        cls.PROFILE_METRICS_FILE = os.getenv('PROFILE_METRICS_FILE', os.path.join('.cache', 'profile_metrics.json'))
+        
         logger.info(f"Initialized configuration for {cls.TEST_ENV} environment")
     
     @classmethod
-    def get_browser_options(cls):
-        """Get Chrome options based on configuration"""
+    def get_browser_options(cls, profile=None):
+        """
+        Get Chrome options based on configuration
+
+        Args:
+            profile: 'default' or 'lean' (default: BROWSER_PROFILE)
+        """
         options = Options()
         
         # Basic options
@@ -43,10 +140,30 @@ class Config:
         # Add window size for better reliability
         options.add_argument('--window-size=1920,1080')
         
+        # Keep the browser console log so failed steps can attach it
+        if cls.FAILURE_ARTIFACTS:
+            options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+        
         # Add headless mode if configured
         if cls.HEADLESS:
             options.add_argument('--headless=new')
         
+        # Lean profile: no images or web fonts, no background services
+        if (profile or cls.BROWSER_PROFILE) == 'lean':
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_argument('--disable-remote-fonts')
+            options.add_argument('--disable-background-networking')
+            options.add_argument('--disable-component-update')
+            options.add_argument('--disable-sync')
+            options.add_argument('--disable-features=Translate,OptimizationHints,MediaRouter')
+            options.add_argument('--disable-gpu')
+            options.add_argument('--disable-default-apps')
+            options.add_argument('--no-first-run')
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,  # Block images
+                "translate.enabled": False,
+            })
+        
         return options
     
     @classmethod
@@ -55,5 +172,15 @@ class Config:
         logger.info(f"Using URL for {cls.TEST_ENV} environment: {cls.BASE_URL}")
         return cls.BASE_URL
 
+    @classmethod
+    def get_url(cls, page):
+        """
+        Get the URL of a page on the site under test, relative to BASE_URL
+
+        Args:
+            page: page path such as 'forms.html'
+        """
+        return urljoin(cls.BASE_URL, page)
+
 # Initialize configuration when module is loaded
 Config.init()
@@ -0,0 +1,192 @@
+"""
+Download completion watcher.
+Gives each scenario its own download subdirectory inside its artifact
+namespace (see utilities/artifacts.py), pointed at with the DevTools
+Browser.setDownloadBehavior command, and waits for a download to finish:
+Chrome writes to a .crdownload file and renames it to the final name when
+done. On Linux the rename is picked up through inotify (via ctypes) the
+moment it happens; elsewhere, or if inotify is unavailable, the directory is
+polled every POLL_INTERVAL seconds.
+"""
+# Standard library imports
+import ctypes
+import ctypes.util
+import errno
+import hashlib
+import logging
+import os
+import select
+import struct
+import sys
+import time
+
+# Third-party imports
+from selenium.common.exceptions import WebDriverException
+
+# Local imports
+from utilities.artifacts import Artifacts
+from utilities.config import Config
+from utilities.perf_timing import PerfTiming
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.tmp')
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_libc():
+    """libc with the inotify functions, or None where they are unavailable"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_LIBC = _load_libc()
+
+
+class DownloadWatcher:
+    """Watch one download directory for completed files"""
+
+    # Seconds between directory scans when inotify is unavailable
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._fd = self._watch(self.directory)
+
+    @classmethod
+    def for_scenario(cls, driver, scenario_name):
+        """
+        Send a driver's downloads to a fresh subdirectory for one scenario
+
+        Args:
+            driver: WebDriver about to download something
+            scenario_name: name of the running scenario
+
+        Returns:
+            DownloadWatcher: watcher armed on the scenario's directory (or on the
+            shared download directory if the browser rejects the command)
+        """
+        # The scenario's artifact namespace is fresh; a second download step gets its own subdirectory
+        directory = Artifacts.path('downloads', f"{Artifacts.slug(scenario_name, 40)}-{time.monotonic_ns()}")
+        # Arm the watch before the browser is told about the directory, so no event is missed
+        watcher = cls(directory)
+        try:
+            driver.execute_cdp_cmd('Browser.setDownloadBehavior', {'behavior': 'allow', 'downloadPath': directory})
+        except WebDriverException as e:
+            logger.warning(f"Could not set a per-scenario download directory: {str(e)}")
+            watcher.close()
+            watcher = cls(Config.DOWNLOADS_DIR)
+        return watcher
+
+    @PerfTiming.timed('wait')
+    def wait_for(self, name=None, timeout=None):
+        """
+        Wait until a download has finished
+
+        Args:
+            name: expected file name; any completed file if None
+            timeout: optional timeout in seconds
+
+        Returns:
+            dict: 'path', 'size' and 'sha256' of the completed file
+
+        Raises:
+            TimeoutError: if no completed download appeared in time
+        """
+        timeout = timeout or Config.DEFAULT_TIMEOUT
+        deadline = time.monotonic() + timeout
+        start_time = time.monotonic()
+        while True:
+            path = self._completed(name)
+            if path:
+                result = {'path': path, 'size': os.path.getsize(path), 'sha256': self.sha256(path)}
+                logger.info(f"Download finished in {time.monotonic() - start_time:.2f}s: "
+                            f"{path} ({result['size']} bytes)")
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                partial = [entry for entry in os.listdir(self.directory) if entry.endswith(PARTIAL_SUFFIXES)]
+                raise TimeoutError(f"No completed download{' of ' + name if name else ''} in {self.directory} "
+                                   f"after {timeout}s (partial files: {partial or 'none'})")
+            self._wait_for_event(remaining)
+
+    def close(self):
+        """Stop watching"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def cleanup(self):
+        """Stop watching and delete the directory if it belongs to one scenario"""
+        self.close()
+        if self.directory != os.path.abspath(Config.DOWNLOADS_DIR):
+            Artifacts.discard(self.directory)
+
+    @staticmethod
+    def sha256(path):
+        """SHA-256 hex digest of a file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _completed(self, name):
+        """Path of a finished download, or None while it is missing or still being written"""
+        entries = os.listdir(self.directory)
+        candidates = [name] if name else [entry for entry in entries if not entry.endswith(PARTIAL_SUFFIXES)]
+        for candidate in candidates:
+            if candidate not in entries:
+                continue
+            # Chrome keeps the final name reserved while <name>.crdownload is still open
+            if any(entry.startswith(candidate) and entry.endswith(PARTIAL_SUFFIXES) for entry in entries):
+                continue
+            return os.path.join(self.directory, candidate)
+        return None
+
+    def _wait_for_event(self, timeout):
+        """Block until a file is closed or renamed in the directory, or a poll interval passes"""
+        if self._fd is None:
+            time.sleep(min(self.POLL_INTERVAL, timeout))
+            return
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + length
+                logger.debug(f"inotify event 0x{mask:x} in {self.directory}")
+
+    @staticmethod
+    def _watch(directory):
+        """inotify descriptor watching a directory for completed writes and renames, or None"""
+        if _LIBC is None:
+            return None
+        fd = _LIBC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logger.debug(f"inotify unavailable ({errno.errorcode.get(ctypes.get_errno(), '?')}); polling")
+            return None
+        if _LIBC.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            logger.debug(f"Could not watch {directory}; polling")
+            os.close(fd)
+            return None
+        return fd
@@ -9,26 +9,171 @@ import os
 import urllib.request
 import zipfile
 import tempfile
-import shutil
 import subprocess
+import threading
 
 # Selenium imports
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-
-# WebDriver manager imports
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
 
 # Local imports
+from utilities.artifacts import Artifacts
 from utilities.config import Config
+from utilities.driver_resolver import ChromeDriverResolver
+from utilities.perf_timing import PerfTiming
+from utilities.command_tracer import CommandTracer
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+class DriverPool:
+    """
+    Pool of warm WebDriver sessions reused across scenarios.
+    Sessions are reset between scenarios instead of being relaunched,
+    and recycled after a failed health check or after max_uses scenarios.
+    """
+
+    def __init__(self, size=1, max_uses=25, profile='default'):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.profile = profile
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Launch sessions until the pool holds `size` idle drivers"""
+        while len(self._idle) < self.size:
+            driver = DriverFactory.get_driver(self.profile)
+            with self._lock:
+                self._idle.append(driver)
+        logger.info(f"Driver pool ({self.profile} profile) warmed with {len(self._idle)} session(s)")
+
+    def acquire(self):
+        """
+        Take a healthy driver from the pool, launching a new one if needed
+
+        Returns:
+            WebDriver: Driver ready for a new scenario
+        """
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                driver = DriverFactory.get_driver(self.profile)
+                break
+            if self.is_healthy(driver):
+                break
+            logger.warning("Pooled driver failed health check, recycling it")
+            self._discard(driver)
+
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver, failed=False):
+        """
+        Return a driver to the pool after resetting its state
+
+        Args:
+            driver: WebDriver previously returned by acquire()
+            failed: True if the scenario failed; the session is still
+                reused unless the reset or health check fails
+        """
+        uses = self._uses.get(id(driver), 0)
+        if uses >= self.max_uses:
+            logger.info(f"Recycling driver after {uses} uses")
+            self._discard(driver)
+            return
+
+        if not self.reset(driver) or not self.is_healthy(driver):
+            logger.warning(f"Driver could not be reset{' after failure' if failed else ''}, recycling it")
+            self._discard(driver)
+            return
+
+        with self._lock:
+            self._idle.append(driver)
+
+    def shutdown(self):
+        """Quit every idle driver held by the pool"""
+        with self._lock:
+            drivers, self._idle = self._idle, []
+        for driver in drivers:
+            self._discard(driver)
+        logger.info("Driver pool shut down")
+
+    @staticmethod
+    def is_healthy(driver):
+        """Check that the browser session still responds to commands"""
+        try:
+            driver.execute_script("return document.readyState")
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def reset(driver):
+        """
+        Reset browser state between scenarios: extra windows, web storage,
+        cookies, the console log and the contents of the download directory
+
+        Returns:
+            bool: True if the session was reset successfully
+        """
+        try:
+            # Close any windows opened by the previous scenario
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # Storage is per origin, so clear it before leaving the page
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except WebDriverException:
+                logger.debug("No web storage to clear on current page")
+
+            # Clear cookies for every domain, not only the current one
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+
+            # Reading the console log drains it, so failure artifacts never show an earlier scenario's entries
+            if Config.FAILURE_ARTIFACTS:
+                driver.get_log('browser')
+
+            # Undo a per-scenario download directory and remove files left behind
+            driver.execute_cdp_cmd('Browser.setDownloadBehavior', {'behavior': 'default'})
+            download_directory = DriverFactory.get_download_directory()
+            for name in os.listdir(download_directory):
+                path = os.path.join(download_directory, name)
+                if os.path.isdir(path):
+                    Artifacts.discard(path)
+                else:
+                    os.remove(path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to reset pooled driver: {str(e)}")
+            return False
+
+    def _discard(self, driver):
+        """Quit a driver and forget its usage count"""
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            DriverFactory.quit_driver(driver)
+        except Exception as e:
+            logger.debug(f"Error quitting driver: {str(e)}")
+
+
 class DriverFactory:
     """Factory class for creating WebDriver instances"""
     
+    _pools = {}
+
     @staticmethod
     def download_chromedriver_for_ci():
         """
@@ -37,43 +182,46 @@ class DriverFactory:
         str: Path to ChromeDriver executable
     """
         try:
-            from webdriver_manager.chrome import ChromeDriverManager
-        
-        # Use WebDriver Manager to dynamically install the correct ChromeDriver
-            chromedriver_path = ChromeDriverManager().install()
-            logger.info(f"ChromeDriver installed at: {chromedriver_path}")
+            # Resolved once per process and cached on disk per Chrome version
+            chromedriver_path = ChromeDriverResolver.resolve()
+            logger.info(f"ChromeDriver resolved at: {chromedriver_path}")
             return chromedriver_path
         except Exception as e:
             logger.error(f"Error downloading ChromeDriver: {str(e)}")
             raise
     
     @staticmethod
-    def get_driver():
+    @PerfTiming.timed('driver_startup')
+    def get_driver(profile=None):
         """
         Create and return a WebDriver instance
         Handles both local and CI/CD environments
         
+        Args:
+            profile: browser profile, 'default' or 'lean' (default: Config.BROWSER_PROFILE)
+
         Returns:
             WebDriver: Configured WebDriver instance
         """
         try:
+            profile = profile or Config.BROWSER_PROFILE
+
             # Get browser options from config
-            options = Config.get_browser_options()
+            options = Config.get_browser_options(profile)
 
             # Determine the dynamic downloads directory
-            project_root = os.getcwd()
-            download_directory = os.path.join(project_root, "downloads")
-            os.makedirs(download_directory, exist_ok=True)  # Ensure the directory exists
+            download_directory = DriverFactory.get_download_directory()
             logger.info(f"Download directory being set to: {download_directory}")
 
-            # Add download preferences
-            prefs = {
+            # Add download preferences on top of any set by the profile
+            prefs = dict(options.experimental_options.get("prefs", {}))
+            prefs.update({
                 "download.default_directory": download_directory,  # Platform-independent path
                 "download.prompt_for_download": False,  # Disable download prompts
                 "safebrowsing.enabled": True,  # Enable Safe Browsing
                 "profile.default_content_settings.popups": 0,  # Disable popups for file downloads
                 "profile.default_content_setting_values.automatic_downloads": 1,  # Allow multiple downloads
-            }
+            })
 
             options.add_experimental_option("prefs", prefs)
 
@@ -94,8 +242,8 @@ class DriverFactory:
                 options.add_argument('--start-maximized')
                 options.add_argument('--window-size=1920,1080')
                 
-                # Use webdriver-manager for local environment
-                service = Service(ChromeDriverManager().install())
+                # Use the cached driver resolver for local environment
+                service = Service(executable_path=ChromeDriverResolver.resolve())
 
             # Create the driver
             driver = webdriver.Chrome(
@@ -115,16 +263,120 @@ class DriverFactory:
 
             logger.info(
                 f"Created Chrome driver in "
-                f"{'headless' if Config.HEADLESS or os.getenv('GITHUB_ACTIONS') else 'normal'} mode"
+                f"{'headless' if Config.HEADLESS or os.getenv('GITHUB_ACTIONS') else 'normal'} mode "
+                f"with the {profile} profile"
             )
             logger.info(f"Download directory set to: {download_directory}")
 
+            # Async scripts back the condition waits in BasePage; their own
+            # deadlines are shorter, this is only a safety net
+            driver.set_script_timeout(Config.EXPLICIT_TIMEOUT)
+
+            if Config.TRACE_COMMANDS:
+                CommandTracer.attach(driver)
+
+            # Lean profile: drop requests the assertions never look at
+            if profile == 'lean' and Config.BLOCKED_URL_PATTERNS:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': Config.BLOCKED_URL_PATTERNS})
+                logger.info(f"Blocking {len(Config.BLOCKED_URL_PATTERNS)} URL pattern(s)")
+
+            # Serve page loads from (or record them to) the network archive
+            if Config.NETWORK_CACHE_MODE in ('record', 'replay'):
+                from utilities.network_replay import NetworkReplay
+                NetworkReplay(driver, Config.NETWORK_CACHE_MODE).start()
+
             return driver
 
         except Exception as e:
             logger.error(f"Failed to create driver: {str(e)}")
             raise
     
+    @staticmethod
+    def get_download_directory():
+        """
+        Get the downloads directory used by the browser, creating it if needed
+
+        Returns:
+            str: Absolute path to the downloads directory
+        """
+        download_directory = Config.DOWNLOADS_DIR
+        os.makedirs(download_directory, exist_ok=True)  # Ensure the directory exists
+        return download_directory
+
+    @staticmethod
+    def profile_for_tags(tags):
+        """
+        Pick the browser profile for a scenario from its tags
+
+        Args:
+            tags: effective tags of the scenario (feature tags included)
+
+        Returns:
+            str: 'lean' for @lean, 'default' for @default_profile, else Config.BROWSER_PROFILE
+        """
+        if 'lean' in tags:
+            return 'lean'
+        if 'default_profile' in tags:
+            return 'default'
+        return Config.BROWSER_PROFILE
+
+    @classmethod
+    def get_pool(cls, profile=None):
+        """Get the process-wide driver pool for a profile, creating it on first use"""
+        profile = profile or Config.BROWSER_PROFILE
+        if profile not in cls._pools:
+            cls._pools[profile] = DriverPool(Config.DRIVER_POOL_SIZE, Config.DRIVER_POOL_MAX_USES, profile)
+        return cls._pools[profile]
+
+    @classmethod
+    def acquire_driver(cls, profile=None):
+        """
+        Get a driver for a scenario, from the pool when DRIVER_POOL is enabled
+
+        Args:
+            profile: browser profile (default: Config.BROWSER_PROFILE)
+
+        Returns:
+            WebDriver: Configured WebDriver instance
+        """
+        if Config.DRIVER_POOL:
+            return cls.get_pool(profile).acquire()
+        return cls.get_driver(profile)
+
+    @classmethod
+    def release_driver(cls, driver, failed=False, profile=None):
+        """
+        Hand a driver back after a scenario: reset and keep it when pooling,
+        otherwise quit it
+
+        Args:
+            driver: WebDriver returned by acquire_driver()
+            failed: True if the scenario failed
+            profile: profile the driver was acquired with
+        """
+        if Config.DRIVER_POOL:
+            cls.get_pool(profile).release(driver, failed=failed)
+        else:
+            cls.quit_driver(driver)
+
+    @staticmethod
+    def quit_driver(driver):
+        """Quit a driver, stopping its network interceptor first"""
+        if Config.NETWORK_CACHE_MODE in ('record', 'replay'):
+            from utilities.network_replay import NetworkReplay
+            interceptor = NetworkReplay.for_driver(driver)
+            if interceptor is not None:
+                interceptor.stop()
+        driver.quit()
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Quit all pooled drivers at the end of the run"""
+        pools, cls._pools = cls._pools, {}
+        for pool in pools.values():
+            pool.shutdown()
+
     @staticmethod
     def is_running_in_ci():
         """Check if running in CI environment"""
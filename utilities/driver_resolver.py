@@ -0,0 +1,190 @@
+"""
+ChromeDriver resolution with a per-process and per-machine cache.
+The driver binary is looked up once per process; across processes an
+on-disk manifest keyed by the installed Chrome version lets later runs
+skip webdriver-manager (and the network) entirely.
+
+Usage:
+    python -m utilities.driver_resolver prefetch   # resolve and cache the driver
+    python -m utilities.driver_resolver show       # print the cached manifest
+"""
+# Standard library imports
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+
+# Local imports
+from utilities.config import Config
+from utilities.json_files import locked, write_json
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ChromeDriverResolver:
+    """Resolves the ChromeDriver binary matching the installed Chrome"""
+
+    # Commands tried, in order, to read the installed Chrome version
+    VERSION_COMMANDS = [
+        ['google-chrome', '--version'],
+        ['google-chrome-stable', '--version'],
+        ['chromium', '--version'],
+        ['chromium-browser', '--version'],
+        ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome', '--version'],
+        ['reg', 'query', r'HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon', '/v', 'version']
+    ]
+
+    # Manifest key of the driver last downloaded while the Chrome version could not be read
+    UNKNOWN_VERSION = 'unknown'
+
+    _resolved_path = None
+    _chrome_version = None
+    _version_probed = False
+
+    @classmethod
+    def resolve(cls):
+        """
+        Get the path to a ChromeDriver binary, downloading it only when
+        nothing usable is cached
+
+        Returns:
+            str: Path to the ChromeDriver executable
+
+        Raises:
+            RuntimeError: If no driver is cached and none can be downloaded
+        """
+        if cls._resolved_path and os.path.exists(cls._resolved_path):
+            return cls._resolved_path
+
+        # An explicit path always wins
+        if Config.CHROMEDRIVER_PATH:
+            cls._resolved_path = Config.CHROMEDRIVER_PATH
+            logger.info(f"Using ChromeDriver from CHROMEDRIVER_PATH: {cls._resolved_path}")
+            return cls._resolved_path
+
+        version = cls.get_chrome_version()
+        manifest = cls._load_manifest()
+        # Without a version the driver of the last unversioned download is reused
+        key = version or cls.UNKNOWN_VERSION
+        entry = manifest.get(key)
+        if entry and os.path.exists(entry['path']):
+            cls._resolved_path = entry['path']
+            logger.info(f"Using cached ChromeDriver for Chrome {key}: {cls._resolved_path}")
+            return cls._resolved_path
+
+        if not Config.CHROMEDRIVER_OFFLINE:
+            try:
+                return cls._download(version)
+            except Exception as e:
+                logger.warning(f"ChromeDriver download failed, looking for an offline fallback: {str(e)}")
+
+        cls._resolved_path = cls._offline_fallback(version, manifest)
+        return cls._resolved_path
+
+    @classmethod
+    def prefetch(cls):
+        """
+        Download the driver for the installed Chrome and record it in the manifest,
+        even if one is already cached
+
+        Returns:
+            str: Path to the ChromeDriver executable
+        """
+        cls._resolved_path = None
+        return cls._download(cls.get_chrome_version())
+
+    @classmethod
+    def get_chrome_version(cls):
+        """
+        Read the installed Chrome version
+
+        Returns:
+            str: Version such as '120.0.6099.109', or None if Chrome was not found
+        """
+        if cls._version_probed:
+            return cls._chrome_version
+        cls._version_probed = True
+        for command in cls.VERSION_COMMANDS:
+            try:
+                output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+            except (OSError, subprocess.SubprocessError):
+                continue
+            match = re.search(r'(\d+\.\d+\.\d+\.\d+)', output)
+            if match:
+                cls._chrome_version = match.group(1)
+                return cls._chrome_version
+        logger.warning("Could not determine installed Chrome version")
+        return None
+
+    @classmethod
+    def _download(cls, version):
+        """Install the driver with webdriver-manager and record it in the manifest"""
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        path = ChromeDriverManager().install()
+        logger.info(f"ChromeDriver installed at: {path}")
+        # Re-read under the lock: other workers may have recorded drivers meanwhile
+        with locked(Config.CHROMEDRIVER_MANIFEST):
+            manifest = cls._load_manifest()
+            manifest[version or cls.UNKNOWN_VERSION] = {
+                'path': path,
+                'resolved_at': datetime.now().isoformat(timespec='seconds')
+            }
+            cls._save_manifest(manifest)
+        cls._resolved_path = path
+        return path
+
+    @classmethod
+    def _offline_fallback(cls, version, manifest):
+        """Find a usable driver without the network: same major version, then PATH"""
+        major = version.split('.')[0] if version else None
+        for cached_version, entry in sorted(manifest.items(), reverse=True):
+            if major and cached_version.split('.')[0] == major and os.path.exists(entry['path']):
+                logger.info(f"Using cached ChromeDriver for Chrome {cached_version}: {entry['path']}")
+                return entry['path']
+
+        path = shutil.which('chromedriver')
+        if path:
+            logger.info(f"Using ChromeDriver from PATH: {path}")
+            return path
+        raise RuntimeError(
+            f"No cached ChromeDriver for Chrome {version or 'unknown'}; "
+            f"run 'python -m utilities.driver_resolver prefetch' with network access"
+        )
+
+    @staticmethod
+    def _load_manifest():
+        """Read the manifest, returning an empty one if it is missing or corrupt"""
+        try:
+            with open(Config.CHROMEDRIVER_MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ChromeDriver manifest: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _save_manifest(manifest):
+        """Write the manifest atomically; callers hold locked() on it"""
+        write_json(Config.CHROMEDRIVER_MANIFEST, manifest, indent=2, sort_keys=True)
+
+
+# Command line interface for prefetching the driver
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) != 2 or sys.argv[1] not in ('prefetch', 'show'):
+        print("Usage: python -m utilities.driver_resolver [prefetch|show]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'prefetch':
+        print(ChromeDriverResolver.prefetch())
+    else:
+        print(json.dumps(ChromeDriverResolver._load_manifest(), indent=2))
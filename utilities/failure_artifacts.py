@@ -0,0 +1,123 @@
+"""
+Failure artifact collector.
+Page objects note what they do (clicks, waits, lookups, form fills) in a
+small ring buffer: one tuple per action, no browser round trips. Only when a
+step fails is the expensive state pulled from the browser (the full page
+source, a screenshot and the browser console log) and bundled with the
+recent actions into one compressed zip per failed step, in the scenario's
+log namespace. Enabled with FAILURE_ARTIFACTS (default True).
+
+A bundle holds:
+    meta.json           scenario, step, error, URL and title
+    actions.json        the last ACTION_BUFFER_SIZE page-object actions
+    page_source.html    the DOM at the time of failure
+    screenshot.png      the viewport at the time of failure
+    console.json        browser console entries of the scenario so far
+"""
+# Standard library imports
+import json
+import logging
+import time
+import zipfile
+from collections import deque
+from datetime import datetime
+
+# Local imports
+from utilities.artifacts import Artifacts
+from utilities.config import Config
+from utilities.perf_timing import PerfTiming
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class FailureArtifacts:
+    """Process-wide recent-action buffer and failed-step bundle writer"""
+
+    _actions = deque(maxlen=Config.ACTION_BUFFER_SIZE)
+
+    @classmethod
+    def record(cls, page, action, target=None, outcome='ok'):
+        """
+        Note a page-object action; cheap enough to call on every interaction
+
+        Args:
+            page: page object class name
+            action: what was done, e.g. 'click' or 'wait_visible'
+            target: locator or other subject of the action
+            outcome: 'ok', or a short description of what went wrong
+        """
+        cls._actions.append((time.time(), page, action, target, outcome))
+
+    @classmethod
+    def start_scenario(cls):
+        """Forget the previous scenario's actions"""
+        cls._actions.clear()
+
+    @classmethod
+    def recent_actions(cls):
+        """Buffered actions, oldest first"""
+        return [
+            {
+                'at': datetime.fromtimestamp(at).isoformat(timespec='milliseconds'),
+                'page': page,
+                'action': action,
+                'target': str(target) if target is not None else None,
+                'outcome': outcome
+            }
+            for at, page, action, target, outcome in list(cls._actions)
+        ]
+
+    @classmethod
+    @PerfTiming.timed('failure_artifacts')
+    def capture(cls, driver, scenario, step):
+        """
+        Bundle the browser state and recent actions of a failed step
+
+        Args:
+            driver: WebDriver the step ran against
+            scenario: behave Scenario the step belongs to
+            step: behave Step that failed
+
+        Returns:
+            str: path of the zip file, or None if it could not be written
+        """
+        meta = {
+            'feature': scenario.filename,
+            'scenario': scenario.name,
+            'step': f"{step.keyword} {step.name}",
+            'line': step.line,
+            'error': step.error_message,
+            'worker': Config.WORKER_ID or 'main',
+            'captured_at': datetime.now().isoformat(timespec='seconds'),
+            'missing': []
+        }
+        # Each piece is fetched separately so one failing (e.g. a crashed tab) still leaves the others
+        pieces = {}
+        for name, fetch in (('url', lambda: driver.current_url),
+                            ('title', lambda: driver.title),
+                            ('page_source.html', lambda: driver.page_source),
+                            ('screenshot.png', driver.get_screenshot_as_png),
+                            ('console.json', lambda: json.dumps(driver.get_log('browser'), indent=2))):
+            try:
+                pieces[name] = fetch()
+            except Exception as e:
+                meta['missing'].append(name)
+                logger.debug(f"Could not capture {name} for failed step: {str(e)}")
+        meta['url'] = pieces.pop('url', None)
+        meta['title'] = pieces.pop('title', None)
+
+        path = Artifacts.path('logs', f"failed_step_{step.line}_{Artifacts.slug(step.name, 60)}.zip")
+        try:
+            with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+                bundle.writestr('meta.json', json.dumps(meta, indent=2))
+                bundle.writestr('actions.json', json.dumps(cls.recent_actions(), indent=2))
+                for name, content in pieces.items():
+                    # PNG data is already compressed
+                    compression = zipfile.ZIP_STORED if name.endswith('.png') else zipfile.ZIP_DEFLATED
+                    bundle.writestr(name, content, compress_type=compression)
+        except OSError as e:
+            logger.error(f"Could not write failure artifacts to {path}: {str(e)}")
+            return None
+        logger.info(f"Failure artifacts for '{meta['step']}' saved to {path}")
+        return path
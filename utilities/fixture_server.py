@@ -0,0 +1,134 @@
+"""
+Local fixture web server.
+Serves copies of the practice site's pages from fixtures/site so runs do
+not depend on public internet latency and page loads are deterministic.
+
+Usage:
+    python -m utilities.fixture_server serve    # serve the fixtures until interrupted
+    python -m utilities.fixture_server record   # refresh the fixtures from the live site
+"""
+# Standard library imports
+import functools
+import logging
+import os
+import sys
+import threading
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+# Local imports
+from utilities.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that logs through the logging module instead of stderr"""
+
+    def log_message(self, format, *args):
+        logger.debug(f"Fixture server: {format % args}")
+
+
+class FixtureServer:
+    """Background HTTP server for the recorded practice site"""
+
+    # Pages served by the fixture server and refreshed by record()
+    PAGES = [
+        'index.html',
+        'login.html',
+        'register.html',
+        'orders.html',
+        'forms.html',
+        'sample_text.txt'
+    ]
+
+    _server = None
+    _thread = None
+
+    @classmethod
+    def start(cls, root=None, port=None):
+        """
+        Start serving the fixture directory in a background thread
+
+        Args:
+            root: directory to serve (default: Config.FIXTURE_ROOT)
+            port: port to listen on; 0 picks a free port (default: Config.FIXTURE_PORT)
+
+        Returns:
+            str: Base URL of the server, e.g. 'http://127.0.0.1:8123/'
+        """
+        if cls._server is not None:
+            return cls.base_url()
+
+        root = os.path.abspath(root or Config.FIXTURE_ROOT)
+        port = Config.FIXTURE_PORT if port is None else port
+        handler = functools.partial(_QuietHandler, directory=root)
+        cls._server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        cls._server.daemon_threads = True
+        cls._thread = threading.Thread(target=cls._server.serve_forever, name='fixture-server', daemon=True)
+        cls._thread.start()
+        logger.info(f"Fixture server serving {root} at {cls.base_url()}")
+        return cls.base_url()
+
+    @classmethod
+    def stop(cls):
+        """Stop the server if it is running"""
+        if cls._server is None:
+            return
+        cls._server.shutdown()
+        cls._server.server_close()
+        cls._thread.join(timeout=5)
+        cls._server = None
+        cls._thread = None
+        logger.info("Fixture server stopped")
+
+    @classmethod
+    def base_url(cls):
+        """Base URL of the running server"""
+        host, port = cls._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @classmethod
+    def record(cls, source_url=None, root=None):
+        """
+        Refresh the fixtures with copies of the live pages
+
+        Args:
+            source_url: live site to copy from (default: the configured BASE_URL)
+            root: fixture directory to write to (default: Config.FIXTURE_ROOT)
+        """
+        source_url = source_url or Config.BASE_URL
+        root = root or Config.FIXTURE_ROOT
+        os.makedirs(root, exist_ok=True)
+        for page in cls.PAGES:
+            url = urljoin(source_url, page)
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    content = response.read()
+            except Exception as e:
+                logger.error(f"Failed to record {url}: {str(e)}")
+                continue
+            with open(os.path.join(root, page), 'wb') as f:
+                f.write(content)
+            logger.info(f"Recorded {url} ({len(content)} bytes)")
+
+
+# Command line interface for serving and recording fixtures
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) != 2 or sys.argv[1] not in ('serve', 'record'):
+        print("Usage: python -m utilities.fixture_server [serve|record]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'record':
+        FixtureServer.record()
+    else:
+        print(f"Serving fixtures at {FixtureServer.start()} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            FixtureServer.stop()
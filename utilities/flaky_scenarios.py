@@ -0,0 +1,119 @@
+"""
+Persistent flaky-scenario statistics.
+Keeps the outcome of the most recent runs of every scenario: 'passed',
+'failed' (failed on every attempt) or 'flipped' (failed, then passed when
+re-run on a fresh driver). A scenario's flip rate is the share of its recent
+runs that flipped; scenarios at or above FLAKY_QUARANTINE_RATE are
+quarantined, so their failures are reported but no longer fail the run.
+
+Usage:
+    python -m utilities.flaky_scenarios report
+"""
+# Standard library imports
+import json
+import logging
+import sys
+
+# Local imports
+from utilities.config import Config
+from utilities.json_files import locked, write_json
+from utilities.scenario_timings import ScenarioTimings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class FlakyScenarios:
+    """Local store of recent scenario outcomes"""
+
+    # Number of recent outcomes kept per scenario
+    HISTORY_SIZE = 20
+
+    def __init__(self, path=None):
+        self.path = path or Config.FLAKY_FILE
+        self.outcomes = self._load()
+        self._pending = {}
+
+    def record(self, feature, name, outcome):
+        """
+        Record the final outcome of one scenario run
+
+        Args:
+            feature: path of the feature file
+            name: scenario name
+            outcome: 'passed', 'failed' or 'flipped'
+        """
+        self._pending.setdefault(ScenarioTimings.key(feature, name), []).append(outcome)
+
+    def flip_rate(self, feature, name):
+        """Share of the scenario's recent runs, including unsaved ones, that flipped"""
+        key = ScenarioTimings.key(feature, name)
+        history = (self.outcomes.get(key, []) + self._pending.get(key, []))[-self.HISTORY_SIZE:]
+        if not history:
+            return 0.0
+        return history.count('flipped') / len(history)
+
+    def is_quarantined(self, feature, name):
+        """True once a scenario has enough history and flips too often"""
+        key = ScenarioTimings.key(feature, name)
+        runs = len(self.outcomes.get(key, [])) + len(self._pending.get(key, []))
+        return (runs >= Config.FLAKY_MIN_RUNS
+                and self.flip_rate(feature, name) >= Config.FLAKY_QUARANTINE_RATE)
+
+    def report(self):
+        """
+        Every scenario that flipped at least once
+
+        Returns:
+            list: dicts with 'scenario', 'runs', 'flip_rate' and 'quarantined', worst first
+        """
+        rows = []
+        for key, history in self.outcomes.items():
+            if 'flipped' not in history:
+                continue
+            feature, name = key.split('::', 1)
+            rows.append({
+                'scenario': key,
+                'runs': len(history),
+                'flip_rate': round(self.flip_rate(feature, name), 3),
+                'quarantined': self.is_quarantined(feature, name)
+            })
+        return sorted(rows, key=lambda row: -row['flip_rate'])
+
+    def save(self):
+        """Merge recorded outcomes into the store file"""
+        if not self._pending:
+            return
+        # Re-read under the lock so outcomes saved by another process since load are kept
+        with locked(self.path):
+            self.outcomes = self._load()
+            for key, outcomes in self._pending.items():
+                self.outcomes[key] = (self.outcomes.get(key, []) + outcomes)[-self.HISTORY_SIZE:]
+            write_json(self.path, self.outcomes, indent=2, sort_keys=True)
+        self._pending = {}
+        logger.info(f"Saved scenario outcomes to {self.path}")
+
+    def _load(self):
+        """Read the store file, returning an empty store if it is missing or corrupt"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable flaky scenarios file {self.path}: {str(e)}")
+            return {}
+
+
+# Command line interface for reporting
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) != 2 or sys.argv[1] != 'report':
+        print("Usage: python -m utilities.flaky_scenarios report")
+        sys.exit(1)
+
+    for row in FlakyScenarios().report():
+        marker = '  [quarantined]' if row['quarantined'] else ''
+        print(f"{row['flip_rate'] * 100:5.1f}%  {row['scenario']} ({row['runs']} runs){marker}")
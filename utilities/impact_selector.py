@@ -0,0 +1,667 @@
+"""
+Test impact selection.
+Builds a dependency index from scenarios to the step definitions they use
+(including steps run through context.execute_steps), from step definitions
+to the page-object methods they call, and from page-object methods to the
+LOCATORS keys they read. Given a git diff, only the scenarios that depend on
+a changed line are selected. Files outside features/ and pages/ (utilities,
+hooks, requirements) can affect anything, so changing one selects everything.
+
+The index is parsed with ast, one entry per file, and cached in
+.cache/impact_index.json (IMPACT_INDEX_FILE); only files whose size or
+modification time changed are parsed again.
+
+Usage:
+    python -m utilities.impact_selector [--base REF] [--explain]
+    behave $(python -m utilities.impact_selector --base origin/main)
+"""
+# Standard library imports
+import argparse
+import ast
+import fnmatch
+import glob
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+
+# Local imports
+from utilities.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the shape of the cached per-file entries changes
+INDEX_VERSION = 1
+
+FEATURES_GLOB = os.path.join('features', '**', '*.feature')
+STEPS_GLOB = os.path.join('features', 'steps', '*.py')
+PAGES_GLOB = os.path.join('pages', '*.py')
+
+# Changes to these never affect a scenario
+IGNORED_PATTERNS = ('*.md', '.github/*', '.gitignore', 'LICENSE*')
+
+STEP_DECORATORS = ('given', 'when', 'then', 'step')
+STEP_LINE = re.compile(r'^(Given|When|Then|And|But|\*)\s+(.*)$')
+SCENARIO_LINE = re.compile(r'^(Scenario|Scenario Outline|Scenario Template|Example)\s*:')
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+PLACEHOLDER = re.compile(r'\{[^{}]*\}')
+
+
+def parse_feature(path):
+    """
+    Scenarios of a feature file with their line spans and step texts
+
+    Returns:
+        dict: 'scenarios' (dicts with 'id', 'name', 'start', 'end', 'steps'),
+              'background' steps and 'header' span (feature line, tags, background)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    scenarios, background = [], []
+    current = None
+    pending_tags = None
+    in_background = False
+    header_end = len(lines)
+    for number, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        if stripped.startswith('@'):
+            pending_tags = pending_tags or number
+            continue
+        if SCENARIO_LINE.match(stripped):
+            if current is None:
+                header_end = (pending_tags or number) - 1
+            elif current:
+                current['end'] = (pending_tags or number) - 1
+            current = {
+                'id': f"{path}:{number}",
+                'name': stripped.split(':', 1)[1].strip(),
+                'start': pending_tags or number,
+                'end': len(lines),
+                'steps': []
+            }
+            scenarios.append(current)
+            in_background = False
+        elif stripped.startswith('Background:'):
+            in_background = True
+        else:
+            match = STEP_LINE.match(stripped)
+            if match:
+                step = [match.group(1), match.group(2)]
+                if current is not None:
+                    current['steps'].append(step)
+                elif in_background:
+                    background.append(step)
+        if stripped:
+            pending_tags = None
+    return {'scenarios': scenarios, 'background': background, 'header': [1, header_end]}
+
+
+class _UsageVisitor(ast.NodeVisitor):
+    """Collect what a function body calls and which locator names it mentions"""
+
+    def __init__(self):
+        self.instances = {}
+        self.calls = []
+        self.names = set()
+        self.constants = set()
+        self.prefixes = set()
+        self.whole_locators = False
+        self.context_attrs = {}
+        self.executes = []
+
+    def as_dict(self):
+        return {
+            'instances': self.instances,
+            'calls': self.calls,
+            'names': sorted(self.names),
+            'constants': sorted(self.constants),
+            'prefixes': sorted(self.prefixes),
+            'whole_locators': self.whole_locators,
+            'context_attrs': self.context_attrs,
+            'executes': self.executes
+        }
+
+    def visit_Assign(self, node):
+        if isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.instances[target.id] = node.value.func.id
+                elif isinstance(target, ast.Attribute) and _is_name(target.value, 'context'):
+                    self.context_attrs[target.attr] = node.value.func.id
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name):
+            self.names.add(func.id)
+        elif isinstance(func, ast.Attribute):
+            owner = func.value
+            if isinstance(owner, ast.Name):
+                self.calls.append(['var', owner.id, func.attr])
+            elif isinstance(owner, ast.Call) and isinstance(owner.func, ast.Name):
+                self.calls.append(['class', owner.func.id, func.attr])
+            elif isinstance(owner, ast.Call) and _is_name(owner.func, 'super'):
+                self.calls.append(['super', None, func.attr])
+            elif isinstance(owner, ast.Attribute) and _is_name(owner.value, 'context'):
+                self.calls.append(['context', owner.attr, func.attr])
+            if func.attr == 'execute_steps' and node.args:
+                self.executes.extend(_gherkin_steps(_literal_text(node.args[0])))
+            # LOCATORS.get('name') reads a single entry
+            if (func.attr == 'get' and _is_locators(owner) and node.args
+                    and isinstance(node.args[0], (ast.Constant, ast.JoinedStr))):
+                self.visit(node.args[0])
+                for argument in node.args[1:] + [keyword.value for keyword in node.keywords]:
+                    self.visit(argument)
+                return
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):
+        # LOCATORS['name'] or LOCATORS[f'prefix_{x}'] reads known entries
+        if _is_locators(node.value):
+            if isinstance(node.slice, (ast.Constant, ast.JoinedStr)):
+                self.visit(node.slice)
+                return
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if node.attr == 'LOCATORS':
+            self.whole_locators = True
+        self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, str):
+            self.constants.add(node.value)
+
+    def visit_JoinedStr(self, node):
+        if node.values and isinstance(node.values[0], ast.Constant) and node.values[0].value:
+            self.prefixes.add(node.values[0].value)
+        self.generic_visit(node)
+
+
+def _is_name(node, name):
+    return isinstance(node, ast.Name) and node.id == name
+
+
+def _is_locators(node):
+    return isinstance(node, ast.Attribute) and node.attr == 'LOCATORS'
+
+
+def _literal_text(node):
+    """Text of a string literal, keeping only the literal parts of an f-string"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return ''.join(part.value for part in node.values if isinstance(part, ast.Constant))
+    return ''
+
+
+def _gherkin_steps(text):
+    """[keyword, text] for every step line in a block of Gherkin"""
+    steps = []
+    for line in text.splitlines():
+        match = STEP_LINE.match(line.strip())
+        if match:
+            steps.append([match.group(1), match.group(2)])
+    return steps
+
+
+def _usage(node):
+    visitor = _UsageVisitor()
+    for child in node.body:
+        visitor.visit(child)
+    return visitor.as_dict()
+
+
+def parse_steps(path):
+    """
+    Step definitions and helper functions of a step module
+
+    Returns:
+        dict: 'steps' (keyword, pattern, span and usage) and 'helpers' (name -> span and usage)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    steps, helpers = [], {}
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        decorators = [
+            decorator for decorator in node.decorator_list
+            if isinstance(decorator, ast.Call) and decorator.args
+            and isinstance(decorator.args[0], ast.Constant) and isinstance(decorator.args[0].value, str)
+            and getattr(decorator.func, 'id', getattr(decorator.func, 'attr', None)) in STEP_DECORATORS
+        ]
+        usage = _usage(node)
+        if not decorators:
+            helpers[node.name] = {'start': start, 'end': node.end_lineno, 'usage': usage}
+        for decorator in decorators:
+            steps.append({
+                'keyword': getattr(decorator.func, 'id', getattr(decorator.func, 'attr', None)),
+                'pattern': decorator.args[0].value,
+                'start': start,
+                'end': node.end_lineno,
+                'usage': usage
+            })
+    return {'steps': steps, 'helpers': helpers}
+
+
+def parse_pages(path):
+    """
+    Page-object classes of a module with their LOCATORS entries and methods
+
+    Returns:
+        dict: class name -> 'bases', 'start', 'end', 'locators' (key -> span),
+              'locators_span' and 'methods' (name -> span, self calls and usage)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    classes = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        entry = {
+            'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
+            'start': min([node.lineno] + [decorator.lineno for decorator in node.decorator_list]),
+            'end': node.end_lineno,
+            'locators': None,
+            'locators_span': None,
+            'methods': {}
+        }
+        for item in node.body:
+            if (isinstance(item, ast.Assign) and isinstance(item.value, ast.Dict)
+                    and any(_is_name(target, 'LOCATORS') for target in item.targets)):
+                entry['locators'] = {
+                    key.value: [key.lineno, value.end_lineno]
+                    for key, value in zip(item.value.keys, item.value.values)
+                    if isinstance(key, ast.Constant)
+                }
+                entry['locators_span'] = [item.lineno, item.end_lineno]
+            elif isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                usage = _usage(item)
+                entry['methods'][item.name] = {
+                    'start': min([item.lineno] + [decorator.lineno for decorator in item.decorator_list]),
+                    'end': item.end_lineno,
+                    'self_calls': sorted({call[2] for call in usage['calls']
+                                          if call[0] == 'super' or call[:2] == ['var', 'self']}),
+                    'usage': usage
+                }
+        classes[node.name] = entry
+    return classes
+
+
+PARSERS = {
+    'feature': (FEATURES_GLOB, parse_feature),
+    'steps': (STEPS_GLOB, parse_steps),
+    'pages': (PAGES_GLOB, parse_pages)
+}
+
+
+class ImpactSelector:
+    """Dependency index from scenarios to step definitions, page methods and locators"""
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path or Config.IMPACT_INDEX_FILE
+        self.files = self._refresh()
+        self._build_maps()
+
+    def select(self, base='HEAD'):
+        """
+        Scenarios affected by the changes between base and the working tree
+
+        Args:
+            base: git revision to diff against
+
+        Returns:
+            dict: scenario id (file:line) -> list of reasons, in feature file order
+        """
+        changes = self.changed_lines(base)
+        changed, reason = self.changed_entities(changes)
+        scenarios = self.scenarios()
+        if reason:
+            logger.info(f"{reason}: selecting all {len(scenarios)} scenarios")
+            return {scenario['id']: [reason] for scenario in scenarios}
+
+        selected = {}
+        for scenario in scenarios:
+            hits = sorted(changed & self.dependencies(scenario))
+            if hits:
+                selected[scenario['id']] = hits
+        logger.info(f"Selected {len(selected)} of {len(scenarios)} scenarios affected by {len(changes)} changed files")
+        return selected
+
+    def scenarios(self):
+        """Every indexed scenario with the path of its feature file"""
+        return [{**scenario, 'feature': path}
+                for path, entry in sorted(self.files.items()) if entry['kind'] == 'feature'
+                for scenario in entry['data']['scenarios']]
+
+    def dependencies(self, scenario):
+        """
+        Everything a scenario depends on, as entity ids such as
+        'step:<file>:<line>', 'method:<Class>.<name>' or 'locator:<Class>.<key>'
+        """
+        feature = self.files[scenario['feature']]['data']
+        entities = {f"scenario:{scenario['id']}", f"feature:{scenario['feature']}"}
+        self._steps_dependencies(feature['background'] + scenario['steps'], entities, set())
+        return entities
+
+    def _steps_dependencies(self, steps, entities, seen_steps):
+        """Add the step definitions a block of steps runs, following execute_steps"""
+        keyword = 'given'
+        for step_keyword, text in steps:
+            # And/But inherit the keyword of the step before them
+            keyword = keyword if step_keyword in ('And', 'But', '*') else step_keyword.lower()
+            step = self.match_step(keyword, text)
+            if step is None or (step['path'], step['start']) in seen_steps:
+                continue
+            seen_steps.add((step['path'], step['start']))
+            entities.add(f"step:{step['path']}:{step['start']}")
+            entities.add(f"stepfile:{step['path']}")
+            self._usage_dependencies(step['usage'], step['path'], entities)
+            self._steps_dependencies(step['usage']['executes'], entities, seen_steps)
+
+    def match_step(self, keyword, text):
+        """Step definition a step line runs: same keyword (or @step) first, then any keyword"""
+        for candidates in (self.steps_by_keyword.get(keyword, []) + self.steps_by_keyword.get('step', []),
+                           self.all_steps):
+            for step in candidates:
+                if step['regex'].match(text):
+                    return step
+        return None
+
+    def changed_lines(self, base='HEAD'):
+        """
+        Changed files and line ranges of the working tree relative to base.
+        Untracked files count as changed throughout.
+
+        Returns:
+            dict: path -> list of [start, end, deletion] line ranges, or None for a
+                  deleted file; deletion is True for a hunk that only removed lines
+        """
+        diff = subprocess.run(['git', 'diff', '--unified=0', '--no-color', '--no-renames', base],
+                              capture_output=True, text=True, check=True).stdout
+        changes = {}
+        old_path = path = None
+        for line in diff.splitlines():
+            if line.startswith('--- '):
+                old_path = line[6:] if line.startswith('--- a/') else None
+            elif line.startswith('+++ '):
+                path = line[6:] if line.startswith('+++ b/') else None
+                if path is None:
+                    changes[old_path] = None
+                else:
+                    changes.setdefault(path, [])
+            elif path is not None:
+                match = HUNK_HEADER.match(line)
+                if match:
+                    start, count = int(match.group(1)), int(match.group(2) or 1)
+                    # A pure deletion touches the lines either side of it
+                    if count == 0:
+                        changes[path].append([max(start, 1), start + 1, True])
+                    else:
+                        changes[path].append([start, start + count - 1, False])
+
+        untracked = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'],
+                                   capture_output=True, text=True, check=True).stdout
+        for path in untracked.splitlines():
+            changes[path] = [[1, sys.maxsize, False]]
+        return changes
+
+    def changed_entities(self, changes):
+        """
+        Map changed line ranges onto indexed entities
+
+        Returns:
+            tuple: (set of changed entity ids, reason string if everything is affected, else None)
+        """
+        changed = set()
+        for path, ranges in changes.items():
+            path = os.path.normpath(path)
+            if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+                continue
+            entry = self.files.get(path)
+            if entry is None:
+                if path.endswith('.feature') and ranges is None:
+                    continue
+                return changed, f"{path} changed"
+            if entry['kind'] == 'feature':
+                changed |= self._changed_feature(path, entry['data'], ranges)
+            elif entry['kind'] == 'steps':
+                changed |= self._changed_steps(path, entry['data'], ranges)
+            else:
+                changed |= self._changed_pages(entry['data'], ranges)
+        return changed, None
+
+    def _changed_feature(self, path, feature, ranges):
+        changed = set()
+        if _overlaps(ranges, *feature['header']):
+            changed.add(f"feature:{path}")
+        for scenario in feature['scenarios']:
+            if _overlaps(ranges, scenario['start'], scenario['end']):
+                changed.add(f"scenario:{scenario['id']}")
+        return changed
+
+    def _changed_steps(self, path, module, ranges):
+        changed = set()
+        covered = []
+        for step in module['steps']:
+            covered.append([step['start'], step['end']])
+            if _overlaps(ranges, step['start'], step['end']):
+                changed.add(f"step:{path}:{step['start']}")
+        for name, helper in module['helpers'].items():
+            covered.append([helper['start'], helper['end']])
+            if _overlaps(ranges, helper['start'], helper['end']):
+                changed.add(f"helper:{path}:{name}")
+        # Imports and other module-level code affect every step in the module
+        if ranges is None or _uncovered(ranges, covered):
+            changed.add(f"stepfile:{path}")
+        return changed
+
+    def _changed_pages(self, classes, ranges):
+        changed = set()
+        covered = []
+        for name, page in classes.items():
+            if page['locators_span']:
+                covered.append(page['locators_span'])
+                for key, (start, end) in page['locators'].items():
+                    if _overlaps(ranges, start, end):
+                        changed.add(f"locator:{name}.{key}")
+                # A removed entry leaves no line behind, so treat every key as changed
+                if any(deletion and _overlaps([[start, end]], *page['locators_span'])
+                       for start, end, deletion in ranges or []):
+                    changed |= {f"locator:{name}.{key}" for key in page['locators']}
+            for method_name, method in page['methods'].items():
+                covered.append([method['start'], method['end']])
+                if _overlaps(ranges, method['start'], method['end']):
+                    changed.add(f"method:{name}.{method_name}")
+
+        # Class attributes affect their class; imports and other module-level code affect every class
+        for name, page in classes.items():
+            inside = None if ranges is None else [r for r in ranges if _overlaps([r], page['start'], page['end'])]
+            if inside is None or _uncovered(inside, covered):
+                changed.add(f"class:{name}")
+        outside = [] if ranges is None else [r for r in ranges if not any(
+            _overlaps([r], page['start'], page['end']) for page in classes.values())]
+        if ranges is None or outside:
+            changed |= {f"class:{name}" for name in classes}
+        return changed
+
+    def _usage_dependencies(self, usage, path, entities, seen_helpers=None):
+        """Add the page methods, locators and helpers a step or helper body depends on"""
+        seen_helpers = seen_helpers if seen_helpers is not None else set()
+        used_classes = set()
+        for kind, owner, method in usage['calls']:
+            page = None
+            if kind == 'var':
+                page = usage['instances'].get(owner)
+            elif kind == 'class':
+                page = owner
+            elif kind == 'context':
+                page = self.context_attrs.get(owner)
+            if page in self.classes:
+                used_classes.add(page)
+                self._method_dependencies(page, method, entities)
+        for name in usage['names']:
+            if name in self.classes:
+                used_classes.add(name)
+                self._method_dependencies(name, '__init__', entities)
+            helper = self.helpers.get((path, name))
+            if helper and name not in seen_helpers:
+                seen_helpers.add(name)
+                entities.add(f"helper:{path}:{name}")
+                self._usage_dependencies(helper['usage'], path, entities, seen_helpers)
+        # Locator names spelled out in the step itself, e.g. page.LOCATORS['flavor_dropdown']
+        for page in used_classes:
+            entities |= self._locator_dependencies(page, usage, whole=False)
+
+    def _method_dependencies(self, page, method, entities, seen=None):
+        """Add a page method as called on page, the methods it calls on self and the locators it reads"""
+        seen = seen if seen is not None else set()
+        if (page, method) in seen:
+            return
+        seen.add((page, method))
+        for owner in self.mro(page):
+            entities.add(f"class:{owner}")
+        owner = next((owner for owner in self.mro(page) if method in self.classes[owner]['methods']), None)
+        if owner is None:
+            return
+        definition = self.classes[owner]['methods'][method]
+        entities.add(f"method:{owner}.{method}")
+        # Reading all of LOCATORS only counts in a class that defines them; base-class
+        # helpers such as locator_candidates() are handed their names by the caller
+        whole = definition['usage']['whole_locators'] and self.classes[owner]['locators'] is not None
+        entities |= self._locator_dependencies(page, definition['usage'], whole)
+        for called in definition['self_calls']:
+            self._method_dependencies(page, called, entities, seen)
+
+    def _locator_dependencies(self, page, usage, whole):
+        """Locator entity ids of page's LOCATORS that a body names"""
+        owner = next((owner for owner in self.mro(page) if self.classes[owner]['locators'] is not None), None)
+        if owner is None:
+            return set()
+        constants = set(usage['constants'])
+        prefixes = tuple(usage['prefixes'])
+        return {
+            f"locator:{owner}.{key}" for key in self.classes[owner]['locators']
+            if whole or key in constants or key.startswith(prefixes)
+            or ('_alt' in key and key.split('_alt', 1)[0] in constants)
+        }
+
+    def mro(self, page):
+        """Indexed classes from page up through its bases"""
+        order = []
+        pending = [page]
+        while pending:
+            current = pending.pop(0)
+            if current in self.classes and current not in order:
+                order.append(current)
+                pending.extend(self.classes[current]['bases'])
+        return order
+
+    def _build_maps(self):
+        """Cross-file lookup tables derived from the per-file index"""
+        self.classes = {}
+        self.helpers = {}
+        self.context_attrs = {}
+        self.all_steps = []
+        self.steps_by_keyword = {}
+        for path, entry in sorted(self.files.items()):
+            if entry['kind'] == 'pages':
+                self.classes.update(entry['data'])
+            elif entry['kind'] == 'steps':
+                for name, helper in entry['data']['helpers'].items():
+                    self.helpers[(path, name)] = helper
+                    self.context_attrs.update(helper['usage']['context_attrs'])
+                for step in entry['data']['steps']:
+                    step = {**step, 'path': path, 'regex': _step_regex(step['pattern'])}
+                    self.context_attrs.update(step['usage']['context_attrs'])
+                    self.all_steps.append(step)
+                    self.steps_by_keyword.setdefault(step['keyword'], []).append(step)
+
+    def _refresh(self):
+        """Load the cached index and re-parse only files that changed since it was written"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') != INDEX_VERSION:
+                cached = {}
+        except (OSError, ValueError):
+            cached = {}
+        cached_files = cached.get('files', {})
+
+        files = {}
+        parsed = 0
+        for kind, (pattern, parser) in PARSERS.items():
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                path = os.path.normpath(path)
+                stat = os.stat(path)
+                entry = cached_files.get(path)
+                if entry and entry['kind'] == kind and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                    files[path] = entry
+                    continue
+                try:
+                    data = parser(path)
+                except (SyntaxError, UnicodeDecodeError) as e:
+                    logger.warning(f"Could not index {path}: {str(e)}")
+                    continue
+                files[path] = {'kind': kind, 'mtime': stat.st_mtime, 'size': stat.st_size, 'data': data}
+                parsed += 1
+
+        if parsed or set(files) != set(cached_files):
+            os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'files': files}, f)
+            os.replace(temp_path, self.index_path)
+            logger.debug(f"Re-indexed {parsed} of {len(files)} files")
+        return files
+
+
+def _step_regex(pattern):
+    """Regex for a parse-style step pattern; every {placeholder} matches any text"""
+    parts = PLACEHOLDER.split(pattern)
+    return re.compile('^' + '(.+?)'.join(re.escape(part) for part in parts) + '$')
+
+
+def _overlaps(ranges, start, end):
+    """True if any changed range intersects [start, end]; None means the whole file"""
+    if ranges is None:
+        return True
+    return any(changed[0] <= end and changed[1] >= start for changed in ranges)
+
+
+def _uncovered(ranges, spans):
+    """True if some changed line lies outside every span"""
+    for range_start, range_end, _ in ranges:
+        line = range_start
+        while line <= range_end:
+            span = next((span for span in spans if span[0] <= line <= span[1]), None)
+            if span is None:
+                return True
+            line = span[1] + 1
+    return False
+
+
+def main():
+    """Print the scenarios affected by the current changes, one behave argument per line"""
+    parser = argparse.ArgumentParser(description="Select scenarios affected by changed code")
+    parser.add_argument('--base', default='HEAD', help="Git revision to diff the working tree against")
+    parser.add_argument('--explain', action='store_true', help="Show why each scenario was selected")
+    args = parser.parse_args()
+
+    for scenario_id, reasons in ImpactSelector().select(args.base).items():
+        print(f"{scenario_id}  <- {', '.join(reasons)}" if args.explain else scenario_id)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s',
+                        stream=sys.stderr)
+    main()
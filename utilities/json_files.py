@@ -0,0 +1,61 @@
+"""
+Shared JSON files.
+Several stores (locator health, profile metrics, the ChromeDriver manifest,
+the network archive index) are read, merged and rewritten by every parallel
+worker. locked() serialises those read-modify-write cycles across processes
+with an advisory lock on a sidecar <file>.lock, and write_json() replaces the
+file atomically through a temp file unique to the writer, so two writers
+never rename each other's half-written data into place.
+"""
+# Standard library imports
+import contextlib
+import json
+import os
+import tempfile
+
+# fcntl is POSIX only; elsewhere writes stay atomic but concurrent merges are not serialised
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextlib.contextmanager
+def locked(path):
+    """
+    Hold an exclusive inter-process lock for a file while it is read and rewritten
+
+    Args:
+        path: the shared file (the lock itself is taken on <path>.lock)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def write_json(path, data, **dump_options):
+    """
+    Atomically replace a JSON file
+
+    Args:
+        path: file to write
+        data: JSON-serialisable value
+        dump_options: keyword arguments for json.dump, e.g. indent
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_options)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,177 @@
+"""
+Persistent locator health statistics.
+Records hits, misses and resolution latency per (page class, locator name)
+so fallback locators can be ordered by success rate, and dead, flaky or
+slow locators can be reported.
+
+Usage:
+    python -m utilities.locator_health report
+"""
+# Standard library imports
+import json
+import logging
+import sys
+
+# Local imports
+from utilities.config import Config
+from utilities.json_files import locked, write_json
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class LocatorHealth:
+    """Process-wide locator statistics backed by a small JSON file"""
+
+    # Samples needed before a locator's success rate is trusted
+    MIN_SAMPLES = 5
+    # Success rate below which a locator that sometimes works is flaky
+    FLAKY_RATE = 0.9
+    # Average resolution time in seconds above which a locator is slow
+    SLOW_SECONDS = 2.0
+
+    _stats = None
+    _pending = {}
+
+    @staticmethod
+    def key(page, name):
+        """Build the store key for a locator"""
+        return f"{page}.{name}"
+
+    @classmethod
+    def record(cls, page, name, hit, latency):
+        """
+        Record one resolution attempt
+
+        Args:
+            page: page class name
+            name: locator name in the page's LOCATORS
+            hit: True if the locator found the element
+            latency: seconds spent resolving it
+        """
+        entry = cls._pending.setdefault(cls.key(page, name), {'hits': 0, 'misses': 0, 'seconds': 0.0})
+        entry['hits' if hit else 'misses'] += 1
+        entry['seconds'] += latency
+
+    @classmethod
+    def stats(cls, page, name):
+        """
+        Combined stored and unsaved statistics for a locator
+
+        Returns:
+            dict: 'hits', 'misses' and total 'seconds'
+        """
+        key = cls.key(page, name)
+        stored = cls._load_cached().get(key, {})
+        pending = cls._pending.get(key, {})
+        return {field: stored.get(field, 0) + pending.get(field, 0) for field in ('hits', 'misses', 'seconds')}
+
+    @classmethod
+    def success_rate(cls, page, name):
+        """Success rate of a locator, or None until MIN_SAMPLES attempts were recorded"""
+        stats = cls.stats(page, name)
+        attempts = stats['hits'] + stats['misses']
+        if attempts < cls.MIN_SAMPLES:
+            return None
+        return stats['hits'] / attempts
+
+    @classmethod
+    def order(cls, page, names):
+        """
+        Order locator names by success rate, best first.
+        Locators without enough samples keep their position ahead of proven
+        failures, so the declared primary is tried first until it misbehaves.
+        """
+        def sort_key(name):
+            rate = cls.success_rate(page, name)
+            return -(1.0 if rate is None else rate)
+        return sorted(names, key=sort_key)
+
+    @classmethod
+    def report(cls):
+        """
+        Flag dead, flaky and slow locators
+
+        Returns:
+            list: dicts with 'locator', 'hits', 'misses', 'avg_seconds' and 'issues'
+        """
+        stored = cls._load_cached()
+        rows = []
+        for key in sorted(set(stored) | set(cls._pending)):
+            page, name = key.split('.', 1)
+            stats = cls.stats(page, name)
+            attempts = stats['hits'] + stats['misses']
+            if attempts == 0:
+                continue
+            rate = stats['hits'] / attempts
+            avg_seconds = stats['seconds'] / attempts
+            issues = []
+            if attempts >= cls.MIN_SAMPLES and stats['hits'] == 0:
+                issues.append('dead')
+            elif attempts >= cls.MIN_SAMPLES and rate < cls.FLAKY_RATE:
+                issues.append('flaky')
+            if avg_seconds > cls.SLOW_SECONDS:
+                issues.append('slow')
+            rows.append({
+                'locator': key,
+                'hits': stats['hits'],
+                'misses': stats['misses'],
+                'success_rate': round(rate, 3),
+                'avg_seconds': round(avg_seconds, 3),
+                'issues': issues
+            })
+        return rows
+
+    @classmethod
+    def save(cls):
+        """Merge unsaved statistics into the store file"""
+        if not cls._pending:
+            return
+        path = Config.LOCATOR_HEALTH_FILE
+        # Parallel workers save at the same time: merge under a lock so no worker's counts are lost
+        with locked(path):
+            stored = cls._load()
+            for key, entry in cls._pending.items():
+                target = stored.setdefault(key, {'hits': 0, 'misses': 0, 'seconds': 0.0})
+                for field in ('hits', 'misses', 'seconds'):
+                    target[field] = target.get(field, 0) + entry[field]
+                target['seconds'] = round(target['seconds'], 3)
+            write_json(path, stored, indent=2, sort_keys=True)
+        cls._pending = {}
+        cls._stats = stored
+
+        flagged = [row for row in cls.report() if row['issues']]
+        for row in flagged:
+            logger.warning(f"Locator {row['locator']} is {'/'.join(row['issues'])} "
+                           f"(success rate {row['success_rate']:.0%}, avg {row['avg_seconds']}s)")
+
+    @classmethod
+    def _load_cached(cls):
+        """Stored statistics, read from disk once per process"""
+        if cls._stats is None:
+            cls._stats = cls._load()
+        return cls._stats
+
+    @staticmethod
+    def _load():
+        """Read the store file, returning empty statistics if it is missing or corrupt"""
+        try:
+            with open(Config.LOCATOR_HEALTH_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable locator health file: {str(e)}")
+            return {}
+
+
+# Command line interface for the health report
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] != 'report':
+        print("Usage: python -m utilities.locator_health report")
+        sys.exit(1)
+
+    print(f"{'Locator':60} {'Hits':>6} {'Misses':>7} {'Rate':>6} {'Avg s':>7}  Issues")
+    for row in LocatorHealth.report():
+        print(f"{row['locator']:60} {row['hits']:>6} {row['misses']:>7} "
+              f"{row['success_rate']:>6.0%} {row['avg_seconds']:>7}  {', '.join(row['issues'])}")
@@ -0,0 +1,239 @@
+"""
+Record-and-replay HTTP cache for page loads, built on the Chrome DevTools
+Protocol Fetch domain.
+
+In 'record' mode every successful GET response (HTML, CSS, JS, fonts, CDN
+assets) is stored in a content-addressed archive. In 'replay' mode requests
+found in the archive are fulfilled from disk without touching the network;
+anything else goes through untouched and counts as a miss.
+
+The interceptor runs selenium's bidi_connection() on a trio event loop in a
+background thread, next to the synchronous WebDriver session.
+"""
+# Standard library imports
+import base64
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+# Third-party imports (trio is a selenium dependency)
+import trio
+
+# Local imports
+from utilities.config import Config
+from utilities.json_files import locked, write_json
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class NetworkReplay:
+    """CDP network interceptor recording to, or replaying from, an on-disk archive"""
+
+    # Headers that no longer describe the decoded body stored in the archive
+    DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+    _instances = {}
+    _report = []
+
+    def __init__(self, driver, mode, archive_dir=None):
+        """
+        Args:
+            driver: Chrome WebDriver to intercept
+            mode: 'record' or 'replay'
+            archive_dir: archive location (default: Config.NETWORK_CACHE_DIR)
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Invalid network cache mode: {mode}")
+        self.driver = driver
+        self.mode = mode
+        self.archive_dir = archive_dir or Config.NETWORK_CACHE_DIR
+        self.index = self._load_index()
+        self.counters = {'hits': 0, 'misses': 0, 'recorded': 0}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._trio_token = None
+        self._cancel_scope = None
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the interceptor attached to a driver, if any"""
+        return cls._instances.get(id(driver))
+
+    def start(self):
+        """
+        Start intercepting; returns once Fetch interception is enabled so the
+        next page load is already covered
+        """
+        self._thread = threading.Thread(target=self._run, name='network-replay', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=Config.DEFAULT_TIMEOUT):
+            logger.warning("Network interceptor did not start in time")
+        NetworkReplay._instances[id(self.driver)] = self
+        logger.info(f"Network cache in {self.mode} mode ({len(self.index)} archived responses)")
+        return self
+
+    def stop(self):
+        """Stop intercepting and, in record mode, persist the archive index"""
+        NetworkReplay._instances.pop(id(self.driver), None)
+        if self._cancel_scope is not None:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._trio_token)
+            except Exception as e:
+                logger.debug(f"Network interceptor already stopped: {str(e)}")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self.mode == 'record':
+            self.save_index()
+
+    def take_counters(self):
+        """
+        Return the hit/miss/recorded counts since the last call and reset them
+
+        Returns:
+            dict: 'hits', 'misses' and 'recorded'
+        """
+        with self._lock:
+            counters, self.counters = self.counters, {'hits': 0, 'misses': 0, 'recorded': 0}
+        return counters
+
+    @classmethod
+    def record_scenario(cls, scenario_name, counters):
+        """Add one scenario's counters to the run report"""
+        cls._report.append({'scenario': scenario_name, **counters})
+
+    @classmethod
+    def save_report(cls, path=None):
+        """Write per-scenario cache hit/miss counts as JSON"""
+        if not cls._report:
+            return
+        path = path or os.path.join(Config.LOGS_DIR, 'network_cache.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cls._report, f, indent=2)
+        hits = sum(entry['hits'] for entry in cls._report)
+        misses = sum(entry['misses'] for entry in cls._report)
+        logger.info(f"Network cache: {hits} hits, {misses} misses (report: {path})")
+
+    def save_index(self):
+        """Merge recorded entries into the archive index on disk"""
+        index_path = os.path.join(self.archive_dir, 'index.json')
+        # Recording workers share one archive: merge under a lock so no worker's entries are lost
+        with self._lock, locked(index_path):
+            merged = self._load_index()
+            merged.update(self.index)
+            write_json(index_path, merged, indent=2, sort_keys=True)
+        logger.info(f"Saved network archive index with {len(merged)} responses")
+
+    def _run(self):
+        """Thread body: run the interceptor until stop() cancels it"""
+        try:
+            trio.run(self._intercept)
+        except Exception as e:
+            logger.error(f"Network interceptor failed: {str(e)}")
+        finally:
+            self._ready.set()
+
+    async def _intercept(self):
+        """Enable Fetch interception and dispatch paused requests"""
+        self._trio_token = trio.lowlevel.current_trio_token()
+        async with self.driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            stage = (devtools.fetch.RequestStage.RESPONSE if self.mode == 'record'
+                     else devtools.fetch.RequestStage.REQUEST)
+            await session.execute(devtools.fetch.enable(
+                patterns=[devtools.fetch.RequestPattern(url_pattern='*', request_stage=stage)]
+            ))
+            with trio.CancelScope() as scope:
+                self._cancel_scope = scope
+                self._ready.set()
+                async with trio.open_nursery() as nursery:
+                    async for event in session.listen(devtools.fetch.RequestPaused):
+                        nursery.start_soon(self._handle, session, devtools, event)
+
+    async def _handle(self, session, devtools, event):
+        """Fulfill a paused request from the archive, or record its response, then let it go"""
+        request = event.request
+        key = f"{request.method} {request.url}"
+        try:
+            if self.mode == 'replay':
+                entry = self.index.get(key) if request.method == 'GET' else None
+                blob_path = self._blob_path(entry['sha256']) if entry else None
+                if blob_path and os.path.exists(blob_path):
+                    with open(blob_path, 'rb') as f:
+                        body = base64.b64encode(f.read()).decode('ascii')
+                    await session.execute(devtools.fetch.fulfill_request(
+                        event.request_id,
+                        response_code=entry['status'],
+                        response_headers=[devtools.fetch.HeaderEntry(name=name, value=value)
+                                          for name, value in entry['headers']],
+                        body=body
+                    ))
+                    self._count('hits')
+                    return
+                self._count('misses')
+            elif request.method == 'GET' and event.response_status_code and 200 <= event.response_status_code < 300:
+                body, is_base64 = await session.execute(devtools.fetch.get_response_body(event.request_id))
+                data = base64.b64decode(body) if is_base64 else body.encode('utf-8')
+                self._store(key, event.response_status_code, event.response_headers or [], data)
+            await session.execute(devtools.fetch.continue_request(event.request_id))
+        except Exception as e:
+            logger.debug(f"Network interceptor could not handle {key}: {str(e)}")
+            try:
+                await session.execute(devtools.fetch.continue_request(event.request_id))
+            except Exception:
+                pass
+
+    def _store(self, key, status, headers, data):
+        """Write a response body to the content-addressed archive and index it"""
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            self._write_blob(blob_path, data)
+        with self._lock:
+            self.index[key] = {
+                'sha256': digest,
+                'status': status,
+                'headers': [[h.name, h.value] for h in headers if h.name.lower() not in self.DROPPED_HEADERS]
+            }
+            self.counters['recorded'] += 1
+
+    @staticmethod
+    def _write_blob(path, data):
+        """Write a body atomically, so replay never serves one truncated by a crash or a concurrent worker"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.",
+                                         suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_path)
+            raise
+
+    def _count(self, counter):
+        """Increment a counter from the interceptor thread"""
+        with self._lock:
+            self.counters[counter] += 1
+
+    def _blob_path(self, digest):
+        """Archive path of a response body"""
+        return os.path.join(self.archive_dir, 'blobs', digest[:2], digest)
+
+    def _load_index(self):
+        """Read the archive index, returning an empty one if it is missing or corrupt"""
+        try:
+            with open(os.path.join(self.archive_dir, 'index.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable network archive index: {str(e)}")
+            return {}
@@ -0,0 +1,549 @@
+"""
+Parallel scenario runner.
+Discovers scenarios in the .feature files, shards them across a pool of
+behave worker processes and merges each worker's JSON and JUnit output
+into the same reports/ layout a serial behave run produces. With
+--rerun-failed N, scenarios that failed are re-run, and only they, on fresh
+drivers across the same number of workers; ones that pass on a rerun are
+reported as flaky rather than failed, and their flip rate is tracked.
+
+Usage:
+    python -m utilities.parallel_runner [--workers N] [--mode round-robin|duration]
+                                        [--rerun-failed N] [--changed-since REF] [paths...]
+                                        [-- behave options...]
+"""
+# Standard library imports
+import argparse
+import glob
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+# Local imports
+from utilities.artifacts import Artifacts
+from utilities.config import Config
+from utilities.fixture_server import FixtureServer
+from utilities.flaky_scenarios import FlakyScenarios
+from utilities.scenario_timings import ScenarioTimings
+from utilities.structured_logging import StructuredLogging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = 'reports'
+WORKERS_DIR = os.path.join(REPORTS_DIR, 'workers')
+JUNIT_DIR = os.path.join(REPORTS_DIR, 'junit')
+JSON_REPORT = os.path.join(REPORTS_DIR, 'behave-report.json')
+RUN_SUMMARY = os.path.join(REPORTS_DIR, 'parallel_run.json')
+FLAKY_SUMMARY = os.path.join(REPORTS_DIR, 'flaky.json')
+MERGED_LOG = os.path.join(REPORTS_DIR, 'test_run.jsonl')
+
+STEP_KEYWORDS = ('Given ', 'When ', 'Then ', 'And ', 'But ', '* ')
+SCENARIO_KEYWORDS = ('Scenario:', 'Scenario Outline:', 'Scenario Template:')
+
+
+def discover_scenarios(paths=None):
+    """
+    Find every scenario in the given feature files or directories
+
+    Args:
+        paths: list of .feature files or directories (default: features/)
+
+    Returns:
+        list: dicts with 'id' (file:line), 'feature', 'line', 'name' and 'steps'
+    """
+    feature_files = []
+    for path in paths or ['features']:
+        if os.path.isdir(path):
+            feature_files.extend(sorted(glob.glob(os.path.join(path, '**', '*.feature'), recursive=True)))
+        else:
+            feature_files.append(path)
+
+    scenarios = []
+    for feature_file in feature_files:
+        current = None
+        with open(feature_file, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                stripped = line.strip()
+                if stripped.startswith(SCENARIO_KEYWORDS):
+                    current = {
+                        'id': f"{feature_file}:{line_number}",
+                        'feature': feature_file,
+                        'line': line_number,
+                        'name': stripped.split(':', 1)[1].strip(),
+                        'steps': 0
+                    }
+                    scenarios.append(current)
+                elif current is not None and stripped.startswith(STEP_KEYWORDS):
+                    current['steps'] += 1
+    logger.info(f"Discovered {len(scenarios)} scenarios in {len(feature_files)} feature files")
+    return scenarios
+
+
+def estimate_durations(scenarios, timings):
+    """Attach the expected duration in seconds to every scenario"""
+    for scenario in scenarios:
+        scenario['estimate'] = timings.estimate(scenario['feature'], scenario['name'], scenario['steps'])
+    return scenarios
+
+
+def shard_round_robin(scenarios, workers):
+    """Deal scenarios to workers in turn"""
+    shards = [[] for _ in range(workers)]
+    for index, scenario in enumerate(scenarios):
+        shards[index % workers].append(scenario)
+    return shards
+
+
+def shard_by_duration(scenarios, workers):
+    """
+    Longest-processing-time-first bin packing: take scenarios from the
+    slowest expected duration down and give each to the least loaded worker
+    """
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for scenario in sorted(scenarios, key=lambda s: s['estimate'], reverse=True):
+        target = loads.index(min(loads))
+        shards[target].append(scenario)
+        loads[target] += scenario['estimate']
+    return shards
+
+
+def predicted_makespan(shards):
+    """Expected wall time of a schedule: the load of its busiest worker"""
+    return max((sum(s['estimate'] for s in shard) for shard in shards), default=0.0)
+
+
+SHARDING_MODES = {
+    'round-robin': shard_round_robin,
+    'duration': shard_by_duration
+}
+
+
+def run_worker(worker_id, shard, extra_args=None, label='worker', env_overrides=None):
+    """
+    Run one shard in its own behave process with isolated artifact directories
+
+    Args:
+        worker_id: index of the worker
+        shard: list of scenarios to run
+        extra_args: additional behave command line arguments
+        label: worker directory prefix, e.g. 'rerun-1' for the first rerun
+        env_overrides: extra environment variables for the behave process
+
+    Returns:
+        dict: worker summary with return code and elapsed time
+    """
+    worker_dir = os.path.join(WORKERS_DIR, f"{label}-{worker_id}")
+    Artifacts.discard(worker_dir)
+    os.makedirs(worker_dir)
+
+    env = os.environ.copy()
+    env.update({
+        'WORKER_ID': str(worker_id) if label == 'worker' else f"{label}-{worker_id}",
+        'DOWNLOADS_DIR': os.path.abspath(os.path.join(worker_dir, 'downloads')),
+        'SCREENSHOTS_DIR': os.path.abspath(os.path.join(worker_dir, 'screenshots')),
+        'LOGS_DIR': os.path.abspath(os.path.join(worker_dir, 'logs'))
+    })
+    env.update(env_overrides or {})
+
+    command = [
+        sys.executable, '-m', 'behave',
+        *[scenario['id'] for scenario in shard],
+        '--format', 'json', '--outfile', os.path.join(worker_dir, 'behave-report.json'),
+        '--format', 'progress',
+        '--junit', '--junit-directory', os.path.join(worker_dir, 'junit'),
+        *(extra_args or [])
+    ]
+
+    logger.info(f"{os.path.basename(worker_dir)}: running {len(shard)} scenarios")
+    start_time = time.time()
+    with open(os.path.join(worker_dir, 'behave.log'), 'w', encoding='utf-8') as output:
+        result = subprocess.run(command, env=env, stdout=output, stderr=subprocess.STDOUT)
+    elapsed = time.time() - start_time
+    logger.info(f"{os.path.basename(worker_dir)}: finished in {elapsed:.1f}s with exit code {result.returncode}")
+
+    return {
+        'worker': worker_id,
+        'dir': worker_dir,
+        'scenarios': [scenario['id'] for scenario in shard],
+        'estimated_seconds': round(sum(s['estimate'] for s in shard), 2),
+        'elapsed_seconds': round(elapsed, 2),
+        'returncode': result.returncode
+    }
+
+
+def merge_junit_reports(worker_dirs, output_dir=JUNIT_DIR):
+    """
+    Merge per-worker JUnit files into one TESTS-<feature>.xml per feature
+
+    Args:
+        worker_dirs: list of worker directories containing a junit/ folder
+        output_dir: destination directory
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(output_dir, '*.xml')):
+        os.remove(stale)
+
+    merged = {}
+    for worker_dir in worker_dirs:
+        for junit_file in sorted(glob.glob(os.path.join(worker_dir, 'junit', '*.xml'))):
+            suite = ET.parse(junit_file).getroot()
+            file_name = os.path.basename(junit_file)
+            if file_name not in merged:
+                merged[file_name] = suite
+                continue
+            target = merged[file_name]
+            for counter in ('tests', 'errors', 'failures', 'skipped'):
+                total = int(target.get(counter, 0)) + int(suite.get(counter, 0))
+                target.set(counter, str(total))
+            total_time = float(target.get('time', 0)) + float(suite.get('time', 0))
+            target.set('time', f"{total_time:.6f}")
+            for testcase in suite.findall('testcase'):
+                target.append(testcase)
+
+    for file_name, suite in merged.items():
+        ET.ElementTree(suite).write(os.path.join(output_dir, file_name), encoding='utf-8', xml_declaration=True)
+    logger.info(f"Merged JUnit reports for {len(merged)} features into {output_dir}")
+
+
+def merge_json_reports(worker_dirs, output_file=JSON_REPORT):
+    """
+    Merge per-worker behave JSON reports, combining scenarios of the same feature
+
+    Args:
+        worker_dirs: list of worker directories containing behave-report.json
+        output_file: destination file
+    """
+    features = {}
+    for worker_dir in worker_dirs:
+        report = os.path.join(worker_dir, 'behave-report.json')
+        if not os.path.exists(report) or os.path.getsize(report) == 0:
+            continue
+        with open(report, 'r', encoding='utf-8') as f:
+            for feature in json.load(f):
+                key = feature.get('location', '').split(':')[0] or feature.get('name')
+                if key not in features:
+                    features[key] = feature
+                else:
+                    features[key].setdefault('elements', []).extend(feature.get('elements', []))
+
+    for feature in features.values():
+        feature.get('elements', []).sort(key=lambda element: int(element.get('location', ':0').rsplit(':', 1)[-1]))
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(list(features.values()), f, indent=2)
+    logger.info(f"Merged JSON reports for {len(features)} features into {output_file}")
+
+
+def scenario_results(report_path):
+    """
+    Outcome of every scenario in a behave JSON report
+
+    Args:
+        report_path: path to behave's json formatter output
+
+    Returns:
+        list: dicts with 'id' (file:line, usable as a behave argument), 'feature',
+              'name', 'steps' and 'status'
+    """
+    if not os.path.exists(report_path) or os.path.getsize(report_path) == 0:
+        return []
+    with open(report_path, 'r', encoding='utf-8') as f:
+        features = json.load(f)
+    results = []
+    for feature in features:
+        for element in feature.get('elements', []):
+            if element.get('type') == 'background':
+                continue
+            results.append({
+                'id': element.get('location', ''),
+                'feature': element.get('location', '').rsplit(':', 1)[0],
+                'name': element.get('name', ''),
+                'steps': len(element.get('steps', [])),
+                'status': element.get('status', 'untested')
+            })
+    return results
+
+
+def run_shards(shards, extra_args=None, label='worker', env_overrides=None):
+    """Run every shard in its own worker process and wait for all of them"""
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [executor.submit(run_worker, index, shard, extra_args, label, env_overrides)
+                   for index, shard in enumerate(shards)]
+        return [future.result() for future in futures]
+
+
+def rerun_failed(failed, workers, attempts, timings, extra_args=None):
+    """
+    Re-run failed scenarios until they pass or the attempts run out.
+    Only the failures are re-run, so the cost grows with the number of
+    failures rather than with the suite. Every rerun starts a new behave
+    process with the driver pool off, so each scenario gets a fresh browser.
+
+    Args:
+        failed: failed scenarios as returned by scenario_results()
+        workers: maximum number of worker processes
+        attempts: maximum number of reruns per scenario
+        timings: ScenarioTimings used to balance the rerun shards
+
+    Returns:
+        tuple: (dict of scenario id -> attempt it passed on, list of worker summaries)
+    """
+    recovered = {}
+    summaries = []
+    remaining = failed
+    for attempt in range(1, attempts + 1):
+        if not remaining:
+            break
+        estimate_durations(remaining, timings)
+        shards = [shard for shard in shard_by_duration(remaining, min(workers, len(remaining))) if shard]
+        logger.info(f"Rerun {attempt}/{attempts}: {len(remaining)} failed scenarios on {len(shards)} workers")
+        attempt_summaries = run_shards(shards, extra_args, f"rerun-{attempt}", {'DRIVER_POOL': 'False'})
+        summaries.extend(attempt_summaries)
+
+        passed = {result['id'] for summary in attempt_summaries
+                  for result in scenario_results(os.path.join(summary['dir'], 'behave-report.json'))
+                  if result['status'] == 'passed'}
+        for scenario_id in passed:
+            recovered.setdefault(scenario_id, attempt)
+        remaining = [scenario for scenario in remaining if scenario['id'] not in passed]
+    return recovered, summaries
+
+
+def merge_rerun_results(recovered, rerun_summaries, output_file=JSON_REPORT, junit_dir=JUNIT_DIR):
+    """
+    Put the passing rerun of every recovered scenario into the merged reports,
+    so the dashboard and the results history count it as passed. In the JSON
+    report the scenario is tagged 'flaky'; in JUnit the first attempt's failure
+    is kept as <flakyFailure>/<flakyError>, as Maven Surefire reports reruns.
+
+    Args:
+        recovered: scenario id -> rerun attempt it passed on
+        rerun_summaries: worker summaries of the reruns
+        output_file: merged behave JSON report
+        junit_dir: merged JUnit directory
+    """
+    if not recovered:
+        return
+    passing = {}
+    for summary in rerun_summaries:
+        report = os.path.join(summary['dir'], 'behave-report.json')
+        if not os.path.exists(report) or os.path.getsize(report) == 0:
+            continue
+        with open(report, 'r', encoding='utf-8') as f:
+            for feature in json.load(f):
+                for element in feature.get('elements', []):
+                    if element.get('location') in recovered and element.get('status') == 'passed':
+                        passing.setdefault(element['location'], (element, summary['dir']))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        features = json.load(f)
+    for feature in features:
+        elements = feature.get('elements', [])
+        for index, element in enumerate(elements):
+            if element.get('location') in passing and element.get('status') == 'failed':
+                rerun = dict(passing[element['location']][0])
+                rerun['tags'] = list(rerun.get('tags', [])) + ['flaky']
+                elements[index] = rerun
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(features, f, indent=2)
+
+    for element, worker_dir in passing.values():
+        for junit_file in glob.glob(os.path.join(worker_dir, 'junit', '*.xml')):
+            passed_case = next((case for case in ET.parse(junit_file).getroot().findall('testcase')
+                                if case.get('name') == element.get('name') and case.get('status') == 'passed'), None)
+            merged_file = os.path.join(junit_dir, os.path.basename(junit_file))
+            if passed_case is None or not os.path.exists(merged_file):
+                continue
+            tree = ET.parse(merged_file)
+            suite = tree.getroot()
+            for index, case in enumerate(list(suite)):
+                if case.tag != 'testcase' or case.get('name') != passed_case.get('name') \
+                        or case.get('status') not in ('failed', 'error'):
+                    continue
+                for outcome in case.findall('failure') + case.findall('error'):
+                    outcome.tag = 'flakyFailure' if outcome.tag == 'failure' else 'flakyError'
+                    passed_case.append(outcome)
+                suite.remove(case)
+                suite.insert(index, passed_case)
+                break
+            cases = suite.findall('testcase')
+            suite.set('failures', str(sum(1 for case in cases if case.find('failure') is not None)))
+            suite.set('errors', str(sum(1 for case in cases if case.find('error') is not None)))
+            tree.write(merged_file, encoding='utf-8', xml_declaration=True)
+    logger.info(f"Merged {len(passing)} passing reruns into {output_file} and {junit_dir}")
+
+
+def classify_failures(results, recovered, reruns, rerun_seconds):
+    """
+    Record this run's outcomes in the flaky store, split failures into flaky
+    and hard ones and write the flaky summary
+
+    Args:
+        results: first-attempt outcomes as returned by scenario_results()
+        recovered: scenario id -> rerun attempt it passed on
+        reruns: number of reruns allowed
+        rerun_seconds: wall time spent re-running
+
+    Returns:
+        list: hard failures that are not quarantined
+    """
+    store = FlakyScenarios()
+    flaky, hard_failures = [], []
+    for result in results:
+        if result['status'] == 'passed':
+            store.record(result['feature'], result['name'], 'passed')
+        elif result['status'] == 'failed':
+            # Quarantine is decided on history before this run, so one bad run never quarantines
+            quarantined = store.is_quarantined(result['feature'], result['name'])
+            outcome = 'flipped' if result['id'] in recovered else 'failed'
+            # Without a rerun a failure says nothing about flakiness, so it is not counted as a run
+            if reruns:
+                store.record(result['feature'], result['name'], outcome)
+            entry = {
+                'id': result['id'],
+                'scenario': result['name'],
+                'flip_rate': round(store.flip_rate(result['feature'], result['name']), 3),
+                'quarantined': quarantined
+            }
+            if outcome == 'flipped':
+                flaky.append({**entry, 'passed_on_rerun': recovered[result['id']]})
+            else:
+                hard_failures.append(entry)
+    store.save()
+
+    with open(FLAKY_SUMMARY, 'w', encoding='utf-8') as f:
+        json.dump({
+            'reruns': reruns,
+            'rerun_seconds': round(rerun_seconds, 2),
+            'flaky': flaky,
+            'hard_failures': hard_failures
+        }, f, indent=2)
+
+    for entry in flaky:
+        logger.warning(f"Flaky: {entry['id']} passed on rerun {entry['passed_on_rerun']} "
+                       f"(flip rate {entry['flip_rate']:.0%})")
+    for entry in hard_failures:
+        note = ' (quarantined)' if entry['quarantined'] else ''
+        logger.error(f"Failed: {entry['id']}{note}")
+    return [entry for entry in hard_failures if not entry['quarantined']]
+
+
+def run_parallel(paths=None, workers=2, mode='round-robin', extra_args=None, reruns=0, changed_since=None):
+    """
+    Discover, shard, run and merge, then re-run failures if asked to.
+    With changed_since, only scenarios affected by changes since that git
+    revision are run.
+
+    Returns:
+        int: 0 if every scenario passed, flipped to passing on a rerun or is
+             quarantined, 1 otherwise
+    """
+    scenarios = discover_scenarios(paths)
+    if changed_since:
+        # Imported here so plain runs never pay for indexing
+        from utilities.impact_selector import ImpactSelector
+        affected = {os.path.normpath(scenario_id) for scenario_id in ImpactSelector().select(changed_since)}
+        scenarios = [scenario for scenario in scenarios if os.path.normpath(scenario['id']) in affected]
+    if not scenarios:
+        logger.warning("No scenarios found")
+        return 0
+
+    timings = ScenarioTimings()
+    estimate_durations(scenarios, timings)
+    shards = [shard for shard in SHARDING_MODES[mode](scenarios, workers) if shard]
+    makespan = predicted_makespan(shards)
+    logger.info(f"Predicted makespan for {mode} schedule: {makespan:.1f}s")
+    os.makedirs(WORKERS_DIR, exist_ok=True)
+    # Workers each add their own index and timing files; drop the previous run's
+    Artifacts.discard(Config.ARTIFACTS_INDEX_DIR)
+    Artifacts.discard(Config.PERF_DIR)
+
+    # One fixture server for the whole run, shared by every worker (workers do not start their own)
+    if Config.USE_FIXTURE_SERVER:
+        os.environ['BASE_URL'] = FixtureServer.start() + 'index.html'
+
+    start_time = time.time()
+    try:
+        summaries = run_shards(shards, extra_args)
+        wall_time = time.time() - start_time
+
+        worker_dirs = [summary['dir'] for summary in summaries]
+        merge_junit_reports(worker_dirs)
+        merge_json_reports(worker_dirs)
+
+        results = scenario_results(JSON_REPORT)
+        failed = [result for result in results if result['status'] == 'failed']
+        rerun_start = time.time()
+        recovered, rerun_summaries = rerun_failed(failed, workers, reruns, timings, extra_args)
+        rerun_seconds = time.time() - rerun_start
+        merge_rerun_results(recovered, rerun_summaries)
+    finally:
+        FixtureServer.stop()
+
+    # One time-ordered log for the whole run, including reruns
+    log_files = [path for summary in summaries + rerun_summaries
+                 for path in sorted(glob.glob(os.path.join(summary['dir'], 'logs', '*.jsonl')))]
+    records = StructuredLogging.merge(MERGED_LOG, log_files)
+    logger.info(f"Merged {records} log records from {len(log_files)} workers into {MERGED_LOG}")
+
+    # Feed this run's durations back into the timing store
+    timings.ingest_json_report(JSON_REPORT)
+    timings.save()
+    blocking = classify_failures(results, recovered, reruns, rerun_seconds)
+
+    with open(RUN_SUMMARY, 'w', encoding='utf-8') as f:
+        json.dump({
+            'mode': mode,
+            'workers': summaries,
+            'reruns': rerun_summaries,
+            'predicted_makespan_seconds': round(makespan, 2),
+            'actual_makespan_seconds': round(max(s['elapsed_seconds'] for s in summaries), 2),
+            'wall_seconds': round(wall_time, 2),
+            'rerun_seconds': round(rerun_seconds, 2)
+        }, f, indent=2)
+
+    logger.info(f"Parallel run finished in {wall_time:.1f}s across {len(shards)} workers")
+    # The purge thread is a daemon; let it finish emptying the trash folders before exiting
+    Artifacts.wait_for_purge()
+    # A worker that exited non-zero without reporting a failed scenario crashed
+    crashed = [summary for summary in summaries if summary['returncode'] != 0 and not any(
+        result['status'] == 'failed'
+        for result in scenario_results(os.path.join(summary['dir'], 'behave-report.json')))]
+    return 1 if blocking or crashed else 0
+
+
+def main(argv=None):
+    """Command line entry point; arguments after a -- separator are passed to behave"""
+    argv = sys.argv[1:] if argv is None else argv
+    # Split before parsing: a space-separated behave option value (--tags @login) would be taken for a path
+    behave_args = []
+    if '--' in argv:
+        separator = argv.index('--')
+        argv, behave_args = argv[:separator], argv[separator + 1:]
+
+    parser = argparse.ArgumentParser(description="Run behave scenarios in parallel",
+                                     epilog="Behave options go after --, e.g. -- --tags @login")
+    parser.add_argument('paths', nargs='*', default=['features'], help="Feature files or directories")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Number of worker processes")
+    parser.add_argument('--mode', choices=sorted(SHARDING_MODES), default='round-robin', help="Sharding strategy")
+    parser.add_argument('--rerun-failed', type=int, default=Config.RERUN_FAILED, metavar='N',
+                        help="Re-run failed scenarios up to N times on fresh drivers")
+    parser.add_argument('--changed-since', metavar='REF',
+                        help="Only run scenarios affected by changes since this git revision")
+    args = parser.parse_args(argv)
+
+    sys.exit(run_parallel(args.paths, max(1, args.workers), args.mode, behave_args,
+                          max(0, args.rerun_failed), args.changed_since))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,140 @@
+"""
+Per-phase timing of scenarios and steps.
+Environment hooks open a scenario and its steps; instrumented code (driver
+startup, navigation, waits, screenshots, teardown) reports the time it spent
+under a phase name. Phases are exclusive: time spent in a nested
+phase, such as a screenshot taken by a failing wait, is only counted once.
+Results are written as JSON to Config.PERF_DIR, one file per process.
+"""
+# Standard library imports
+import functools
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Local imports
+from utilities.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Quoted step arguments, e.g. the "admin" in: I enter username "admin"
+_QUOTED_ARGUMENT = re.compile(r'"[^"]*"')
+
+
+class PerfTiming:
+    """Process-wide collector of scenario, step and phase durations"""
+
+    _scenarios = []
+    _scenario = None
+    _step = None
+    _stack = []
+    _run_phases = {}
+
+    @classmethod
+    @contextmanager
+    def phase(cls, name):
+        """
+        Time a block under a phase name
+
+        Args:
+            name: phase name such as 'navigation', 'wait' or 'screenshot'
+        """
+        frame = [name, time.perf_counter(), 0.0]
+        cls._stack.append(frame)
+        try:
+            yield
+        finally:
+            cls._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            if cls._stack:
+                cls._stack[-1][2] += elapsed
+            cls._add(name, elapsed - frame[2])
+
+    @classmethod
+    def timed(cls, name):
+        """Decorator timing every call of a function under a phase name"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with cls.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def step_definition(step):
+        """Step text with quoted arguments blanked, so steps group by definition"""
+        return f"{step.step_type} " + _QUOTED_ARGUMENT.sub('"..."', step.name)
+
+    @classmethod
+    def start_scenario(cls, scenario):
+        """Open a scenario; phases recorded outside steps are attributed to it"""
+        cls._scenario = {
+            'feature': scenario.feature.name,
+            'scenario': scenario.name,
+            'location': f"{scenario.filename}:{scenario.line}",
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'phases': {},
+            'steps': [],
+            '_start': time.perf_counter()
+        }
+
+    @classmethod
+    def start_step(cls, step):
+        """Open a step inside the current scenario"""
+        cls._step = {
+            'keyword': step.keyword,
+            'text': step.name,
+            'definition': cls.step_definition(step),
+            'phases': {},
+            '_start': time.perf_counter()
+        }
+
+    @classmethod
+    def end_step(cls, step):
+        """Close the current step and attach it to its scenario"""
+        if cls._step is None:
+            return
+        entry, cls._step = cls._step, None
+        entry['duration'] = round(time.perf_counter() - entry.pop('_start'), 4)
+        entry['status'] = step.status.name if hasattr(step.status, 'name') else str(step.status)
+        if cls._scenario is not None:
+            cls._scenario['steps'].append(entry)
+
+    @classmethod
+    def end_scenario(cls, scenario):
+        """Close the current scenario"""
+        if cls._scenario is None:
+            return
+        entry, cls._scenario = cls._scenario, None
+        entry['duration'] = round(time.perf_counter() - entry.pop('_start'), 4)
+        entry['status'] = scenario.status.name if hasattr(scenario.status, 'name') else str(scenario.status)
+        cls._scenarios.append(entry)
+
+    @classmethod
+    def save(cls):
+        """Write all recorded scenarios to Config.PERF_DIR"""
+        if not cls._scenarios:
+            return
+        os.makedirs(Config.PERF_DIR, exist_ok=True)
+        path = os.path.join(Config.PERF_DIR, f"perf-{Config.WORKER_ID or 'main'}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'worker': Config.WORKER_ID or None,
+                'run_phases': {name: round(seconds, 4) for name, seconds in cls._run_phases.items()},
+                'scenarios': cls._scenarios
+            }, f, indent=2)
+        logger.info(f"Performance timings for {len(cls._scenarios)} scenarios written to {path}")
+
+    @classmethod
+    def _add(cls, name, seconds):
+        """Add exclusive phase time to the open step, scenario or the run"""
+        target = cls._step or cls._scenario
+        phases = target['phases'] if target is not None else cls._run_phases
+        phases[name] = round(phases.get(name, 0.0) + seconds, 4)
@@ -0,0 +1,170 @@
+"""
+Page-load time and memory per browser profile.
+Samples the current page at the end of each scenario, keyed by its path,
+and compares the lean profile against the default one on the pages both
+have loaded, using the latest averages stored for each profile and page so
+the two can come from different runs.
+
+Usage:
+    python -m utilities.profile_metrics report
+"""
+# Standard library imports
+import json
+import logging
+import sys
+from datetime import datetime
+
+# Selenium imports
+from selenium.common.exceptions import WebDriverException
+
+# Local imports
+from utilities.config import Config
+from utilities.json_files import locked, write_json
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Navigation timing, transferred bytes and JS heap of the current page in one round trip
+PAGE_METRICS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    page: window.location.pathname,
+    load_ms: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    resources: resources.length,
+    transfer_bytes: resources.reduce((total, r) => total + (r.transferSize || 0), nav ? nav.transferSize || 0 : 0),
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null
+};
+"""
+
+
+class ProfileMetrics:
+    """Process-wide page metrics grouped by browser profile and page"""
+
+    FIELDS = ('load_ms', 'dom_content_loaded_ms', 'resources', 'transfer_bytes', 'js_heap_bytes')
+
+    _samples = {}
+
+    @classmethod
+    def sample(cls, driver, profile):
+        """
+        Record metrics for the page currently loaded in the driver
+
+        Args:
+            driver: WebDriver at the end of a scenario
+            profile: profile the driver was launched with
+        """
+        try:
+            metrics = driver.execute_script(PAGE_METRICS_JS)
+        except WebDriverException as e:
+            logger.debug(f"Could not read page metrics: {str(e)}")
+            return
+        if metrics and metrics.get('load_ms') is not None:
+            cls._samples.setdefault(profile, {}).setdefault(metrics.pop('page'), []).append(metrics)
+
+    @classmethod
+    def summary(cls):
+        """
+        Average metrics per profile and page for this run
+
+        Returns:
+            dict: profile -> page path -> averages of FIELDS plus 'samples'
+        """
+        summary = {}
+        for profile, pages in cls._samples.items():
+            for page, samples in pages.items():
+                averages = {'samples': len(samples)}
+                for field in cls.FIELDS:
+                    values = [s[field] for s in samples if s.get(field) is not None]
+                    averages[field] = round(sum(values) / len(values), 1) if values else None
+                summary.setdefault(profile, {})[page] = averages
+        return summary
+
+    @staticmethod
+    def compare(profiles):
+        """
+        Savings of the lean profile against the default one, averaged over
+        the pages both profiles have samples for
+
+        Args:
+            profiles: dict of profile -> page -> averages, as stored by save()
+
+        Returns:
+            dict: field -> saved amount per page plus 'pages' compared, or None
+                  if the profiles have no page in common
+        """
+        default, lean = profiles.get('default') or {}, profiles.get('lean') or {}
+        pages = sorted(set(default) & set(lean))
+        if not pages:
+            return None
+        savings = {'pages': len(pages)}
+        for field in ProfileMetrics.FIELDS:
+            differences = [default[page][field] - lean[page][field] for page in pages
+                           if default[page].get(field) is not None and lean[page].get(field) is not None]
+            if differences:
+                savings[field] = round(sum(differences) / len(differences), 1)
+        return savings
+
+    @classmethod
+    def save(cls):
+        """Store this run's averages per profile and page and log the lean profile savings"""
+        summary = cls.summary()
+        if not summary:
+            return
+        path = Config.PROFILE_METRICS_FILE
+        # Workers running different profiles save at the same time
+        with locked(path):
+            profiles = cls._load()
+            recorded_at = datetime.now().isoformat(timespec='seconds')
+            for profile, pages in summary.items():
+                for page, averages in pages.items():
+                    profiles.setdefault(profile, {})[page] = {**averages, 'recorded_at': recorded_at}
+            write_json(path, profiles, indent=2, sort_keys=True)
+
+        savings = cls.compare(profiles)
+        if savings:
+            logger.info(
+                f"Lean profile vs default on {savings['pages']} common pages: "
+                f"{savings.get('load_ms', 0):.0f} ms page load, "
+                f"{savings.get('js_heap_bytes', 0) / 1024 / 1024:.1f} MB JS heap, "
+                f"{savings.get('transfer_bytes', 0) / 1024:.0f} KB transferred saved per page"
+            )
+
+    @staticmethod
+    def _load():
+        """Read stored averages, returning none if the file is missing or corrupt"""
+        try:
+            with open(Config.PROFILE_METRICS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable profile metrics file: {str(e)}")
+            return {}
+
+
+# Command line interface for the profile comparison
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] != 'report':
+        print("Usage: python -m utilities.profile_metrics report")
+        sys.exit(1)
+
+    def fmt(value, scale=1):
+        return '-' if value is None else f"{value / scale:.1f}"
+
+    stored = ProfileMetrics._load()
+    print(f"{'Profile':10} {'Page':24} {'Samples':>8} {'Load ms':>9} {'DCL ms':>8} {'Resources':>10} "
+          f"{'KB':>8} {'Heap MB':>8}")
+    for name, pages in sorted(stored.items()):
+        for page, averages in sorted(pages.items()):
+            print(f"{name:10} {page[:24]:24} {averages['samples']:>8} {fmt(averages['load_ms']):>9} "
+                  f"{fmt(averages['dom_content_loaded_ms']):>8} {fmt(averages['resources']):>10} "
+                  f"{fmt(averages['transfer_bytes'], 1024):>8} {fmt(averages['js_heap_bytes'], 1024 * 1024):>8}")
+    savings = ProfileMetrics.compare(stored)
+    if savings:
+        print(f"Lean saves {savings.get('load_ms', 0):.0f} ms load and "
+              f"{savings.get('js_heap_bytes', 0) / 1024 / 1024:.1f} MB heap per page "
+              f"over {savings['pages']} pages both profiles loaded")
+    else:
+        print("Run both profiles (BROWSER_PROFILE=default and lean) on the same pages to compare them")
@@ -0,0 +1,120 @@
+"""
+Historical scenario timings.
+Keeps the most recent durations of every scenario in a small JSON file so
+the parallel runner can balance shards by expected runtime.
+"""
+# Standard library imports
+import json
+import logging
+import os
+import statistics
+
+# Local imports
+from utilities.config import Config
+from utilities.json_files import locked, write_json
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ScenarioTimings:
+    """Local store of recent scenario durations"""
+
+    # Number of recent samples kept per scenario
+    HISTORY_SIZE = 10
+    # Per-step cost assumed before anything has been timed
+    DEFAULT_STEP_SECONDS = 1.0
+
+    def __init__(self, path=None):
+        self.path = path or Config.TIMINGS_FILE
+        self.timings = self._load()
+        self._pending = {}
+
+    @staticmethod
+    def key(feature, name):
+        """Build the store key for a scenario; line numbers are left out as they shift"""
+        return f"{feature.replace(os.sep, '/')}::{name}"
+
+    def record(self, feature, name, duration, steps):
+        """
+        Record one run of a scenario
+
+        Args:
+            feature: path of the feature file
+            name: scenario name
+            duration: duration in seconds
+            steps: number of steps in the scenario
+        """
+        entry = self._pending.setdefault(self.key(feature, name), {'durations': [], 'steps': steps})
+        entry['durations'].append(round(duration, 3))
+        entry['steps'] = steps
+
+    def estimate(self, feature, name, steps):
+        """
+        Expected duration of a scenario in seconds.
+        Uses the median of recent runs; never-timed scenarios are estimated
+        from their step count and the average cost per step of the suite.
+        """
+        entry = self.timings.get(self.key(feature, name))
+        if entry and entry['durations']:
+            return statistics.median(entry['durations'])
+        return max(1, steps) * self.seconds_per_step()
+
+    def seconds_per_step(self):
+        """Average cost of one step across all timed scenarios"""
+        total_seconds = sum(statistics.median(e['durations']) for e in self.timings.values() if e['durations'])
+        total_steps = sum(e['steps'] for e in self.timings.values() if e['durations'])
+        if total_steps == 0:
+            return self.DEFAULT_STEP_SECONDS
+        return total_seconds / total_steps
+
+    def ingest_json_report(self, report_path):
+        """
+        Record the duration of every scenario in a behave JSON report
+
+        Args:
+            report_path: path to behave's json formatter output
+        """
+        if not os.path.exists(report_path) or os.path.getsize(report_path) == 0:
+            logger.warning(f"No JSON report to ingest at {report_path}")
+            return
+        with open(report_path, 'r', encoding='utf-8') as f:
+            features = json.load(f)
+
+        count = 0
+        for feature in features:
+            feature_file = feature.get('location', '').split(':')[0]
+            for element in feature.get('elements', []):
+                if element.get('type') == 'background' or element.get('status') == 'skipped':
+                    continue
+                steps = element.get('steps', [])
+                duration = sum(step.get('result', {}).get('duration', 0) for step in steps)
+                self.record(feature_file, element.get('name', ''), duration, len(steps))
+                count += 1
+        logger.info(f"Ingested timings for {count} scenarios from {report_path}")
+
+    def save(self):
+        """Merge recorded samples into the store file"""
+        if not self._pending:
+            return
+        # Re-read under the lock so samples saved by another process since load are kept
+        with locked(self.path):
+            self.timings = self._load()
+            for key, entry in self._pending.items():
+                stored = self.timings.setdefault(key, {'durations': [], 'steps': entry['steps']})
+                stored['durations'] = (stored['durations'] + entry['durations'])[-self.HISTORY_SIZE:]
+                stored['steps'] = entry['steps']
+            write_json(self.path, self.timings, indent=2, sort_keys=True)
+        self._pending = {}
+        logger.info(f"Saved scenario timings to {self.path}")
+
+    def _load(self):
+        """Read the store file, returning an empty store if it is missing or corrupt"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable timings file {self.path}: {str(e)}")
+            return {}
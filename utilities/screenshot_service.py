@@ -0,0 +1,136 @@
+"""
+Asynchronous screenshot capture.
+The test thread only fetches the base64 frame from the browser; decoding,
+optional downscaling or WebP conversion (with Pillow) and the disk write run
+on a small thread pool. A bounded number of pending captures keeps memory in
+check, and flush() waits for them at the end of the run. With SCREENSHOT_STORE
+enabled, files go to the de-duplicating ScreenshotStore instead of their path.
+"""
+# Standard library imports
+import base64
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Local imports
+from utilities.config import Config
+from utilities.perf_timing import PerfTiming
+from utilities.screenshot_store import ScreenshotStore
+
+# Pillow is optional; without it screenshots are written as captured PNGs
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ScreenshotService:
+    """Process-wide background writer for screenshots"""
+
+    _executor = None
+    _slots = None
+    _pending = set()
+    _lock = threading.Lock()
+    _scenario = None
+    _step = None
+
+    @classmethod
+    def set_context(cls, scenario=None, step=None):
+        """Name the scenario and step that following screenshots belong to"""
+        cls._scenario = scenario
+        cls._step = step
+
+    @classmethod
+    @PerfTiming.timed('screenshot')
+    def capture(cls, driver, path, debug=False):
+        """
+        Grab a screenshot now and write it in the background
+
+        Args:
+            driver: WebDriver to capture
+            path: target file; the extension becomes .webp when SCREENSHOT_FORMAT is webp
+            debug: True for success-path screenshots, only taken when DEBUG_SCREENSHOTS is set
+
+        Returns:
+            str: Path the screenshot will be written to, or None if it was skipped
+        """
+        if debug and not Config.DEBUG_SCREENSHOTS:
+            return None
+        if Config.SCREENSHOT_FORMAT == 'webp' and Image is not None:
+            path = f"{os.path.splitext(path)[0]}.webp"
+
+        frame = driver.get_screenshot_as_base64()
+        cls._start()
+        # Blocks when SCREENSHOT_QUEUE_SIZE captures are already waiting to be written
+        cls._slots.acquire()
+        future = cls._executor.submit(cls._write, frame, path, cls._scenario, cls._step, debug)
+        with cls._lock:
+            cls._pending.add(future)
+        future.add_done_callback(cls._done)
+        return path
+
+    @classmethod
+    def flush(cls):
+        """Wait for every pending screenshot to be written"""
+        with cls._lock:
+            pending = list(cls._pending)
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Failed to write screenshot: {str(e)}")
+
+    @classmethod
+    def shutdown(cls):
+        """Flush pending screenshots and stop the writer threads"""
+        if cls._executor is None:
+            return
+        cls.flush()
+        cls._executor.shutdown(wait=True)
+        cls._executor = None
+        if Config.SCREENSHOT_STORE:
+            ScreenshotStore.save()
+
+    @classmethod
+    def _start(cls):
+        """Create the writer pool on first use"""
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=Config.SCREENSHOT_WORKERS,
+                                                   thread_name_prefix='screenshot')
+                cls._slots = threading.BoundedSemaphore(Config.SCREENSHOT_QUEUE_SIZE)
+
+    @classmethod
+    def _done(cls, future):
+        """Free the queue slot of a finished write"""
+        with cls._lock:
+            cls._pending.discard(future)
+        cls._slots.release()
+
+    @staticmethod
+    def _write(frame, path, scenario, step, debug=False):
+        """Decode, optionally downscale/convert, and save one screenshot"""
+        data = base64.b64decode(frame)
+        if Image is not None and (Config.SCREENSHOT_MAX_WIDTH or path.endswith('.webp')):
+            image = Image.open(io.BytesIO(data))
+            if Config.SCREENSHOT_MAX_WIDTH and image.width > Config.SCREENSHOT_MAX_WIDTH:
+                height = round(image.height * Config.SCREENSHOT_MAX_WIDTH / image.width)
+                image = image.resize((Config.SCREENSHOT_MAX_WIDTH, height))
+            buffer = io.BytesIO()
+            image.save(buffer, 'WEBP' if path.endswith('.webp') else 'PNG')
+            data = buffer.getvalue()
+
+        if Config.SCREENSHOT_STORE:
+            name, extension = os.path.splitext(os.path.basename(path))
+            path = ScreenshotStore.put(data, name, scenario, step, extension.lstrip('.') or 'png', fold_similar=debug)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+        logger.debug(f"Screenshot written to {path}")
+        return path
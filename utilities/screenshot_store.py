@@ -0,0 +1,246 @@
+"""
+Content-addressed screenshot store.
+Each screenshot is stored once under the SHA-256 of its bytes. With Pillow
+installed a 64-bit difference hash (dHash) is computed as well, and debug
+(success-path) frames within SCREENSHOT_DHASH_DISTANCE bits of a stored one
+reuse it instead of adding a new file. Failure screenshots are only shared
+when byte-identical: a few changed pixels may be the evidence. A small index
+records which scenario and step took which screenshot; every process writes
+its own index shard, so parallel workers never contend for one file. Writes
+and gc take a lock on the store, and gc leaves files written within the
+retention period alone, as a running process may not have saved its shard.
+
+Usage:
+    python -m utilities.screenshot_store gc      # drop old references and unreferenced files
+    python -m utilities.screenshot_store stats
+"""
+# Standard library imports
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+# Local imports
+from utilities.config import Config
+from utilities.json_files import locked, write_json
+
+# Pillow is optional; without it only byte-identical screenshots are de-duplicated
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ScreenshotStore:
+    """Process-wide content-addressed store for screenshots"""
+
+    _index = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def put(cls, data, name, scenario=None, step=None, extension='png', fold_similar=False):
+        """
+        Store a screenshot and reference it from the index
+
+        Args:
+            data: encoded image bytes
+            name: logical name of the screenshot, e.g. 'element_not_found_login'
+            scenario: scenario that took it
+            step: step that took it
+            extension: file extension of the encoded image
+            fold_similar: reuse a near-identical stored frame (by dHash), for debug screenshots
+
+        Returns:
+            str: Absolute path of the stored (possibly shared) file
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        dhash = cls.dhash(data)
+
+        with cls._lock, locked(Config.SCREENSHOT_STORE_DIR):
+            index = cls._load_cached()
+            blobs = index['blobs']
+            if fold_similar and not cls._stored(blobs, digest) and dhash is not None:
+                similar = cls._find_similar(blobs, dhash)
+                if similar:
+                    logger.debug(f"Screenshot '{name}' matches stored frame {similar[:12]}")
+                    digest = similar
+            if cls._stored(blobs, digest):
+                # Reused files count as fresh, so gc keeps them until this process's shard is saved
+                os.utime(os.path.join(Config.SCREENSHOT_STORE_DIR, blobs[digest]['path']))
+            else:
+                relative_path = os.path.join('blobs', digest[:2], f"{digest}.{extension}")
+                cls._write_blob(os.path.join(Config.SCREENSHOT_STORE_DIR, relative_path), data)
+                blobs[digest] = {'path': relative_path, 'dhash': dhash, 'bytes': len(data)}
+            index['refs'].append({
+                'scenario': scenario,
+                'step': step,
+                'name': name,
+                'sha256': digest,
+                'taken_at': datetime.now().isoformat(timespec='seconds')
+            })
+            return os.path.join(Config.SCREENSHOT_STORE_DIR, blobs[digest]['path'])
+
+    @staticmethod
+    def dhash(data):
+        """
+        64-bit difference hash of an image, or None without Pillow
+
+        Args:
+            data: encoded image bytes
+        """
+        if Image is None:
+            return None
+        try:
+            pixels = list(Image.open(io.BytesIO(data)).convert('L').resize((9, 8)).getdata())
+        except Exception as e:
+            logger.debug(f"Could not compute perceptual hash: {str(e)}")
+            return None
+        value = 0
+        for row in range(8):
+            for column in range(8):
+                value = (value << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+        return f"{value:016x}"
+
+    @classmethod
+    def save(cls):
+        """Write this process's index shard"""
+        with cls._lock:
+            if cls._index is None:
+                return
+            # Frames loaded from other shards for de-duplication stay in their own shard
+            used = {ref['sha256'] for ref in cls._index['refs']}
+            shard = {
+                'blobs': {sha: blob for sha, blob in cls._index['blobs'].items() if sha in used},
+                'refs': cls._index['refs']
+            }
+            with locked(Config.SCREENSHOT_STORE_DIR):
+                write_json(cls._shard_path(), shard, indent=2)
+
+    @classmethod
+    def load_all(cls, store_dir=None):
+        """
+        Merge every index shard of a store
+
+        Returns:
+            dict: 'blobs' (sha256 -> entry) and 'refs' (list of references)
+        """
+        merged = {'blobs': {}, 'refs': []}
+        for shard in sorted(glob.glob(os.path.join(store_dir or Config.SCREENSHOT_STORE_DIR, 'index', '*.json'))):
+            try:
+                with open(shard, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable screenshot index {shard}: {str(e)}")
+                continue
+            merged['blobs'].update(index.get('blobs', {}))
+            merged['refs'].extend(index.get('refs', []))
+        return merged
+
+    @classmethod
+    def gc(cls, retention_days=None):
+        """
+        Drop references older than the retention period and delete files no
+        reference points to
+
+        Returns:
+            dict: counts of 'refs_removed', 'files_removed' and 'bytes_freed'
+        """
+        retention_days = Config.SCREENSHOT_RETENTION_DAYS if retention_days is None else retention_days
+        cutoff_time = datetime.now() - timedelta(days=retention_days)
+        cutoff = cutoff_time.isoformat(timespec='seconds')
+        store_dir = Config.SCREENSHOT_STORE_DIR
+        refs_removed = 0
+        referenced = set()
+        files_removed = bytes_freed = 0
+
+        with locked(store_dir):
+            for shard in glob.glob(os.path.join(store_dir, 'index', '*.json')):
+                with open(shard, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                kept = [ref for ref in index['refs'] if ref['taken_at'] >= cutoff]
+                refs_removed += len(index['refs']) - len(kept)
+                used = {ref['sha256'] for ref in kept}
+                index = {'blobs': {sha: blob for sha, blob in index['blobs'].items() if sha in used}, 'refs': kept}
+                referenced |= used
+                write_json(shard, index, indent=2)
+
+            for path in glob.glob(os.path.join(store_dir, 'blobs', '*', '*')):
+                # Skip files still being written and ones a running process may not have indexed yet
+                if path.endswith('.tmp') or os.path.getmtime(path) >= cutoff_time.timestamp():
+                    continue
+                if os.path.splitext(os.path.basename(path))[0] not in referenced:
+                    bytes_freed += os.path.getsize(path)
+                    os.remove(path)
+                    files_removed += 1
+        cls._index = None
+        return {'refs_removed': refs_removed, 'files_removed': files_removed, 'bytes_freed': bytes_freed}
+
+    @staticmethod
+    def _stored(blobs, digest):
+        """True if a frame is indexed and its file still exists"""
+        return digest in blobs and os.path.exists(os.path.join(Config.SCREENSHOT_STORE_DIR, blobs[digest]['path']))
+
+    @classmethod
+    def _find_similar(cls, blobs, dhash):
+        """Stored frame whose dHash is within SCREENSHOT_DHASH_DISTANCE bits, if any"""
+        value = int(dhash, 16)
+        for digest, blob in blobs.items():
+            if (blob.get('dhash')
+                    and bin(value ^ int(blob['dhash'], 16)).count('1') <= Config.SCREENSHOT_DHASH_DISTANCE
+                    and cls._stored(blobs, digest)):
+                return digest
+        return None
+
+    @staticmethod
+    def _write_blob(path, data):
+        """Write a file atomically; concurrent writers of the same content are harmless"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def _load_cached(cls):
+        """This process's index shard, with frames from other shards available for de-duplication"""
+        if cls._index is None:
+            try:
+                with open(cls._shard_path(), 'r', encoding='utf-8') as f:
+                    cls._index = json.load(f)
+            except (OSError, ValueError):
+                cls._index = {'blobs': {}, 'refs': []}
+            for digest, blob in cls.load_all()['blobs'].items():
+                cls._index['blobs'].setdefault(digest, blob)
+        return cls._index
+
+    @staticmethod
+    def _shard_path():
+        """Index shard written by this process"""
+        return os.path.join(Config.SCREENSHOT_STORE_DIR, 'index', f"{Config.WORKER_ID or 'main'}.json")
+
+
+# Command line interface for garbage collection
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('gc', 'stats'):
+        print("Usage: python -m utilities.screenshot_store [gc [retention_days]|stats]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'gc':
+        result = ScreenshotStore.gc(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        print(f"Removed {result['refs_removed']} references and {result['files_removed']} files "
+              f"({result['bytes_freed'] / 1024:.0f} KB)")
+    else:
+        index = ScreenshotStore.load_all()
+        total = sum(blob['bytes'] for blob in index['blobs'].values())
+        print(f"{len(index['refs'])} screenshots stored as {len(index['blobs'])} files ({total / 1024:.0f} KB)")
@@ -0,0 +1,164 @@
+"""
+Login session snapshots.
+After a scenario logs in the slow way, the browser state that makes it
+"logged in" (cookies, localStorage, sessionStorage and the landing URL) is
+snapshotted once per worker process. Later scenarios restore the snapshot
+straight into their fresh or pooled driver with a single page load, then
+check the page; a failed check drops the snapshot so the caller logs in
+again and takes a new one. Enabled with SESSION_CACHE (default True).
+"""
+# Standard library imports
+import json
+import logging
+import threading
+from urllib.parse import urlsplit
+
+# Third-party imports
+from selenium.common.exceptions import WebDriverException
+
+# Local imports
+from utilities.perf_timing import PerfTiming
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Reads both web storage areas of the current origin in one round trip
+READ_STORAGE_JS = """
+function dump(storage) {
+    const entries = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        entries[key] = storage.getItem(key);
+    }
+    return entries;
+}
+return [dump(window.localStorage), dump(window.sessionStorage)];
+"""
+
+# Seeds web storage before the page's own scripts run, on the snapshot's origin only
+SEED_STORAGE_JS = """
+(function (origin, local, session) {
+    if (window.location.origin !== origin) { return; }
+    for (const [key, value] of Object.entries(local)) { window.localStorage.setItem(key, value); }
+    for (const [key, value] of Object.entries(session)) { window.sessionStorage.setItem(key, value); }
+})(%s, %s, %s);
+"""
+
+# Cookie fields accepted by Network.setCookies
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite')
+
+
+class SessionCache:
+    """Process-wide store of logged-in browser state"""
+
+    _snapshots = {}
+    _stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+    _lock = threading.Lock()
+
+    @classmethod
+    def snapshot(cls, driver, key):
+        """
+        Capture the session of a logged-in driver
+
+        Args:
+            driver: WebDriver showing the page reached after logging in
+            key: name of the session, e.g. the username
+        """
+        try:
+            local_storage, session_storage = driver.execute_script(READ_STORAGE_JS)
+            snapshot = {
+                'url': driver.current_url,
+                'cookies': driver.get_cookies(),
+                'local_storage': local_storage,
+                'session_storage': session_storage
+            }
+        except WebDriverException as e:
+            logger.warning(f"Could not snapshot session '{key}': {str(e)}")
+            return
+        with cls._lock:
+            cls._snapshots[key] = snapshot
+        logger.info(f"Cached session '{key}' at {snapshot['url']} "
+                    f"({len(snapshot['cookies'])} cookies, "
+                    f"{len(local_storage) + len(session_storage)} storage entries)")
+
+    @classmethod
+    @PerfTiming.timed('navigation')
+    def restore(cls, driver, key, verify):
+        """
+        Put a cached session into a driver
+
+        Args:
+            driver: WebDriver to restore into
+            key: name of the session
+            verify: callable returning True if the restored page is usable
+
+        Returns:
+            bool: True if the session was restored and verified; False on a
+                  cache miss or a failed check, in which case the snapshot is dropped
+        """
+        with cls._lock:
+            snapshot = cls._snapshots.get(key)
+            if snapshot is None:
+                cls._stats['misses'] += 1
+                return False
+
+        try:
+            cls._apply(driver, snapshot)
+            if verify():
+                with cls._lock:
+                    cls._stats['hits'] += 1
+                logger.info(f"Restored cached session '{key}'")
+                return True
+            logger.warning(f"Cached session '{key}' failed verification; logging in again")
+        except WebDriverException as e:
+            logger.warning(f"Could not restore cached session '{key}': {str(e)}")
+        cls.invalidate(key)
+        return False
+
+    @classmethod
+    def invalidate(cls, key):
+        """Drop a cached session"""
+        with cls._lock:
+            if cls._snapshots.pop(key, None) is not None:
+                cls._stats['invalidations'] += 1
+
+    @classmethod
+    def stats(cls):
+        """Hit, miss and invalidation counts of this process"""
+        with cls._lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def log_summary(cls):
+        """Log how often the cache spared a login"""
+        stats = cls.stats()
+        if stats['hits'] or stats['misses']:
+            logger.info(f"Session cache: {stats['hits']} restored, {stats['misses']} misses, "
+                        f"{stats['invalidations']} invalidated")
+
+    @staticmethod
+    def _apply(driver, snapshot):
+        """Set cookies and web storage, then load the landing URL once"""
+        if snapshot['cookies']:
+            cookies = []
+            for cookie in snapshot['cookies']:
+                params = {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+                if 'expiry' in cookie:
+                    params['expires'] = cookie['expiry']
+                cookies.append(params)
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+
+        script_id = None
+        if snapshot['local_storage'] or snapshot['session_storage']:
+            parts = urlsplit(snapshot['url'])
+            source = SEED_STORAGE_JS % (json.dumps(f"{parts.scheme}://{parts.netloc}"),
+                                        json.dumps(snapshot['local_storage']),
+                                        json.dumps(snapshot['session_storage']))
+            script_id = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                               {'source': source})['identifier']
+        try:
+            driver.get(snapshot['url'])
+        finally:
+            # The seed must not run again on later navigations of a pooled driver
+            if script_id is not None:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': script_id})
@@ -0,0 +1,205 @@
+"""
+Structured, queue-based logging.
+Test threads only put records on a queue; a QueueListener thread formats
+them and does the I/O, writing one JSON object per line to this process's
+log file (and a plain line to the console). Every record carries the worker,
+process and the correlation ID of the scenario and step it was logged in, so
+the per-worker files can be merged and filtered after a parallel run.
+
+Expensive debug payloads (page source, attribute dumps) should be guarded
+with logger.isEnabledFor(logging.DEBUG), so they are only computed when
+DEBUG is enabled. behave resets the root level to its own logging_level at
+every scenario, so the hooks hand LOG_LEVEL to behave as well (see
+features/environment.py).
+
+Usage:
+    python -m utilities.structured_logging merge reports/test_run.jsonl reports/workers/*/logs/*.jsonl
+"""
+# Standard library imports
+import atexit
+import contextvars
+import copy
+import heapq
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import uuid
+from datetime import datetime
+
+# Local imports
+from utilities.config import Config
+
+# Correlation of the scenario and step running in the current context
+_correlation = contextvars.ContextVar('log_correlation', default={})
+
+CONSOLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s"
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp records with the worker and the current scenario and step, in the thread that logs them"""
+
+    def filter(self, record):
+        correlation = _correlation.get()
+        record.worker = Config.WORKER_ID or 'main'
+        record.correlation_id = correlation.get('id', '-')
+        record.scenario = correlation.get('scenario')
+        record.step = correlation.get('step')
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'worker': getattr(record, 'worker', Config.WORKER_ID or 'main'),
+            'pid': record.process,
+            'thread': record.threadName,
+            'correlation_id': getattr(record, 'correlation_id', '-'),
+            'scenario': getattr(record, 'scenario', None),
+            'step': getattr(record, 'step', None)
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps tracebacks apart from the message for the JSON formatter"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        # Merge arguments before queuing: mutable objects are read in the calling thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class StructuredLogging:
+    """Process-wide queue-based logging set-up"""
+
+    _listener = None
+    _handler = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, path, level=None):
+        """
+        Route all logging of this process through a queue to a JSON-lines file
+
+        Args:
+            path: log file of this process
+            level: level name for the root logger and the queue handler; Config.LOG_LEVEL if None
+        """
+        with cls._lock:
+            if cls._listener is not None:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            file_handler = logging.FileHandler(path, mode='w', encoding='utf-8')
+            file_handler.setFormatter(JsonFormatter())
+            handlers = [file_handler]
+            if Config.LOG_CONSOLE:
+                console_handler = logging.StreamHandler()
+                console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+                handlers.append(console_handler)
+
+            log_queue = queue.Queue(-1)
+            level = level or Config.LOG_LEVEL
+            cls._handler = _QueueHandler(log_queue)
+            # On the handler too, since behave changes the root level while scenarios run
+            cls._handler.setLevel(level)
+            cls._handler.addFilter(CorrelationFilter())
+            cls._listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+            root_logger = logging.getLogger()
+            # Replace handlers a step module or library may have installed with basicConfig
+            for handler in root_logger.handlers[:]:
+                root_logger.removeHandler(handler)
+            root_logger.addHandler(cls._handler)
+            root_logger.setLevel(level)
+            cls._listener.start()
+        atexit.register(cls.stop)
+
+    @classmethod
+    def stop(cls):
+        """Write the queued records and close the log file"""
+        with cls._lock:
+            if cls._listener is None:
+                return
+            logging.getLogger().removeHandler(cls._handler)
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+            cls._listener = None
+            cls._handler = None
+
+    @staticmethod
+    def start_scenario(scenario):
+        """Give the records of a scenario a new correlation ID"""
+        scenario_id = uuid.uuid4().hex[:12]
+        _correlation.set({'id': scenario_id, 'scenario_id': scenario_id, 'scenario': scenario.name,
+                          'step': None, 'steps': 0})
+
+    @staticmethod
+    def start_step(step):
+        """Derive the correlation ID of the next step from its scenario's"""
+        correlation = _correlation.get()
+        if 'scenario_id' not in correlation:
+            return
+        steps = correlation['steps'] + 1
+        _correlation.set({**correlation, 'id': f"{correlation['scenario_id']}-{steps}",
+                          'step': f"{step.keyword} {step.name}", 'steps': steps})
+
+    @staticmethod
+    def end_scenario():
+        """Records after this point belong to no scenario"""
+        _correlation.set({})
+
+    @staticmethod
+    def merge(output_path, paths):
+        """
+        Interleave per-process JSON-lines logs by timestamp into one file
+
+        Args:
+            output_path: merged log file
+            paths: log files to merge; each is already in time order
+
+        Returns:
+            int: number of records written
+        """
+        files = [open(path, 'r', encoding='utf-8') for path in paths if os.path.isfile(path)]
+        count = 0
+        try:
+            # The timestamp is the first key, so sorting raw lines sorts by time
+            with open(output_path, 'w', encoding='utf-8') as output:
+                for line in heapq.merge(*files):
+                    if line.strip():
+                        output.write(line if line.endswith('\n') else line + '\n')
+                        count += 1
+        finally:
+            for f in files:
+                f.close()
+        return count
+
+
+# Command line interface for merging worker logs
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] != 'merge':
+        print("Usage: python -m utilities.structured_logging merge <output> <log> [<log> ...]")
+        sys.exit(1)
+
+    records = StructuredLogging.merge(sys.argv[2], sys.argv[3:])
+    print(f"Merged {records} records from {len(sys.argv) - 3} files into {sys.argv[2]}")
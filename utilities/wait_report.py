@@ -0,0 +1,69 @@
+"""
+Report of time saved by condition-based waits.
+Every wait that replaced a fixed time.sleep records the sleep it replaced
+(its budget) and the time it actually took.
+"""
+# Standard library imports
+import json
+import logging
+import os
+
+# Local imports
+from utilities.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class WaitReport:
+    """Process-wide accumulator of wait budgets versus actual wait times"""
+
+    _entries = {}
+
+    @classmethod
+    def record(cls, name, budget, actual):
+        """
+        Record one condition wait
+
+        Args:
+            name: wait condition name
+            budget: seconds of the fixed sleep the wait replaced
+            actual: seconds the wait actually took
+        """
+        entry = cls._entries.setdefault(name, {'calls': 0, 'budget_seconds': 0.0, 'actual_seconds': 0.0})
+        entry['calls'] += 1
+        entry['budget_seconds'] += budget
+        entry['actual_seconds'] += actual
+
+    @classmethod
+    def summary(cls):
+        """
+        Summarise the run
+
+        Returns:
+            dict: per-condition totals plus overall seconds saved
+        """
+        conditions = {}
+        for name, entry in cls._entries.items():
+            conditions[name] = {
+                'calls': entry['calls'],
+                'budget_seconds': round(entry['budget_seconds'], 3),
+                'actual_seconds': round(entry['actual_seconds'], 3),
+                'saved_seconds': round(entry['budget_seconds'] - entry['actual_seconds'], 3)
+            }
+        return {
+            'conditions': conditions,
+            'saved_seconds': round(sum(c['saved_seconds'] for c in conditions.values()), 3)
+        }
+
+    @classmethod
+    def save(cls, path=None):
+        """Write the summary as JSON and log the total saved"""
+        if not cls._entries:
+            return
+        summary = cls.summary()
+        path = path or os.path.join(Config.LOGS_DIR, 'wait_savings.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        logger.info(f"Condition waits saved {summary['saved_seconds']:.2f}s versus fixed sleeps (report: {path})")